@@ -0,0 +1,212 @@
+"""Known-benign indicator allowlist.
+
+Feed articles link back to their own sites (``www.bleepingcomputer.com``),
+through feed proxies (``feeds.feedburner.com``) and to the trackers the
+collectors read from (``urlhaus.abuse.ch``). Those names get extracted like
+any other domain and would otherwise be enriched and reported as threat
+infrastructure. :class:`Allowlist` suppresses them before enrichment,
+with one structure per indicator type so a lookup stays cheap however
+long the list grows:
+
+* Domains live in a suffix trie keyed on reversed labels; an entry covers
+  the name and every subdomain (``abuse.ch`` covers ``urlhaus.abuse.ch``),
+  found by walking at most as many nodes as the name has labels.
+* IPv4 addresses and CIDR ranges are merged into sorted interval arrays
+  and probed with :func:`bisect.bisect_right`, as for bogons in
+  :mod:`aegistrace.ioc_validator`.
+* Hashes of known-good files go into a :class:`BloomFilter`, so a list of
+  millions of hashes costs a few bytes per entry. A false positive
+  (bounded by :data:`config.IOC_ALLOWLIST_FP_RATE`) drops a malicious
+  hash, so keep the rate small.
+
+Allowlist files hold one entry per line, ``#`` starts a comment, and the
+entry type is inferred from its shape.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from collections.abc import Iterable
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from . import config, ioc_validator
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_HASH_RE = re.compile(r"(?:[0-9a-f]{32}|[0-9a-f]{40}|[0-9a-f]{64})")
+_NETWORK_RE = re.compile(r"\d{1,3}(?:\.\d{1,3}){3}(?:/\d{1,2})?")
+_DOMAIN_RE = re.compile(r"(?:[a-z0-9_-]+\.)+[a-z0-9-]+")
+# Marks a trie node where an allowlisted domain ends.
+_END = "$"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings.
+
+    Args:
+        capacity: Expected number of items.
+        fp_rate: Target false-positive rate once ``capacity`` items are added.
+    """
+
+    __slots__ = ("_bits", "_size", "_hashes")
+
+    def __init__(self, capacity: int, fp_rate: float = 1e-6) -> None:
+        capacity = max(1, capacity)
+        self._size = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing (Kirsch-Mitzenmacher): k probes from one digest.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        size = self._size
+        return ((h1 + i * h2) % size for i in range(self._hashes))
+
+    def add(self, item: str) -> None:
+        bits = self._bits
+        for pos in self._positions(item):
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: object) -> bool:
+        if not isinstance(item, str):
+            return False
+        bits = self._bits
+        return all(bits[pos >> 3] >> (pos & 7) & 1 for pos in self._positions(item))
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the bit array in bytes."""
+        return len(self._bits)
+
+
+class Allowlist:
+    """Domains, IPv4 networks and file hashes known to be benign.
+
+    Args:
+        domains: Domains to allow, each with all of its subdomains.
+        networks: IPv4 addresses or CIDR ranges.
+        hashes: MD5, SHA1 or SHA256 hex digests.
+        fp_rate: False-positive rate of the hash :class:`BloomFilter`.
+
+    Raises:
+        ValueError: A network is malformed.
+    """
+
+    __slots__ = ("_domains", "_starts", "_ends", "_hashes", "counts")
+
+    def __init__(
+        self,
+        domains: Iterable[str] = (),
+        networks: Iterable[str] = (),
+        hashes: Iterable[str] = (),
+        fp_rate: float | None = None,
+    ) -> None:
+        self._domains: dict[str, Any] = {}
+        n_domains = 0
+        for domain in domains:
+            node = self._domains
+            for label in reversed(domain.lower().strip(".").split(".")):
+                node = node.setdefault(label, {})
+            node[_END] = True
+            n_domains += 1
+        networks = tuple(networks)
+        self._starts, self._ends = ioc_validator.cidr_intervals(networks)
+        hashes = [h.lower() for h in hashes]
+        self._hashes = BloomFilter(len(hashes), fp_rate or config.IOC_ALLOWLIST_FP_RATE)
+        for digest in hashes:
+            self._hashes.add(digest)
+        self.counts = {"domain": n_domains, "ip": len(networks), "hash": len(hashes)}
+
+    @classmethod
+    def from_lines(
+        cls, lines: Iterable[str], domains: Iterable[str] = (), fp_rate: float | None = None
+    ) -> Allowlist:
+        """Build an allowlist from allowlist-file lines, plus extra ``domains``.
+
+        Lines that are not a domain, IPv4 network or hex digest are logged
+        and skipped.
+        """
+        buckets: dict[str, list[str]] = {"domain": list(domains), "ip": [], "hash": []}
+        for lineno, raw in enumerate(lines, 1):
+            entry = raw.split("#", 1)[0].strip().lower()
+            if not entry:
+                continue
+            kind = _classify(entry)
+            if kind is None:
+                logger.warning("Ignoring allowlist line %d: %r", lineno, entry)
+                continue
+            buckets[kind].append(entry)
+        return cls(buckets["domain"], buckets["ip"], buckets["hash"], fp_rate)
+
+    def contains(self, indicator: str, ioc_type: str) -> bool:
+        """``True`` if ``indicator`` (of ``ioc_type``) is allowlisted."""
+        if ioc_type == "domain":
+            node = self._domains
+            for label in reversed(indicator.lower().rstrip(".").split(".")):
+                node = node.get(label)
+                if node is None:
+                    return False
+                if _END in node:
+                    return True
+            return False
+        if ioc_type == "ip":
+            value = ioc_validator.ip_to_int(indicator)
+            return value is not None and ioc_validator.in_intervals(value, self._starts, self._ends)
+        if ioc_type == "hash":
+            return indicator.lower() in self._hashes
+        return False
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+
+
+def _classify(entry: str) -> str | None:
+    if _HASH_RE.fullmatch(entry):
+        return "hash"
+    if _NETWORK_RE.fullmatch(entry):
+        try:
+            ioc_validator.cidr_intervals((entry,))
+        except ValueError:
+            return None
+        return "ip"
+    if _DOMAIN_RE.fullmatch(entry):
+        return "domain"
+    return None
+
+
+def load_allowlist(paths: Iterable[str | Path] = (), domains: Iterable[str] = ()) -> Allowlist:
+    """Build an :class:`Allowlist` from allowlist files and extra ``domains``.
+
+    Unreadable files are logged and skipped.
+    """
+    lines: list[str] = []
+    for path in paths:
+        try:
+            lines.extend(Path(path).read_text(encoding="utf-8").splitlines())
+        except OSError as exc:
+            logger.warning("Could not read allowlist %s: %s", path, exc)
+    allowlist = Allowlist.from_lines(lines, domains)
+    logger.info(
+        "Loaded allowlist: %d domains, %d networks, %d hashes",
+        allowlist.counts["domain"],
+        allowlist.counts["ip"],
+        allowlist.counts["hash"],
+    )
+    return allowlist
+
+
+@lru_cache(maxsize=1)
+def default_allowlist() -> Allowlist:
+    """The configured allowlist, loaded once per process.
+
+    Combines :data:`config.IOC_ALLOWLIST_DOMAINS` with every file in
+    :data:`config.IOC_ALLOWLIST_FILES`.
+    """
+    return load_allowlist(config.IOC_ALLOWLIST_FILES, config.IOC_ALLOWLIST_DOMAINS)
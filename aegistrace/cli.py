@@ -16,9 +16,11 @@ import logging
 import sys
 from collections.abc import Sequence
 
-from . import __version__
+from . import __version__, storage
+from .collectors import BULK_FORMATS, available_sources, bulk_load
 from .logging_config import get_logger
 from .main import run
+from .nlp_processor import reclassify_threats
 
 logger = get_logger(__name__)
 
@@ -33,7 +35,15 @@ def _build_parser() -> argparse.ArgumentParser:
         "--sources",
         type=str,
         default=None,
-        help="Comma-separated subset of sources: otx,rss,urlhaus,malwarebazaar,feodotracker",
+        help=(
+            "Comma-separated subset of sources: otx,rss,urlhaus,malwarebazaar,feodotracker "
+            "or an installed collector plugin (see --list-sources)."
+        ),
+    )
+    parser.add_argument(
+        "--list-sources",
+        action="store_true",
+        help="List built-in and plugin sources, then exit.",
     )
     parser.add_argument(
         "--no-enrich",
@@ -45,6 +55,35 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Skip ARIMA forecasting.",
     )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Fetch sources one after another instead of concurrently.",
+    )
+    parser.add_argument(
+        "--collect-budget",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Wall-clock budget for the collection phase (default: config.COLLECTION_BUDGET).",
+    )
+    parser.add_argument(
+        "--max-threats",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Keep only the N newest threats (default: config.MAX_THREATS).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only collect records newer than each source's stored high-water mark.",
+    )
+    parser.add_argument(
+        "--no-conditional-get",
+        action="store_true",
+        help="Always download feeds in full (ignore stored ETag/Last-Modified validators).",
+    )
     parser.add_argument(
         "--output",
         type=str,
@@ -62,9 +101,86 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Enable DEBUG logging.",
     )
+
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    bulk = commands.add_parser(
+        "bulk-load",
+        help="Load a full URLhaus / Feodo Tracker CSV dump into the database, then exit.",
+    )
+    bulk.add_argument("path", help="Dump file (CSV, .csv.gz or .zip).")
+    bulk.add_argument(
+        "--source",
+        required=True,
+        choices=sorted(BULK_FORMATS),
+        help="Feed the dump was downloaded from.",
+    )
+    bulk.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Rows per database transaction (default: config.BULK_BATCH_SIZE).",
+    )
+    reclassify = commands.add_parser(
+        "reclassify",
+        help="Re-run threat classification over every stored threat, then exit.",
+    )
+    reclassify.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Rows read and updated per chunk (default: config.RECLASSIFY_CHUNK_SIZE).",
+    )
+    worker = commands.add_parser(
+        "nlp-worker",
+        help="Keep the spaCy model loaded and serve NLP batches to pipeline runs.",
+    )
+    worker.add_argument(
+        "--socket",
+        default=None,
+        metavar="PATH",
+        help="Unix socket to listen on (default: config.NLP_WORKER_SOCKET).",
+    )
     return parser
 
 
+def _bulk_load(args: argparse.Namespace) -> int:
+    """Run the ``bulk-load`` subcommand."""
+    try:
+        storage.init_db()
+        loaded = bulk_load(args.path, args.source, batch_size=args.batch_size)
+    except Exception as exc:  # noqa: BLE001
+        logger.error("Bulk load failed: %s", exc, exc_info=True)
+        return 2
+    print(f"[+] Loaded {loaded} {args.source} rows from {args.path}")
+    return 0
+
+
+def _reclassify(args: argparse.Namespace) -> int:
+    """Run the ``reclassify`` subcommand."""
+    try:
+        storage.init_db()
+        scanned, changed = reclassify_threats(chunk_size=args.chunk_size)
+    except Exception as exc:  # noqa: BLE001
+        logger.error("Reclassification failed: %s", exc, exc_info=True)
+        return 2
+    print(f"[+] Reclassified {scanned} threats ({changed} changed)")
+    return 0
+
+
+def _nlp_worker(args: argparse.Namespace) -> int:
+    """Run the ``nlp-worker`` subcommand until interrupted."""
+    from . import nlp_worker
+
+    try:
+        nlp_worker.serve(args.socket)
+    except RuntimeError as exc:
+        logger.error("NLP worker failed to start: %s", exc)
+        return 2
+    return 0
+
+
 def main(argv: Sequence[str] | None = None) -> int:
     """CLI entry point.
 
@@ -79,6 +195,16 @@ def main(argv: Sequence[str] | None = None) -> int:
 
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
+    if args.list_sources:
+        for name in available_sources():
+            print(name)
+        return 0
+    if args.command == "bulk-load":
+        return _bulk_load(args)
+    if args.command == "reclassify":
+        return _reclassify(args)
+    if args.command == "nlp-worker":
+        return _nlp_worker(args)
 
     sources = [s.strip() for s in args.sources.split(",")] if args.sources else None
 
@@ -89,6 +215,11 @@ def main(argv: Sequence[str] | None = None) -> int:
             forecast=not args.no_forecast,
             output=args.output,
             csv_path=args.csv,
+            concurrent=False if args.sequential else None,
+            collect_budget=args.collect_budget,
+            max_threats=args.max_threats,
+            incremental=True if args.incremental else None,
+            conditional_get=False if args.no_conditional_get else None,
         )
     except Exception as exc:  # noqa: BLE001
         logger.error("Pipeline crashed: %s", exc, exc_info=True)
@@ -17,22 +17,51 @@ uniformly::
 from __future__ import annotations
 
 import csv
+import gzip
+import hashlib
+import heapq
 import io
+import os
+import queue
+import threading
+import time
 import xml.etree.ElementTree as ET
-from datetime import datetime, timedelta
-from typing import Any
+import zipfile
+from collections.abc import Callable, Generator, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import partial
+from importlib.metadata import entry_points
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, TextIO
+from urllib.parse import urlsplit
 
-import requests
-
-from . import config
+from . import config, http_client, storage
+from .keywords import KeywordMatcher
 from .logging_config import get_logger
 
 logger = get_logger(__name__)
 
 HEADERS_GENERIC: dict[str, str] = {"User-Agent": config.USER_AGENT}
 
+URLHAUS_CSV_URL = "https://urlhaus.abuse.ch/downloads/csv_recent/"
+FEODOTRACKER_CSV_URL = "https://feodotracker.abuse.ch/downloads/ipblocklist.csv"
+
+# RSS bodies are fed to the XML pull parser in chunks of this many bytes.
+_RSS_CHUNK_SIZE = 8192
+_DC_DATE = "{http://purl.org/dc/elements/1.1/}date"
+
+
+# Timestamp format of the abuse.ch CSV feeds.
+_FEED_TIME_FMT = "%Y-%m-%d %H:%M:%S"
+
 
-def _parse_datetime(value: str, fmt: str = "%Y-%m-%d %H:%M:%S") -> datetime:
+def _parse_datetime(value: str, fmt: str = _FEED_TIME_FMT) -> datetime:
     """Parse a datetime string, falling back to ``datetime.now()`` on errors."""
     try:
         return datetime.strptime(value, fmt)
@@ -56,7 +85,7 @@ def fetch_otx() -> list[dict[str, Any]]:
     url = "https://otx.alienvault.com/api/v1/pulses/subscribed?limit=10"
     headers = {"X-OTX-API-KEY": api_key, **HEADERS_GENERIC}
     try:
-        resp = requests.get(url, headers=headers, timeout=config.HTTP_TIMEOUT)
+        resp = http_client.get(url, headers=headers, timeout=config.HTTP_TIMEOUT)
         if resp.status_code != 200:
             logger.warning("OTX returned status %d", resp.status_code)
             return threats
@@ -78,88 +107,400 @@ def fetch_otx() -> list[dict[str, Any]]:
     return threats
 
 
+def _naive_utc(value: datetime) -> datetime:
+    """Convert an aware datetime to naive UTC; leave naive ones untouched.
+
+    Every collector emits naive timestamps (the abuse.ch feeds are UTC) so
+    records from different sources stay comparable when merged.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _fromisoformat(value: str) -> datetime:
+    """:meth:`datetime.fromisoformat` as naive UTC, also accepting a ``Z`` suffix.
+
+    Python 3.10 rejects ``...Z``, the usual form in feeds.
+
+    Raises:
+        ValueError: ``value`` is not ISO-8601.
+    """
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    return _naive_utc(datetime.fromisoformat(value))
+
+
 def _parse_iso(value: Any) -> datetime:
     """Best-effort ISO-8601 parser used by the OTX collector."""
     if not value:
         return datetime.now()
     try:
-        return datetime.fromisoformat(str(value))
+        return _fromisoformat(str(value))
     except ValueError:
         return datetime.now()
 
 
-def fetch_rss() -> list[dict[str, Any]]:
-    """Fetch the configured RSS feeds and parse the latest items."""
-    threats: list[dict[str, Any]] = []
-    for feed_url in config.RSS_FEEDS:
+def _rss_timestamp(item: ET.Element) -> datetime:
+    """Return an item's ``pubDate`` (RFC 822) or ``dc:date`` (ISO-8601).
+
+    Items without a usable date fall back to one hour ago, the value every
+    RSS record used to get.
+    """
+    pub_date = (item.findtext("pubDate") or "").strip()
+    if pub_date:
         try:
-            resp = requests.get(feed_url, headers=HEADERS_GENERIC, timeout=config.HTTP_TIMEOUT)
-            if resp.status_code != 200:
-                logger.warning("RSS %s returned status %d", feed_url, resp.status_code)
-                continue
-            root = ET.fromstring(resp.content)
-            for entry in root.findall(".//item")[:5]:
+            return _naive_utc(parsedate_to_datetime(pub_date))
+        except (TypeError, ValueError):
+            logger.debug("Unparseable pubDate %r", pub_date)
+    dc_date = (item.findtext(_DC_DATE) or "").strip()
+    if dc_date:
+        try:
+            return _fromisoformat(dc_date)
+        except ValueError:
+            logger.debug("Unparseable dc:date %r", dc_date)
+    return datetime.now() - timedelta(hours=1)
+
+
+# Responses whose validators a running collection task wants saved. Set by
+# :func:`_drain`, so a task's validators are written only once its records
+# have been kept: a source abandoned at its deadline must not mark the feed
+# as seen, or the next poll's 304 would hide the records it never delivered.
+_PENDING_VALIDATORS: ContextVar[list[tuple[str, Any]] | None] = ContextVar(
+    "aegistrace_pending_validators", default=None
+)
+# Conditional-GET switch of the running collection task, also set by
+# :func:`_drain`; ``None`` defers to :data:`config.HTTP_CONDITIONAL_GET`.
+_CONDITIONAL_GET: ContextVar[bool | None] = ContextVar("aegistrace_conditional_get", default=None)
+
+
+def _remember_validators(url: str, resp: Any) -> None:
+    """:func:`http_client.remember_validators`, deferred inside a collection task."""
+    enabled = _CONDITIONAL_GET.get()
+    if enabled is False:
+        return
+    pending = _PENDING_VALIDATORS.get()
+    if pending is None:
+        http_client.remember_validators(url, resp, enabled)
+    else:
+        pending.append((url, resp))
+
+
+def _save_validators(pending: list[tuple[str, Any]]) -> None:
+    """Persist validators deferred by :func:`_remember_validators`."""
+    for url, resp in pending:
+        http_client.remember_validators(url, resp)
+
+
+def _fetch_rss_feed(feed_url: str, max_items: int | None = None) -> list[dict[str, Any]]:
+    """Fetch a single RSS feed and parse its latest items.
+
+    The body is streamed into an incremental XML parser; every ``<item>``
+    is converted and cleared as soon as it closes, and reading stops once
+    ``max_items`` (default :data:`config.RSS_ITEMS_PER_FEED`) have been
+    parsed, so the rest of the document is never downloaded or built.
+
+    Raises on network or parse errors so callers can decide whether to
+    log-and-continue (:func:`fetch_rss`) or record the failure per task
+    (:func:`collect_sources`).
+    """
+    limit = config.RSS_ITEMS_PER_FEED if max_items is None else max_items
+    threats: list[dict[str, Any]] = []
+    resp = http_client.conditional_get(
+        feed_url,
+        enabled=_CONDITIONAL_GET.get(),
+        headers=HEADERS_GENERIC,
+        timeout=config.HTTP_TIMEOUT,
+        stream=True,
+    )
+    try:
+        if resp.status_code == 304:
+            logger.info("RSS %s not modified since last poll", feed_url)
+            return threats
+        if resp.status_code != 200:
+            logger.warning("RSS %s returned status %d", feed_url, resp.status_code)
+            return threats
+        parser = ET.XMLPullParser(events=("end",))
+        for chunk in resp.iter_content(chunk_size=_RSS_CHUNK_SIZE):
+            parser.feed(chunk)
+            for _event, elem in parser.read_events():
+                if elem.tag != "item":
+                    continue
                 threats.append(
                     {
-                        "title": entry.findtext("title", "Unknown") or "Unknown",
-                        "summary": (entry.findtext("description") or "")[:200] + "...",
-                        "url": entry.findtext("link", "#") or "#",
+                        "title": elem.findtext("title", "Unknown") or "Unknown",
+                        "summary": (elem.findtext("description") or "")[:200] + "...",
+                        "url": elem.findtext("link", "#") or "#",
                         "sector": "General",
-                        "timestamp": datetime.now() - timedelta(hours=1),
+                        "timestamp": _rss_timestamp(elem),
                         "source": feed_url,
                     }
                 )
+                elem.clear()
+                if len(threats) >= limit:
+                    break
+            if len(threats) >= limit:
+                break
+        else:
+            # Reached the end of the body: surface truncated documents.
+            parser.close()
+        _remember_validators(feed_url, resp)
+    finally:
+        resp.close()
+    return threats
+
+
+def fetch_rss() -> list[dict[str, Any]]:
+    """Fetch the configured RSS feeds and parse the latest items."""
+    threats: list[dict[str, Any]] = []
+    for feed_url in config.RSS_FEEDS:
+        try:
+            threats.extend(_fetch_rss_feed(feed_url))
         except Exception as exc:  # noqa: BLE001
             logger.warning("RSS fetch error (%s): %s", feed_url, exc)
     return threats
 
 
-def fetch_urlhaus() -> list[dict[str, Any]]:
-    """Fetch recent malicious URLs from URLhaus.
+def _csv_rows(lines: Iterable[str]) -> Iterator[list[str]]:
+    """Yield parsed CSV rows, skipping blank and ``#`` comment lines."""
+    for row in csv.reader(lines):
+        if not row or row[0].startswith("#"):
+            continue
+        yield row
 
-    The CSV header is ``id,dateadded,url,url_status,last_online,threat,
-    tags,urlhaus_link,reporter``. Comment lines start with ``#``.
+
+def _urlhaus_fields(row: list[str]) -> tuple[str, str, str, str] | None:
+    """Return ``(title, summary, url, date_added)`` for one URLhaus CSV row.
+
+    ``None`` for the in-band header and short rows.
     """
-    threats: list[dict[str, Any]] = []
+    # Skip the in-band header row ("id,dateadded,...")
+    if row[0].strip().lower() == "id":
+        return None
+    if len(row) < 9:
+        return None
+    _id, date_added, url, _url_status, _last_online, threat_type, tags, _link, _reporter = row[:9]
+    return (
+        f"URLhaus: {threat_type}",
+        f"Malicious URL reported to URLhaus. Tags: {tags}",
+        url,
+        date_added,
+    )
+
+
+def _urlhaus_record(row: list[str]) -> dict[str, Any] | None:
+    """Map one URLhaus CSV row to a threat dict (``None`` for header/short rows)."""
+    fields = _urlhaus_fields(row)
+    if fields is None:
+        return None
+    title, summary, url, date_added = fields
+    return {
+        "title": title,
+        "summary": summary,
+        "url": url,
+        "sector": "Unknown",
+        "timestamp": _parse_datetime(date_added),
+        "source": "URLhaus",
+    }
+
+
+def _feodo_fields(row: list[str]) -> tuple[str, str, str, str] | None:
+    """Return ``(title, summary, url, first_seen)`` for one Feodo Tracker CSV row.
+
+    ``None`` for the in-band header and short rows.
+    """
+    # Skip the in-band header row ("first_seen_utc,dst_ip,...")
+    if row[0].strip().lower().startswith("first_seen"):
+        return None
+    if len(row) < 6:
+        return None
+    first_seen, ip, _port, _status, _last_online, malware = row[:6]
+    return (
+        f"FeodoTracker: {malware}",
+        f"IP {ip} associated with {malware} C2 server.",
+        "#",
+        first_seen,
+    )
+
+
+def _feodo_record(row: list[str]) -> dict[str, Any] | None:
+    """Map one Feodo Tracker CSV row to a threat dict (``None`` for header/short rows)."""
+    fields = _feodo_fields(row)
+    if fields is None:
+        return None
+    title, summary, url, first_seen = fields
+    return {
+        "title": title,
+        "summary": summary,
+        "url": url,
+        "sector": "Unknown",
+        "timestamp": _parse_datetime(first_seen),
+        "source": "FeodoTracker",
+    }
+
+
+def _rows_to_records(
+    lines: Iterable[str],
+    name: str,
+    to_record: Callable[[list[str]], dict[str, Any] | None],
+    limit: int | None,
+    time_budget: float | None,
+) -> Generator[dict[str, Any], None, bool]:
+    """Yield threat dicts for CSV ``lines`` until ``limit`` or ``time_budget``.
+
+    Returns ``False`` if the time budget cut parsing short (the tail was
+    never read), ``True`` otherwise.
+    """
+    started = time.monotonic()
+    emitted = 0
+    for row in _csv_rows(lines):
+        if limit is not None and emitted >= limit:
+            logger.debug("%s: record limit %d reached", name, limit)
+            break
+        if time_budget is not None and time.monotonic() - started >= time_budget:
+            logger.warning(
+                "%s: parse budget of %.1fs reached after %d records", name, time_budget, emitted
+            )
+            return False
+        record = to_record(row)
+        if record is None:
+            continue
+        yield record
+        emitted += 1
+    return True
+
+
+def _stream_csv_feed(
+    url: str,
+    name: str,
+    to_record: Callable[[list[str]], dict[str, Any] | None],
+    limit: int | None,
+    time_budget: float | None,
+) -> Iterator[dict[str, Any]]:
+    """Download a CSV feed as a stream and yield one threat dict per row.
+
+    The body is decoded line by line with ``iter_lines`` so only the rows
+    in flight are held in memory. Parsing stops (and the connection is
+    released) after ``limit`` records or ``time_budget`` seconds. Errors
+    are logged and end the stream; records already yielded stand.
+    """
+    resp = None
     try:
-        resp = requests.get(
-            "https://urlhaus.abuse.ch/downloads/csv_recent/",
+        resp = http_client.conditional_get(
+            url,
+            enabled=_CONDITIONAL_GET.get(),
             headers=HEADERS_GENERIC,
             timeout=config.HTTP_TIMEOUT,
+            stream=True,
         )
+        if resp.status_code == 304:
+            logger.info("%s not modified since last poll", name)
+            return
         if resp.status_code != 200:
-            logger.warning("URLhaus returned status %d", resp.status_code)
-            return threats
-        reader = csv.reader(io.StringIO(resp.text))
-        for row in reader:
-            if not row or row[0].startswith("#"):
-                continue
-            # Skip the in-band header row ("id,dateadded,...")
-            if row[0].strip().lower() == "id":
-                continue
-            if len(row) < 9:
-                continue
-            _id, date_added, url, _url_status, _last_online, threat_type, tags, _link, _reporter = row[:9]
-            threats.append(
-                {
-                    "title": f"URLhaus: {threat_type}",
-                    "summary": f"Malicious URL reported to URLhaus. Tags: {tags}",
-                    "url": url,
-                    "sector": "Unknown",
-                    "timestamp": _parse_datetime(date_added),
-                    "source": "URLhaus",
-                }
-            )
+            logger.warning("%s returned status %d", name, resp.status_code)
+            return
+        # ``resp.text`` fell back to the detected charset; streaming cannot
+        # sniff the whole body, so default to UTF-8 when none is declared.
+        resp.encoding = resp.encoding or "utf-8"
+        lines = resp.iter_lines(decode_unicode=True)
+        complete = yield from _rows_to_records(lines, name, to_record, limit, time_budget)
+        # If the budget cut the tail, do not record validators: the next
+        # poll must download the feed again.
+        if complete:
+            _remember_validators(url, resp)
     except Exception as exc:  # noqa: BLE001
-        logger.warning("URLhaus fetch error: %s", exc)
-    return threats
+        logger.warning("%s fetch error: %s", name, exc)
+    finally:
+        if resp is not None:
+            resp.close()
+
+
+@contextmanager
+def _open_feed_file(path: str | os.PathLike[str]) -> Iterator[TextIO]:
+    """Open a local feed dump as buffered text, unpacking ``.gz`` / ``.zip``.
+
+    Zip archives are read from their first file member. Decompressed bytes
+    are streamed through a :data:`config.BULK_READ_BUFFER`-byte buffer, so
+    multi-GB dumps never have to fit in memory.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    with ExitStack() as stack:
+        raw: Any
+        if suffix == ".gz":
+            raw = stack.enter_context(gzip.open(path, "rb"))
+        elif suffix == ".zip":
+            archive = stack.enter_context(zipfile.ZipFile(path))
+            members = [m for m in archive.infolist() if not m.is_dir()]
+            if not members:
+                raise ValueError(f"{path} contains no files")
+            raw = stack.enter_context(archive.open(members[0]))
+        else:
+            raw = stack.enter_context(open(path, "rb", buffering=config.BULK_READ_BUFFER))
+        if suffix in (".gz", ".zip"):
+            raw = io.BufferedReader(raw, buffer_size=config.BULK_READ_BUFFER)
+        yield io.TextIOWrapper(raw, encoding="utf-8", errors="replace", newline="")
+
+
+def _read_csv_file(
+    path: str | os.PathLike[str],
+    name: str,
+    to_record: Callable[[list[str]], dict[str, Any] | None],
+    limit: int | None,
+    time_budget: float | None,
+) -> Iterator[dict[str, Any]]:
+    """Replay a saved CSV feed from disk, yielding one threat dict per row.
+
+    Same limits and error handling as :func:`_stream_csv_feed`, without
+    touching the network.
+    """
+    try:
+        with _open_feed_file(path) as fh:
+            yield from _rows_to_records(fh, name, to_record, limit, time_budget)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("%s file read error (%s): %s", name, path, exc)
+
+
+def iter_urlhaus(
+    limit: int | None = None,
+    time_budget: float | None = None,
+    path: str | os.PathLike[str] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Stream recent malicious URLs from URLhaus, one threat dict at a time.
+
+    The CSV header is ``id,dateadded,url,url_status,last_online,threat,
+    tags,urlhaus_link,reporter``. Comment lines start with ``#``.
+
+    Args:
+        limit: Stop after this many records. Defaults to
+            :data:`config.FEED_RECORD_LIMIT` (``None`` = no limit).
+        time_budget: Stop parsing after this many seconds. Defaults to
+            :data:`config.FEED_PARSE_BUDGET` (``None`` = no budget).
+        path: Read a saved dump (plain, ``.gz`` or ``.zip``) instead of
+            downloading. Defaults to :data:`config.URLHAUS_FILE`.
+    """
+    limit = config.FEED_RECORD_LIMIT if limit is None else limit
+    time_budget = config.FEED_PARSE_BUDGET if time_budget is None else time_budget
+    path = path or config.URLHAUS_FILE
+    if path:
+        return _read_csv_file(path, "URLhaus", _urlhaus_record, limit, time_budget)
+    return _stream_csv_feed(URLHAUS_CSV_URL, "URLhaus", _urlhaus_record, limit, time_budget)
+
+
+def fetch_urlhaus(
+    limit: int | None = None,
+    time_budget: float | None = None,
+    path: str | os.PathLike[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Fetch recent malicious URLs from URLhaus (see :func:`iter_urlhaus`)."""
+    return list(iter_urlhaus(limit=limit, time_budget=time_budget, path=path))
 
 
 def fetch_malwarebazaar() -> list[dict[str, Any]]:
     """Fetch recent malware samples from MalwareBazaar."""
     threats: list[dict[str, Any]] = []
     try:
-        resp = requests.post(
+        resp = http_client.post(
             "https://mb-api.abuse.ch/api/v1/",
             data={"query": "get_recent"},
             headers=HEADERS_GENERIC,
@@ -185,92 +526,826 @@ def fetch_malwarebazaar() -> list[dict[str, Any]]:
     return threats
 
 
-def fetch_feodotracker() -> list[dict[str, Any]]:
-    """Fetch the Feodo Tracker C2 IP blocklist.
+def iter_feodotracker(
+    limit: int | None = None,
+    time_budget: float | None = None,
+    path: str | os.PathLike[str] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Stream the Feodo Tracker C2 IP blocklist, one threat dict at a time.
 
     The CSV header is ``first_seen_utc,dst_ip,dst_port,c2_status,
     last_online,malware``. Comment lines start with ``#``.
+
+    Args:
+        limit: Stop after this many records. Defaults to
+            :data:`config.FEED_RECORD_LIMIT` (``None`` = no limit).
+        time_budget: Stop parsing after this many seconds. Defaults to
+            :data:`config.FEED_PARSE_BUDGET` (``None`` = no budget).
+        path: Read a saved dump (plain, ``.gz`` or ``.zip``) instead of
+            downloading. Defaults to :data:`config.FEODOTRACKER_FILE`.
+    """
+    limit = config.FEED_RECORD_LIMIT if limit is None else limit
+    time_budget = config.FEED_PARSE_BUDGET if time_budget is None else time_budget
+    path = path or config.FEODOTRACKER_FILE
+    if path:
+        return _read_csv_file(path, "FeodoTracker", _feodo_record, limit, time_budget)
+    return _stream_csv_feed(
+        FEODOTRACKER_CSV_URL, "FeodoTracker", _feodo_record, limit, time_budget
+    )
+
+
+def fetch_feodotracker(
+    limit: int | None = None,
+    time_budget: float | None = None,
+    path: str | os.PathLike[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Fetch the Feodo Tracker C2 IP blocklist (see :func:`iter_feodotracker`)."""
+    return list(iter_feodotracker(limit=limit, time_budget=time_budget, path=path))
+
+
+# Dump formats accepted by :func:`bulk_load`: row mapper and record source.
+BULK_FORMATS: dict[str, tuple[Callable[[list[str]], tuple[str, str, str, str] | None], str]] = {
+    "urlhaus": (_urlhaus_fields, "URLhaus"),
+    "feodotracker": (_feodo_fields, "FeodoTracker"),
+}
+
+
+def bulk_load(
+    path: str | os.PathLike[str],
+    source: str,
+    batch_size: int | None = None,
+    db_file: str | None = None,
+) -> int:
+    """Stream a full abuse.ch CSV dump straight into the ``threats`` table.
+
+    Rows go from the CSV reader to :func:`storage.save_threat_rows` as
+    plain tuples, in batches of ``batch_size``; no threat dicts are built
+    and at most one batch is held in memory, so multi-million-row dumps
+    load in constant memory. Records keep their feed timestamp and are
+    classified from their title and summary, as collected records are.
+    Rows with an unparseable date are stamped with the load time and
+    reported in one summary warning.
+
+    Args:
+        path: Dump file, plain CSV or ``.gz`` / ``.zip`` compressed.
+        source: Dump format, a key of :data:`BULK_FORMATS`.
+        batch_size: Rows per transaction. Defaults to
+            :data:`config.BULK_BATCH_SIZE`.
+        db_file: SQLite database path.
+
+    Returns:
+        Number of rows inserted.
+
+    Raises:
+        ValueError: If ``source`` is not a known dump format.
+        OSError: If the file cannot be read.
     """
-    threats: list[dict[str, Any]] = []
     try:
-        resp = requests.get(
-            "https://feodotracker.abuse.ch/downloads/ipblocklist.csv",
-            headers=HEADERS_GENERIC,
-            timeout=config.HTTP_TIMEOUT,
+        fields, source_name = BULK_FORMATS[source.lower()]
+    except KeyError:
+        raise ValueError(
+            f"unknown bulk-load source {source!r}; expected one of {', '.join(BULK_FORMATS)}"
         )
-        if resp.status_code != 200:
-            logger.warning("FeodoTracker returned status %d", resp.status_code)
-            return threats
-        reader = csv.reader(io.StringIO(resp.text))
-        for row in reader:
-            if not row or row[0].startswith("#"):
-                continue
-            # Skip the in-band header row ("first_seen_utc,dst_ip,...")
-            if row[0].strip().lower().startswith("first_seen"):
-                continue
-            if len(row) < 6:
-                continue
-            first_seen, ip, _port, _status, _last_online, malware = row[:6]
-            threats.append(
-                {
-                    "title": f"FeodoTracker: {malware}",
-                    "summary": f"IP {ip} associated with {malware} C2 server.",
-                    "url": "#",
-                    "sector": "Unknown",
-                    "timestamp": _parse_datetime(first_seen),
-                    "source": "FeodoTracker",
-                }
-            )
-    except Exception as exc:  # noqa: BLE001
-        logger.warning("FeodoTracker fetch error: %s", exc)
-    return threats
+
+    matcher = KeywordMatcher(config.THREAT_CATEGORIES)
+    bad_dates = 0
+
+    def _rows() -> Iterator[tuple[Any, ...]]:
+        nonlocal bad_dates
+        with _open_feed_file(path) as fh:
+            for row in _csv_rows(fh):
+                parsed = fields(row)
+                if parsed is None:
+                    continue
+                title, summary, _url, seen = parsed
+                try:
+                    timestamp = datetime.strptime(seen, _FEED_TIME_FMT)
+                except ValueError:
+                    bad_dates += 1
+                    timestamp = datetime.now()
+                yield (
+                    title,
+                    summary,
+                    "Unknown",
+                    matcher.first(f"{title} {summary}") or "Uncategorized",
+                    source_name,
+                    timestamp.isoformat(),
+                )
+
+    started = time.monotonic()
+    inserted = storage.save_threat_rows(_rows(), batch_size=batch_size, db_file=db_file)
+    elapsed = time.monotonic() - started
+    if bad_dates:
+        logger.warning(
+            "Bulk load %s: %d rows had an unparseable date and were stamped with the load time",
+            source_name,
+            bad_dates,
+        )
+    logger.info(
+        "Bulk load %s: %d rows from %s in %.1fs (%.0f rows/s)",
+        source_name,
+        inserted,
+        path,
+        elapsed,
+        inserted / elapsed if elapsed > 0 else 0.0,
+    )
+    return inserted
 
 
-# Map of source name -> fetcher, used by the CLI ``--sources`` flag.
+class Collector:
+    """Base class for collector plugins.
+
+    Subclasses set ``name`` and implement :meth:`fetch`, which returns (or
+    yields) threat dicts in the shape described in the module docstring.
+    Third-party collectors are published under the
+    :data:`ENTRY_POINT_GROUP` entry-point group, e.g. in ``pyproject.toml``::
+
+        [project.entry-points."aegistrace.collectors"]
+        internal = "mypkg.feeds:InternalCollector"
+
+    The entry point may name a :class:`Collector` subclass, an instance, or
+    a plain zero-argument fetcher function.
+
+    Attributes:
+        name: Source name used by ``--sources``.
+        incremental: Whether records are filtered against the source's
+            high-water mark in incremental mode. Set to ``False`` for
+            feeds whose timestamps are not monotonic.
+        rate_limit: Maximum requests per second the provider tolerates,
+            or ``None`` for no limit.
+        hosts: Host names the collector talks to; ``rate_limit`` applies
+            per host.
+    """
+
+    name: str = ""
+    incremental: bool = True
+    rate_limit: float | None = None
+    hosts: tuple[str, ...] = ()
+
+    def fetch(self) -> Iterable[dict[str, Any]]:
+        raise NotImplementedError
+
+    def tasks(self, split: bool) -> list[tuple[str, Callable[[], Iterable[dict[str, Any]]]]]:
+        """Return the ``(task_name, callable)`` pairs to run for this source.
+
+        ``split`` is set in concurrent mode; collectors that poll several
+        independent endpoints can return one task per endpoint.
+        """
+        return [(self.name, self.fetch)]
+
+
+class FunctionCollector(Collector):
+    """Adapt a plain fetcher function to the :class:`Collector` interface."""
+
+    def __init__(
+        self,
+        name: str,
+        fetcher: Callable[[], Iterable[dict[str, Any]]],
+        *,
+        incremental: bool = True,
+        rate_limit: float | None = None,
+        hosts: tuple[str, ...] = (),
+    ) -> None:
+        self.name = name
+        self.fetcher = fetcher
+        self.incremental = incremental
+        self.rate_limit = rate_limit
+        self.hosts = hosts
+
+    def fetch(self) -> Iterable[dict[str, Any]]:
+        return self.fetcher()
+
+
+class RssCollector(Collector):
+    """Built-in RSS collector; splits into one task per feed when asked."""
+
+    name = "rss"
+
+    @property  # type: ignore[override]
+    def hosts(self) -> tuple[str, ...]:
+        return tuple(urlsplit(url).hostname or "" for url in config.RSS_FEEDS)
+
+    def fetch(self) -> Iterable[dict[str, Any]]:
+        return fetch_rss()
+
+    def tasks(self, split: bool) -> list[tuple[str, Callable[[], Iterable[dict[str, Any]]]]]:
+        if not split:
+            return [(self.name, self.fetch)]
+        return [(f"rss:{url}", partial(_fetch_rss_feed, url)) for url in config.RSS_FEEDS]
+
+
+# Entry-point group scanned for third-party collectors.
+ENTRY_POINT_GROUP = "aegistrace.collectors"
+
+# Built-in sources, used by the CLI ``--sources`` flag. Values are
+# :class:`Collector` instances or plain zero-argument fetchers returning an
+# iterable of threat dicts; the CSV feeds are generators so records stream
+# into the top-K merge. Built-ins shadow plugins of the same name.
 SOURCE_FETCHERS: dict[str, Any] = {
-    "otx": fetch_otx,
-    "rss": fetch_rss,
-    "urlhaus": fetch_urlhaus,
-    "malwarebazaar": fetch_malwarebazaar,
-    "feodotracker": fetch_feodotracker,
+    "otx": FunctionCollector("otx", fetch_otx, hosts=("otx.alienvault.com",)),
+    "rss": RssCollector(),
+    "urlhaus": FunctionCollector("urlhaus", iter_urlhaus, hosts=("urlhaus.abuse.ch",)),
+    "malwarebazaar": FunctionCollector(
+        "malwarebazaar", fetch_malwarebazaar, hosts=("mb-api.abuse.ch",)
+    ),
+    "feodotracker": FunctionCollector(
+        "feodotracker", iter_feodotracker, hosts=("feodotracker.abuse.ch",)
+    ),
 }
 
+# Plugin collectors resolved so far, so each entry point is loaded once.
+_PLUGIN_CACHE: dict[str, Collector] = {}
 
-def fetch_all_sources(sources: list[str] | None = None) -> list[dict[str, Any]]:
-    """Collect threats from every configured source.
 
-    Args:
-        sources: Optional subset of source names (keys of
-            :data:`SOURCE_FETCHERS`). ``None`` means "all sources".
+def _plugin_entry_points() -> dict[str, Any]:
+    """Installed collector entry points by lower-cased name (not loaded)."""
+    return {ep.name.lower(): ep for ep in entry_points(group=ENTRY_POINT_GROUP)}
 
-    Returns:
-        List of normalised threat dicts, sorted newest-first, capped at
-        :data:`config.MAX_THREATS`. If no real data is fetched a single
-        mock threat is returned so the rest of the pipeline can still run.
+
+def _as_collector(name: str, obj: Any) -> Collector:
+    """Normalise a registry value (class, instance or function) to a Collector."""
+    if isinstance(obj, type) and issubclass(obj, Collector):
+        obj = obj()
+    if isinstance(obj, Collector):
+        if not obj.name:
+            obj.name = name
+        return obj
+    if callable(obj):
+        return FunctionCollector(name, obj)
+    raise TypeError(f"collector {name!r} is neither a Collector nor callable: {obj!r}")
+
+
+def available_sources() -> list[str]:
+    """Names of every built-in and installed plugin source, built-ins first.
+
+    Plugins are listed from package metadata only; nothing is imported.
+    """
+    names = list(SOURCE_FETCHERS)
+    names.extend(name for name in _plugin_entry_points() if name not in SOURCE_FETCHERS)
+    return names
+
+
+def get_collector(name: str) -> Collector | None:
+    """Resolve a source name to a :class:`Collector`, importing plugins lazily.
+
+    Returns ``None`` (after logging) when no such source exists or its
+    plugin fails to load.
+    """
+    key = name.lower()
+    if key in SOURCE_FETCHERS:
+        return _as_collector(key, SOURCE_FETCHERS[key])
+    if key in _PLUGIN_CACHE:
+        return _PLUGIN_CACHE[key]
+    ep = _plugin_entry_points().get(key)
+    if ep is None:
+        logger.warning("Unknown source %r, skipping", name)
+        return None
+    try:
+        collector = _as_collector(key, ep.load())
+    except Exception as exc:  # noqa: BLE001 - a broken plugin must not stop the run
+        logger.warning("Failed to load collector plugin %s (%s): %s", key, ep.value, exc)
+        return None
+    logger.debug("Loaded collector plugin %s from %s", key, ep.value)
+    _PLUGIN_CACHE[key] = collector
+    return collector
+
+
+@dataclass
+class SourceTiming:
+    """Outcome of a single source task within a collection run.
+
+    ``status`` is one of ``"ok"``, ``"error"`` or ``"timeout"``. A
+    timed-out source contributes no records to the run. ``skipped`` counts
+    records dropped for being older than the source's high-water mark or
+    already collected at it (incremental mode only).
+    """
+
+    name: str
+    status: str = "ok"
+    records: int = 0
+    elapsed: float = 0.0
+    error: str | None = None
+    skipped: int = 0
+
+
+@dataclass
+class CollectionReport:
+    """Merged threats plus per-source timings for one collection run.
+
+    ``unchanged`` is set when no source produced a record but at least one
+    reported nothing new (``304 Not Modified``, or only records at or below
+    its high-water mark) rather than failing. ``threats`` then holds the
+    placeholder mock record, which must not be persisted.
     """
-    selected = list(sources) if sources else list(SOURCE_FETCHERS.keys())
-    all_threats: list[dict[str, Any]] = []
+
+    threats: list[dict[str, Any]] = field(default_factory=list)
+    timings: list[SourceTiming] = field(default_factory=list)
+    unchanged: bool = False
+
+
+# A unit of collection work: name, zero-argument fetcher, and whether the
+# high-water marks apply to it.
+_Task = tuple[str, Callable[[], Any], bool]
+# A source's high-water mark: its newest record timestamp and the row keys
+# (see :func:`_row_key`) of the records stamped exactly then.
+_Mark = tuple[datetime, set[str]]
+
+
+def _mock_threat() -> dict[str, Any]:
+    """Placeholder record used when no source produced any data."""
+    return {
+        "title": "Mock Threat",
+        "summary": "Simulated threat for testing.",
+        "url": "#",
+        "sector": "General",
+        "timestamp": datetime.now(),
+        "source": "MockData",
+    }
+
+
+def _build_tasks(selected: list[str], split_rss: bool) -> list[_Task]:
+    """Resolve source names into ``(task_name, callable, incremental)`` tasks.
+
+    When ``split_rss`` is set, collectors that support it (the built-in RSS
+    collector) expand into one task per endpoint, e.g. ``rss:<url>``, so
+    one slow feed does not hold up the others. A collector's ``rate_limit``
+    is applied to its ``hosts`` unless the config already limits them.
+    """
+    tasks: list[_Task] = []
     for name in selected:
-        fetcher = SOURCE_FETCHERS.get(name.lower())
-        if fetcher is None:
-            logger.warning("Unknown source %r, skipping", name)
+        collector = get_collector(name)
+        if collector is None:
             continue
+        if collector.rate_limit:
+            for host in collector.hosts:
+                http_client.set_rate_limit(host, collector.rate_limit)
+        tasks.extend(
+            (task_name, fetcher, collector.incremental)
+            for task_name, fetcher in collector.tasks(split_rss)
+        )
+    return tasks
+
+
+class _NewestK:
+    """Bounded min-heap that keeps the ``k`` newest records pushed so far.
+
+    Records are keyed on ``(timestamp, -task_index, -record_index)`` so the
+    final order is exactly what a stable ``sorted(..., reverse=True)`` over
+    the task-ordered concatenation would give, ties included, while memory
+    stays O(k) however many records the sources emit. Safe to push from
+    several threads.
+    """
+
+    def __init__(self, k: int) -> None:
+        self.k = k
+        self._heap: list[tuple[tuple[datetime, int, int], dict[str, Any]]] = []
+        self._pushed: dict[int, int] = {}
+        self._closed: set[int] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def seen(self) -> int:
+        """Records pushed by tasks that have not been discarded."""
+        with self._lock:
+            return sum(self._pushed.values())
+
+    def push(self, record: dict[str, Any], task_idx: int, record_idx: int) -> None:
+        key = (record["timestamp"], -task_idx, -record_idx)
+        with self._lock:
+            if task_idx in self._closed:
+                return
+            self._pushed[task_idx] = self._pushed.get(task_idx, 0) + 1
+            if len(self._heap) < self.k:
+                heapq.heappush(self._heap, (key, record))
+            elif self.k > 0 and key > self._heap[0][0]:
+                heapq.heapreplace(self._heap, (key, record))
+
+    def closed(self, task_idx: int) -> bool:
+        """Whether ``task_idx`` was discarded (a lock-free set lookup)."""
+        return task_idx in self._closed
+
+    def discard(self, task_idx: int) -> None:
+        """Drop everything ``task_idx`` pushed and ignore its later pushes."""
+        with self._lock:
+            self._closed.add(task_idx)
+            self._pushed.pop(task_idx, None)
+            kept = [item for item in self._heap if item[0][1] != -task_idx]
+            if len(kept) != len(self._heap):
+                heapq.heapify(kept)
+                self._heap = kept
+
+    def newest_first(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [record for _, record in sorted(self._heap, key=itemgetter(0), reverse=True)]
+
+
+def _drain(
+    name: str,
+    fetcher: Callable[[], Any],
+    task_idx: int,
+    top: _NewestK,
+    marks: dict[str, _Mark] | None = None,
+    validators: list[tuple[str, Any]] | None = None,
+    conditional_get: bool | None = None,
+) -> tuple[SourceTiming, dict[str, _Mark]]:
+    """Feed every record of ``fetcher`` into ``top``.
+
+    With ``marks`` (incremental mode), records older than the high-water
+    mark of their ``source`` are skipped, as are records stamped exactly
+    at the mark that were already collected. Feeds stamp rows to the
+    second, so a row added later in the same second is still emitted.
+    Once the task is discarded (it timed out) no further record is pulled
+    and a generator fetcher is closed, which releases its HTTP connection.
+
+    With ``validators``, HTTP validators the fetcher would save are
+    appended there instead; the caller saves them once it keeps the
+    task's records (see :func:`_save_validators`). ``conditional_get``
+    switches the fetcher's conditional GETs on or off for this task
+    (``None`` = :data:`config.HTTP_CONDITIONAL_GET`).
+
+    Returns:
+        The task's :class:`SourceTiming` and the newest timestamp (with the
+        row keys at that timestamp) seen per record ``source``, i.e. the
+        candidate new high-water marks.
+    """
+    started = time.monotonic()
+    count = skipped = 0
+    newest: dict[str, _Mark] = {}
+    token = _PENDING_VALIDATORS.set(validators) if validators is not None else None
+    switch = _CONDITIONAL_GET.set(conditional_get)
+    records: Any = None
+    try:
+        records = fetcher()
+        for record in records:
+            if top.closed(task_idx):
+                break
+            source = record.get("source", name)
+            ts = record["timestamp"]
+            if marks is not None:
+                mark = marks.get(source)
+                key = None
+                if mark is not None and ts <= mark[0]:
+                    key = _row_key(record)
+                    if ts < mark[0] or key in mark[1]:
+                        skipped += 1
+                        continue
+                seen = newest.get(source)
+                if seen is None or ts > seen[0]:
+                    newest[source] = (ts, {key or _row_key(record)})
+                elif ts == seen[0]:
+                    seen[1].add(key or _row_key(record))
+            count += 1
+            top.push(record, task_idx, count)
+    finally:
+        close = getattr(records, "close", None)
+        if close is not None:
+            close()
+        if token is not None:
+            _PENDING_VALIDATORS.reset(token)
+        _CONDITIONAL_GET.reset(switch)
+    return SourceTiming(name, "ok", count, time.monotonic() - started, skipped=skipped), newest
+
+
+def _collect_sequential(
+    tasks: list[_Task],
+    top: _NewestK,
+    marks: dict[str, _Mark] | None = None,
+    conditional_get: bool | None = None,
+) -> tuple[list[SourceTiming], dict[str, _Mark]]:
+    """Run every task one after another (the pre-0.3 behaviour).
+
+    Returns the per-task timings and the new high-water candidates from
+    the tasks that completed.
+    """
+    timings: list[SourceTiming] = []
+    newest: dict[str, _Mark] = {}
+    for idx, (name, fetcher, incremental) in enumerate(tasks):
+        started = time.monotonic()
+        pending: list[tuple[str, Any]] = []
         try:
-            all_threats.extend(fetcher())
+            timing, task_newest = _drain(
+                name, fetcher, idx, top, marks if incremental else None, pending, conditional_get
+            )
         except Exception as exc:  # noqa: BLE001 - never let one source kill the rest
             logger.warning("Source %s failed: %s", name, exc)
+            top.discard(idx)
+            timings.append(
+                SourceTiming(name, "error", elapsed=time.monotonic() - started, error=str(exc))
+            )
+            continue
+        timings.append(timing)
+        _merge_newest(newest, task_newest)
+        _save_validators(pending)
+    return timings, newest
+
+
+def _run_on_daemon_threads(
+    fn: Callable[[int], Any], n_tasks: int, max_workers: int
+) -> list[Future[Any]]:
+    """Run ``fn(idx)`` for every task index on up to ``max_workers`` daemon threads.
+
+    A minimal stand-in for :class:`~concurrent.futures.ThreadPoolExecutor`,
+    whose workers the interpreter joins at exit: an abandoned source would
+    otherwise hold the process open long after the collection budget.
+    Cancelling a future before a worker picks it up skips that task.
+    """
+    futures: list[Future[Any]] = [Future() for _ in range(n_tasks)]
+    jobs: queue.SimpleQueue[int] = queue.SimpleQueue()
+    for idx in range(n_tasks):
+        jobs.put(idx)
+
+    def _worker() -> None:
+        while True:
+            try:
+                idx = jobs.get_nowait()
+            except queue.Empty:
+                return
+            fut = futures[idx]
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(idx)
+            except BaseException as exc:  # noqa: BLE001 - surfaced through the future
+                fut.set_exception(exc)
+            else:
+                fut.set_result(result)
 
-    if not all_threats:
-        logger.warning("No real data fetched. Using mock data.")
-        all_threats.append(
-            {
-                "title": "Mock Threat",
-                "summary": "Simulated threat for testing.",
-                "url": "#",
-                "sector": "General",
-                "timestamp": datetime.now(),
-                "source": "MockData",
+    for n in range(max(1, min(max_workers, n_tasks))):
+        threading.Thread(target=_worker, name=f"aegistrace-collect_{n}", daemon=True).start()
+    return futures
+
+
+def _collect_concurrent(
+    tasks: list[_Task],
+    top: _NewestK,
+    budget: float,
+    source_timeout: float,
+    max_workers: int,
+    marks: dict[str, _Mark] | None = None,
+    conditional_get: bool | None = None,
+) -> tuple[list[SourceTiming], dict[str, _Mark]]:
+    """Run every task in a thread pool under a global and per-task deadline.
+
+    Each task's deadline starts when a worker picks it up, so tasks queued
+    behind a full pool are not penalised. Records are pushed into ``top``
+    as they stream in; a task that fails or overruns its deadline has its
+    records discarded, so the result matches :func:`_collect_sequential`
+    whenever every source finishes. Only completed tasks contribute
+    high-water candidates and save their HTTP validators, so the next poll
+    downloads an abandoned feed again. Worker threads cannot be
+    interrupted: an overrunning task stops at its next record (see
+    :func:`_drain`), but one blocked inside a read waits up to
+    :data:`config.HTTP_TIMEOUT` per socket read. Workers are daemon
+    threads, so such a task never keeps the process alive after the run.
+    """
+    if not tasks:
+        return [], {}
+
+    started = time.monotonic()
+    hard_stop = started + budget
+    started_at: dict[int, float] = {}
+
+    task_validators: list[list[tuple[str, Any]]] = [[] for _ in tasks]
+
+    def _run(idx: int) -> tuple[SourceTiming, dict[str, _Mark]]:
+        started_at[idx] = time.monotonic()
+        name, fetcher, incremental = tasks[idx]
+        return _drain(
+            name,
+            fetcher,
+            idx,
+            top,
+            marks if incremental else None,
+            task_validators[idx],
+            conditional_get,
+        )
+
+    futures = {
+        fut: idx for idx, fut in enumerate(_run_on_daemon_threads(_run, len(tasks), max_workers))
+    }
+    timings: dict[int, SourceTiming] = {}
+    newest: dict[str, _Mark] = {}
+    try:
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            expired = {
+                fut
+                for fut in pending
+                if now >= hard_stop or now >= started_at.get(futures[fut], now) + source_timeout
             }
+            for fut in expired:
+                idx = futures[fut]
+                fut.cancel()
+                top.discard(idx)
+                logger.warning("Source %s timed out; continuing without it", tasks[idx][0])
+                timings[idx] = SourceTiming(
+                    tasks[idx][0], "timeout", elapsed=now - started_at.get(idx, now)
+                )
+            pending -= expired
+            if not pending:
+                break
+            # Tasks that have not started yet wake us up at most one
+            # ``source_timeout`` from now, so their deadline is still checked.
+            running = [started_at[futures[f]] for f in pending if futures[f] in started_at]
+            next_deadline = min(
+                [hard_stop, now + source_timeout] + [t + source_timeout for t in running]
+            )
+            done, pending = wait(
+                pending, timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED
+            )
+            for fut in done:
+                idx = futures[fut]
+                name = tasks[idx][0]
+                try:
+                    timings[idx], task_newest = fut.result()
+                except Exception as exc:  # noqa: BLE001 - never let one source kill the rest
+                    logger.warning("Source %s failed: %s", name, exc)
+                    top.discard(idx)
+                    timings[idx] = SourceTiming(
+                        name,
+                        "error",
+                        elapsed=time.monotonic() - started_at.get(idx, started),
+                        error=str(exc),
+                    )
+                    continue
+                _merge_newest(newest, task_newest)
+                _save_validators(task_validators[idx])
+    finally:
+        for fut in futures:
+            fut.cancel()  # tasks still queued never start
+
+    return [timings[idx] for idx in range(len(tasks))], newest
+
+
+def _merge_newest(into: dict[str, _Mark], other: dict[str, _Mark]) -> None:
+    """Keep the later timestamp per source when combining high-water candidates.
+
+    Row keys of candidates with the same timestamp are pooled.
+    """
+    for source, (ts, keys) in other.items():
+        seen = into.get(source)
+        if seen is None or ts > seen[0]:
+            into[source] = (ts, set(keys))
+        elif ts == seen[0]:
+            seen[1].update(keys)
+
+
+def _row_key(record: dict[str, Any]) -> str:
+    """Stable identity of a record within its source, for same-timestamp rows."""
+    fields = "\x1f".join(str(record.get(f) or "") for f in ("title", "summary", "url"))
+    return hashlib.blake2b(fields.encode(), digest_size=16).hexdigest()
+
+
+def _load_marks() -> dict[str, _Mark]:
+    """The persisted high-water marks, with the row keys stored at each."""
+    keys = storage.load_high_water_keys()
+    return {
+        source: (ts, keys.get(source, set()))
+        for source, ts in storage.load_high_water_marks().items()
+    }
+
+
+def collect_sources(
+    sources: list[str] | None = None,
+    concurrent: bool | None = None,
+    budget: float | None = None,
+    source_timeout: float | None = None,
+    max_workers: int | None = None,
+    max_threats: int | None = None,
+    incremental: bool | None = None,
+    conditional_get: bool | None = None,
+) -> CollectionReport:
+    """Collect threats from every configured source, with per-source timings.
+
+    Records are merged into a bounded heap as they arrive, so only the
+    newest ``max_threats`` are ever retained no matter how large the feeds
+    are. The result is identical to sorting everything newest-first and
+    slicing, including the order of records with equal timestamps.
+
+    Args:
+        sources: Optional subset of source names (built-ins from
+            :data:`SOURCE_FETCHERS` or installed plugins, see
+            :func:`available_sources`). ``None`` means "all sources".
+            Plugins are only imported when selected.
+        concurrent: Fetch sources (and individual RSS feeds) in a thread
+            pool. Defaults to :data:`config.CONCURRENT_COLLECTION`.
+        budget: Wall-clock budget in seconds for the whole collection
+            phase (concurrent mode only). Defaults to
+            :data:`config.COLLECTION_BUDGET`.
+        source_timeout: Deadline in seconds for any single source
+            (concurrent mode only). Defaults to
+            :data:`config.SOURCE_TIMEOUT`.
+        max_workers: Thread pool size. Defaults to
+            :data:`config.COLLECTION_MAX_WORKERS`.
+        max_threats: Number of newest records to keep. Defaults to
+            :data:`config.MAX_THREATS`.
+        incremental: Only emit records not collected before: newer than
+            each source's persisted high-water mark, or stamped exactly at
+            it but not yet seen. Then advance the marks. Defaults to
+            :data:`config.INCREMENTAL_COLLECTION`.
+        conditional_get: Revalidate feed downloads with stored HTTP
+            validators. Defaults to :data:`config.HTTP_CONDITIONAL_GET`.
+
+    Returns:
+        :class:`CollectionReport` whose ``threats`` are sorted newest-first
+        and capped at ``max_threats``, and whose ``timings`` hold one entry
+        per source task. If no real data is fetched a single mock threat is
+        returned so the rest of the pipeline can still run; ``unchanged``
+        tells an idle poll apart from failed sources.
+    """
+    if concurrent is None:
+        concurrent = config.CONCURRENT_COLLECTION
+    if incremental is None:
+        incremental = config.INCREMENTAL_COLLECTION
+    if conditional_get is None:
+        conditional_get = config.HTTP_CONDITIONAL_GET
+    selected = list(sources) if sources else available_sources()
+    tasks = _build_tasks(selected, split_rss=concurrent)
+    top = _NewestK(config.MAX_THREATS if max_threats is None else max_threats)
+    marks = _load_marks() if incremental else None
+    http_client.reset_validator_stats()
+
+    if concurrent:
+        timings, newest = _collect_concurrent(
+            tasks,
+            top,
+            budget=config.COLLECTION_BUDGET if budget is None else budget,
+            source_timeout=config.SOURCE_TIMEOUT if source_timeout is None else source_timeout,
+            max_workers=max_workers or config.COLLECTION_MAX_WORKERS,
+            marks=marks,
+            conditional_get=conditional_get,
+        )
+    else:
+        timings, newest = _collect_sequential(tasks, top, marks, conditional_get)
+
+    if incremental and newest:
+        # Marks advance to the newest record *seen*, including any that fell
+        # outside the top-K cut, so each record is offered exactly once.
+        storage.save_high_water_marks(
+            {source: ts for source, (ts, _keys) in newest.items()},
+            keys={source: keys for source, (_ts, keys) in newest.items()},
+        )
+
+    for timing in timings:
+        logger.info(
+            "Source %s: %s, %d records (%d already collected) in %.2fs",
+            timing.name,
+            timing.status,
+            timing.records,
+            timing.skipped,
+            timing.elapsed,
         )
+    stats = http_client.validator_stats()
+    if conditional_get:
+        logger.info(
+            "Conditional GET: %d not modified (hits), %d downloaded (misses)",
+            stats["hits"],
+            stats["misses"],
+        )
+
+    unchanged = False
+    if top.seen == 0:
+        unchanged = stats["hits"] > 0 or any(t.skipped for t in timings)
+        if unchanged:
+            logger.info("No new data since the last poll. Using mock data for this run only.")
+        else:
+            logger.warning("No real data fetched. Using mock data.")
+        top.push(_mock_threat(), len(tasks), 0)
+
+    return CollectionReport(threats=top.newest_first(), timings=timings, unchanged=unchanged)
+
+
+def fetch_all_sources(
+    sources: list[str] | None = None,
+    concurrent: bool | None = None,
+    budget: float | None = None,
+    source_timeout: float | None = None,
+    max_threats: int | None = None,
+) -> list[dict[str, Any]]:
+    """Collect threats from every configured source.
 
-    return sorted(all_threats, key=lambda x: x["timestamp"], reverse=True)[: config.MAX_THREATS]
+    Thin wrapper around :func:`collect_sources` for callers that only need
+    the records.
+
+    Args:
+        sources: Optional subset of source names (keys of
+            :data:`SOURCE_FETCHERS`). ``None`` means "all sources".
+        concurrent: See :func:`collect_sources`.
+        budget: See :func:`collect_sources`.
+        source_timeout: See :func:`collect_sources`.
+        max_threats: Number of newest records to keep. Defaults to
+            :data:`config.MAX_THREATS`.
+
+    Returns:
+        List of normalised threat dicts, sorted newest-first, capped at
+        ``max_threats``. If no real data is fetched a single mock threat is
+        returned so the rest of the pipeline can still run.
+    """
+    return collect_sources(
+        sources,
+        concurrent=concurrent,
+        budget=budget,
+        source_timeout=source_timeout,
+        max_threats=max_threats,
+    ).threats
@@ -48,6 +48,167 @@ ENABLE_ENRICHMENT: Final[bool] = True
 HTTP_TIMEOUT: Final[int] = 10
 USER_AGENT: Final[str] = "AegisTrace/0.2.0 (+https://github.com/frangelbarrera/aegistrace-threat-intelligence)"
 
+# === HTTP client =========================================================
+# Every outbound request goes through one shared, pooled session (see
+# aegistrace.http_client). POOL_CONNECTIONS is the number of per-host pools
+# kept alive; POOL_MAXSIZE the connections kept per host (keep it >= the
+# collection worker count). Idempotent requests that fail with a 5xx or a
+# connection error are retried with exponential backoff.
+HTTP_POOL_CONNECTIONS: Final[int] = 10
+HTTP_POOL_MAXSIZE: Final[int] = 10
+HTTP_MAX_RETRIES: Final[int] = 2
+HTTP_BACKOFF_FACTOR: Final[float] = 0.5
+# Feed downloads send If-None-Match / If-Modified-Since using validators
+# stored in the SQLite DB and skip parsing on 304 Not Modified. Set
+# AEGISTRACE_CONDITIONAL_GET=0 (or pass --no-conditional-get) to opt out.
+HTTP_CONDITIONAL_GET: Final[bool] = os.getenv("AEGISTRACE_CONDITIONAL_GET", "1") != "0"
+
+# === Rate limiting =======================================================
+# Outbound requests are throttled per host with a token bucket:
+# ``host -> (requests per second, burst)``. Defaults follow the free API
+# tiers (VirusTotal public API: 4 requests/minute; Pulsedive: 30/minute).
+# Hosts not listed are unthrottled until they answer 429. Override or add
+# hosts with AEGISTRACE_RATE_LIMITS="host=rate[/burst],...", e.g.
+# "www.virustotal.com=0.5/10" for a premium VirusTotal key.
+def _parse_rate_limits(spec: str) -> dict[str, tuple[float, int]]:
+    """Parse ``host=rate[/burst]`` pairs, ignoring malformed entries."""
+    limits: dict[str, tuple[float, int]] = {}
+    for item in spec.split(","):
+        host, _, value = item.strip().partition("=")
+        rate, _, burst = value.partition("/")
+        try:
+            limits[host.strip().lower()] = (float(rate), int(burst or 1))
+        except ValueError:
+            continue
+    return limits
+
+
+HOST_RATE_LIMITS: Final[dict[str, tuple[float, int]]] = {
+    "otx.alienvault.com": (2.0, 5),
+    "api.abuseipdb.com": (1.0, 5),
+    "www.virustotal.com": (4 / 60, 4),
+    "pulsedive.com": (0.5, 5),
+    **_parse_rate_limits(os.getenv("AEGISTRACE_RATE_LIMITS", "")),
+}
+# A 429 blocks its host for the ``Retry-After`` delay (or the default
+# below when the header is missing) and the request is retried up to
+# RATE_LIMIT_RETRIES times. A server asking for more than
+# RATE_LIMIT_MAX_WAIT seconds suspends the host instead: requests to it
+# return 429 at once, without sleeping, until the delay has passed.
+RATE_LIMIT_RETRIES: Final[int] = 2
+RATE_LIMIT_DEFAULT_BACKOFF: Final[float] = 2.0
+RATE_LIMIT_MAX_WAIT: Final[float] = 60.0
+
+# === Collection ==========================================================
+# Sources (and each RSS feed) are fetched concurrently by default. The
+# budget caps the whole collection phase; the per-source timeout caps any
+# single source. Sources still running when either expires are reported
+# as timed out and contribute no records.
+CONCURRENT_COLLECTION: Final[bool] = True
+COLLECTION_MAX_WORKERS: Final[int] = 8
+COLLECTION_BUDGET: Final[float] = 30.0
+SOURCE_TIMEOUT: Final[float] = 20.0
+# The CSV feeds (URLhaus, Feodo Tracker) are parsed as a stream and can
+# stop early: after FEED_RECORD_LIMIT records and/or FEED_PARSE_BUDGET
+# seconds. ``None`` disables the corresponding cut-off.
+FEED_RECORD_LIMIT: Final[int | None] = None
+FEED_PARSE_BUDGET: Final[float | None] = None
+# Number of newest items read from each RSS feed; parsing stops there.
+RSS_ITEMS_PER_FEED: Final[int] = 5
+# Incremental mode keeps a high-water mark (newest record timestamp) per
+# record source in the SQLite DB and only emits records newer than it
+# (plus rows stamped in the same second but not seen yet), so
+# steady-state runs process just the delta. Off by default because an
+# unchanged feed then yields no records (and the mock fallback).
+INCREMENTAL_COLLECTION: Final[bool] = os.getenv("AEGISTRACE_INCREMENTAL", "0") == "1"
+# Offline replay: when set, the URLhaus / Feodo Tracker collectors read
+# these local CSV files (optionally .gz or .zip) instead of the network.
+URLHAUS_FILE: Final[str | None] = os.getenv("AEGISTRACE_URLHAUS_FILE") or None
+FEODOTRACKER_FILE: Final[str | None] = os.getenv("AEGISTRACE_FEODOTRACKER_FILE") or None
+
+# === Bulk load ===========================================================
+# ``aegistrace bulk-load`` streams full abuse.ch dumps straight into the
+# ``threats`` table, committing every BULK_BATCH_SIZE rows. Files are read
+# through a BULK_READ_BUFFER-byte buffer.
+BULK_BATCH_SIZE: Final[int] = 5000
+BULK_READ_BUFFER: Final[int] = 1 << 20
+
+# === NLP ================================================================
+# spaCy model and loading profile. "fast" loads only what process_nlp uses
+# (NER, plus a rule-based sentencizer instead of the dependency parser);
+# "full" loads the whole pipeline as shipped.
+NLP_MODEL: Final[str] = os.getenv("AEGISTRACE_NLP_MODEL", "en_core_web_sm")
+NLP_PROFILE: Final[str] = os.getenv("AEGISTRACE_NLP_PROFILE", "fast")
+# process_nlp streams summaries through spaCy's ``nlp.pipe`` in batches of
+# NLP_BATCH_SIZE. NLP_N_PROCESS > 1 (or -1 for one per CPU) fans large
+# inputs out to worker processes; each worker loads its own model, so at
+# most one worker is used per NLP_MIN_DOCS_PER_PROCESS texts and small
+# runs stay in-process.
+NLP_BATCH_SIZE: Final[int] = int(os.getenv("AEGISTRACE_NLP_BATCH_SIZE", "64"))
+NLP_N_PROCESS: Final[int] = int(os.getenv("AEGISTRACE_NLP_N_PROCESS", "1"))
+NLP_MIN_DOCS_PER_PROCESS: Final[int] = 500
+# Results (entities + summary) are cached in the SQLite DB keyed by a hash
+# of the summary text and the loaded pipeline, so recurring boilerplate
+# skips spaCy. Least-recently-used entries are evicted past the budget.
+NLP_CACHE: Final[bool] = os.getenv("AEGISTRACE_NLP_CACHE", "1") != "0"
+NLP_CACHE_MAX_BYTES: Final[int] = 32 * 1024 * 1024
+# Structured feeds (URLhaus, FeodoTracker, MalwareBazaar) emit templated
+# summaries with no prose; their entities and summary are read off the
+# template instead of running spaCy. Set to "0" to send everything to spaCy.
+NLP_TEMPLATE_ROUTING: Final[bool] = os.getenv("AEGISTRACE_NLP_TEMPLATE_ROUTING", "1") != "0"
+# aegistrace.run starts loading the model in a background thread while
+# sources are collected, hiding most of the load time behind network I/O.
+NLP_WARMUP: Final[bool] = os.getenv("AEGISTRACE_NLP_WARMUP", "1") != "0"
+
+# === NLP worker ==========================================================
+# ``aegistrace nlp-worker`` keeps the spaCy model resident and serves parse
+# batches on a Unix socket (created 0600). Pipeline runs use it when
+# NLP_WORKER_SOCKET is set and a worker is listening, and load the model
+# in-process otherwise. Clients must present the same NLP_WORKER_AUTHKEY;
+# when it is unset the worker generates a random key into an owner-only
+# "<socket>.key" file, which clients of the same user read.
+NLP_WORKER_SOCKET: Final[str | None] = os.getenv("AEGISTRACE_NLP_WORKER_SOCKET") or None
+NLP_WORKER_AUTHKEY: Final[str] = os.getenv("AEGISTRACE_NLP_WORKER_AUTHKEY", "")
+
+# === Reclassification ===================================================
+# ``aegistrace reclassify`` re-runs classification over the stored threats
+# after THREAT_CATEGORIES changes, RECLASSIFY_CHUNK_SIZE rows at a time.
+RECLASSIFY_CHUNK_SIZE: Final[int] = int(os.getenv("AEGISTRACE_RECLASSIFY_CHUNK_SIZE", "10000"))
+
+# === IoC extraction ======================================================
+# Large batches (bulk backfills) can be extracted across IOC_WORKERS
+# processes (-1 = one per CPU), IOC_CHUNK_SIZE threats per task. Batches no
+# larger than one chunk are always extracted in-process.
+IOC_WORKERS: Final[int] = int(os.getenv("AEGISTRACE_IOC_WORKERS", "1"))
+IOC_CHUNK_SIZE: Final[int] = int(os.getenv("AEGISTRACE_IOC_CHUNK_SIZE", "5000"))
+# Drop bogon IPs and names that are not registrable domains (checked
+# against the bundled Public Suffix List) before they reach the enricher.
+IOC_VALIDATE: Final[bool] = os.getenv("AEGISTRACE_IOC_VALIDATE", "1") != "0"
+# ioc_extractor.iter_iocs remembers at most this many indicators (LRU) to
+# decide whether a sighting is new, bounding memory on endless streams.
+IOC_STREAM_MAX_TRACKED: Final[int] = int(os.getenv("AEGISTRACE_IOC_STREAM_MAX_TRACKED", "100000"))
+# ...and at most this many sources (and titles) per indicator, so a hot
+# indicator seen in every threat does not grow without limit.
+IOC_STREAM_MAX_REFS: Final[int] = int(os.getenv("AEGISTRACE_IOC_STREAM_MAX_REFS", "100"))
+# Known-benign indicators suppressed before enrichment (with validation, so
+# AEGISTRACE_IOC_VALIDATE=0 disables both). The feed and collector sites
+# below are always allowed, with their subdomains; AEGISTRACE_IOC_ALLOWLIST
+# adds files (os.pathsep-separated) of domains, IPv4 CIDRs and file hashes,
+# one per line. Hashes go into a Bloom filter with this false-positive rate.
+IOC_ALLOWLIST_DOMAINS: Final[list[str]] = [
+    "abuse.ch",
+    "alienvault.com",
+    "bleepingcomputer.com",
+    "darkreading.com",
+    "feedburner.com",
+    "krebsonsecurity.com",
+    "securityweek.com",
+]
+IOC_ALLOWLIST_FILES: Final[list[str]] = [
+    p for p in os.getenv("AEGISTRACE_IOC_ALLOWLIST", "").split(os.pathsep) if p
+]
+IOC_ALLOWLIST_FP_RATE: Final[float] = float(os.getenv("AEGISTRACE_IOC_ALLOWLIST_FP_RATE", "1e-6"))
+
 # === Threat classification keywords =====================================
 # Used by nlp_processor.classify_threat for rule-based categorisation.
 THREAT_CATEGORIES: Final[dict[str, list[str]]] = {
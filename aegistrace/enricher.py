@@ -10,9 +10,7 @@ from __future__ import annotations
 
 from typing import Any
 
-import requests
-
-from . import config
+from . import config, http_client
 from .logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -37,7 +35,7 @@ def _enrich_ip(ind: str, base: dict[str, Any]) -> None:
     """Populate ``base`` with AbuseIPDB + Pulsedive data for an IP."""
     if config.ABUSEIPDB_API_KEY:
         try:
-            resp = requests.get(
+            resp = http_client.get(
                 "https://api.abuseipdb.com/api/v2/check",
                 headers={"Key": config.ABUSEIPDB_API_KEY, "Accept": "application/json", **HEADERS_GENERIC},
                 params={"ipAddress": ind, "maxAgeInDays": 90},
@@ -62,7 +60,7 @@ def _enrich_ip(ind: str, base: dict[str, Any]) -> None:
         pd_params: dict[str, Any] = {"indicator": ind, "pretty": "1"}
         if config.PULSEDIVE_API_KEY:
             pd_params["key"] = config.PULSEDIVE_API_KEY
-        resp = requests.get(
+        resp = http_client.get(
             "https://pulsedive.com/api/info.php",
             params=pd_params,
             headers=HEADERS_GENERIC,
@@ -94,7 +92,7 @@ def _enrich_domain(ind: str, base: dict[str, Any]) -> None:
         pd_params: dict[str, Any] = {"indicator": ind, "pretty": "1"}
         if config.PULSEDIVE_API_KEY:
             pd_params["key"] = config.PULSEDIVE_API_KEY
-        resp = requests.get(
+        resp = http_client.get(
             "https://pulsedive.com/api/info.php",
             params=pd_params,
             headers=HEADERS_GENERIC,
@@ -123,7 +121,7 @@ def _enrich_hash(ind: str, base: dict[str, Any]) -> None:
     """Populate ``base`` with VirusTotal data for a file hash."""
     if config.VIRUSTOTAL_API_KEY:
         try:
-            resp = requests.get(
+            resp = http_client.get(
                 f"https://www.virustotal.com/api/v3/files/{ind}",
                 headers={"x-apikey": config.VIRUSTOTAL_API_KEY, **HEADERS_GENERIC},
                 timeout=config.HTTP_TIMEOUT,
@@ -0,0 +1,389 @@
+"""Shared HTTP client for collectors and the enricher.
+
+Every outbound request goes through a single lazily-created
+:class:`requests.Session`, so connections to the same host are pooled and
+kept alive across RSS feeds, abuse.ch downloads and enrichment lookups
+instead of paying a fresh TCP + TLS handshake per call. Pool sizes and
+retry behaviour come from :mod:`aegistrace.config`.
+
+Feed downloads can use :func:`conditional_get`, which sends the
+``ETag`` / ``Last-Modified`` validators recorded on the previous poll so
+an unchanged feed costs a ``304 Not Modified`` instead of a full payload.
+
+Requests are throttled per host by a :class:`TokenBucket` configured in
+:data:`config.HOST_RATE_LIMITS`. A ``429 Too Many Requests`` blocks the
+host for its ``Retry-After`` delay and is retried a bounded number of
+times; the time callers spend waiting for a token is recorded per host
+(see :func:`rate_limit_stats`). A ``Retry-After`` longer than
+:data:`config.RATE_LIMIT_MAX_WAIT` is never slept on: the host is
+suspended instead, and until then every request to it fails fast with a
+synthetic ``429`` response.
+
+Callers keep their own error handling: these helpers raise exactly what
+``requests`` raises, and a response that is still failing after the
+retries is returned (not raised) so status-code checks keep working.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from email.utils import parsedate_to_datetime
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from . import config, storage
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Statuses worth retrying: transient server / gateway failures. 429 is not
+# retried by the adapter: :func:`_request` honours ``Retry-After`` through
+# the host's rate limiter so every caller of that host backs off.
+RETRY_STATUSES: frozenset[int] = frozenset({500, 502, 503, 504})
+
+_SESSION: requests.Session | None = None
+_SESSION_LOCK = threading.Lock()
+
+# Conditional-GET counters: a hit is a 304, a miss is any other response
+# to a conditional (or first-time) request.
+_VALIDATOR_STATS: dict[str, int] = {"hits": 0, "misses": 0}
+_STATS_LOCK = threading.Lock()
+
+
+class TokenBucket:
+    """Thread-safe token bucket for one host.
+
+    Holds up to ``burst`` tokens, refilled at ``rate`` tokens per second.
+    :meth:`reserve` always takes a token, letting the balance go negative,
+    and returns how long the caller must sleep before sending; concurrent
+    callers therefore queue up in order instead of polling. ``rate=None``
+    never throttles but still honours :meth:`block_until`.
+
+    :meth:`suspend_until` records a block too long to wait out; it does not
+    delay :meth:`reserve`, callers check :meth:`suspended_for` first.
+    """
+
+    def __init__(
+        self,
+        rate: float | None,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._suspended_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token; return the seconds to wait before using it."""
+        with self._lock:
+            now = self._clock()
+            wait = max(0.0, self._blocked_until - now)
+            if self.rate:
+                elapsed = now - self._updated
+                self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+                self._tokens -= 1
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / self.rate)
+            self._updated = now
+            return wait
+
+    def block_until(self, when: float) -> None:
+        """Hold every request until the monotonic time ``when`` (e.g. ``Retry-After``)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, when)
+
+    def suspend_until(self, when: float) -> None:
+        """Refuse requests until the monotonic time ``when`` instead of queueing them."""
+        with self._lock:
+            self._suspended_until = max(self._suspended_until, when)
+
+    def suspended_for(self) -> float:
+        """Seconds left on a :meth:`suspend_until` block (``0.0`` if none)."""
+        with self._lock:
+            return max(0.0, self._suspended_until - self._clock())
+
+
+_LIMITERS: dict[str, TokenBucket] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+# Per-host throttling metrics: requests sent, seconds spent queued for a
+# token (total and worst case) and 429 responses received.
+_RATE_STATS: dict[str, dict[str, float]] = {}
+
+
+def _build_session() -> requests.Session:
+    """Create a session with pooled, retrying adapters for HTTP and HTTPS."""
+    retry = Retry(
+        total=config.HTTP_MAX_RETRIES,
+        backoff_factor=config.HTTP_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        # MalwareBazaar's ``get_recent`` query is a read-only POST.
+        allowed_methods=frozenset({"GET", "HEAD", "POST"}),
+        raise_on_status=False,
+        respect_retry_after_header=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=config.HTTP_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = config.USER_AGENT
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _SESSION = _build_session()
+                logger.debug(
+                    "HTTP session created (pools=%d, maxsize=%d, retries=%d)",
+                    config.HTTP_POOL_CONNECTIONS,
+                    config.HTTP_POOL_MAXSIZE,
+                    config.HTTP_MAX_RETRIES,
+                )
+    return _SESSION
+
+
+def reset_session() -> None:
+    """Close the shared session so the next call builds a fresh one.
+
+    Useful after changing the pool/retry settings at runtime, and in tests.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+        _SESSION = None
+
+
+def _limiter(host: str, create: bool = False) -> TokenBucket | None:
+    """Return the bucket for ``host``, building it from config on first use.
+
+    Hosts without a configured limit get an unthrottled bucket only when
+    ``create`` is set (i.e. once they have answered 429).
+    """
+    bucket = _LIMITERS.get(host)
+    if bucket is not None:
+        return bucket
+    with _LIMITERS_LOCK:
+        bucket = _LIMITERS.get(host)
+        if bucket is None:
+            limit = config.HOST_RATE_LIMITS.get(host)
+            if limit is None and not create:
+                return None
+            bucket = TokenBucket(*limit) if limit else TokenBucket(None)
+            _LIMITERS[host] = bucket
+        return bucket
+
+
+def set_rate_limit(host: str, rate: float, burst: int = 1) -> None:
+    """Throttle ``host`` to ``rate`` requests per second.
+
+    Used for limits declared by collector plugins. Hosts listed in
+    :data:`config.HOST_RATE_LIMITS` keep their configured limit.
+    """
+    host = host.lower()
+    if host in config.HOST_RATE_LIMITS:
+        return
+    with _LIMITERS_LOCK:
+        current = _LIMITERS.get(host)
+        if current is None or (current.rate, current.burst) != (rate, max(1, burst)):
+            _LIMITERS[host] = TokenBucket(rate, burst)
+
+
+def reset_rate_limits() -> None:
+    """Forget every bucket (pending waits, ``Retry-After`` blocks, plugin limits)."""
+    with _LIMITERS_LOCK:
+        _LIMITERS.clear()
+
+
+def _record(host: str, waited: float = 0.0, throttled: int = 0) -> None:
+    with _STATS_LOCK:
+        stats = _RATE_STATS.setdefault(
+            host, {"requests": 0, "waited": 0.0, "max_wait": 0.0, "throttled": 0}
+        )
+        if not throttled:
+            stats["requests"] += 1
+            stats["waited"] += waited
+            stats["max_wait"] = max(stats["max_wait"], waited)
+        stats["throttled"] += throttled
+
+
+def rate_limit_stats() -> dict[str, dict[str, float]]:
+    """Per-host ``requests``, ``waited`` / ``max_wait`` seconds and ``throttled`` (429s)."""
+    with _STATS_LOCK:
+        return {host: dict(stats) for host, stats in _RATE_STATS.items()}
+
+
+def reset_rate_limit_stats() -> None:
+    """Zero the per-host throttling metrics (called at the start of each run)."""
+    with _STATS_LOCK:
+        _RATE_STATS.clear()
+
+
+def _retry_after(resp: requests.Response) -> float:
+    """Seconds requested by a ``Retry-After`` header (delta or HTTP date)."""
+    value = (resp.headers.get("Retry-After") or "").strip()
+    if not value:
+        return config.RATE_LIMIT_DEFAULT_BACKOFF
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return config.RATE_LIMIT_DEFAULT_BACKOFF
+    return max(0.0, when.timestamp() - time.time())
+
+
+def _suspended_response(url: str, remaining: float) -> requests.Response:
+    """A ``429`` standing in for a request not sent to a suspended host."""
+    resp = requests.Response()
+    resp.status_code = 429
+    resp.reason = "Too Many Requests"
+    resp.url = url
+    resp.headers["Retry-After"] = str(int(remaining) + 1)
+    resp._content = b""
+    return resp
+
+
+def _request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    """Call ``session.<method>`` under the host's rate limit, retrying on 429."""
+    kwargs.setdefault("timeout", config.HTTP_TIMEOUT)
+    host = (urlsplit(url).hostname or "").lower()
+    retries = 0
+    while True:
+        bucket = _limiter(host)
+        remaining = bucket.suspended_for() if bucket else 0.0
+        if remaining > 0:
+            logger.debug("%s is suspended for another %.0fs; not sending %s", host, remaining, url)
+            return _suspended_response(url, remaining)
+        waited = bucket.reserve() if bucket else 0.0
+        if waited > 0:
+            logger.debug("Rate limit: waiting %.2fs for %s", waited, host)
+            time.sleep(waited)
+        _record(host, waited)
+        resp = getattr(get_session(), method)(url, **kwargs)
+        if resp.status_code != 429:
+            return resp
+        delay = _retry_after(resp)
+        _record(host, throttled=1)
+        bucket = _limiter(host, create=True)
+        if delay > config.RATE_LIMIT_MAX_WAIT:
+            bucket.suspend_until(time.monotonic() + delay)  # type: ignore[union-attr]
+            logger.warning(
+                "%s is rate limiting us (429, retry after %.1fs); suspending requests to it",
+                host,
+                delay,
+            )
+            return resp
+        bucket.block_until(time.monotonic() + delay)  # type: ignore[union-attr]
+        if retries >= config.RATE_LIMIT_RETRIES:
+            logger.warning("%s is rate limiting us (429, retry after %.1fs); giving up", host, delay)
+            return resp
+        retries += 1
+        logger.info(
+            "%s returned 429; retrying in %.1fs (%d/%d)",
+            host,
+            delay,
+            retries,
+            config.RATE_LIMIT_RETRIES,
+        )
+        resp.close()
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    """``GET`` through the shared session.
+
+    Accepts the same keyword arguments as :func:`requests.get`;
+    ``timeout`` defaults to :data:`config.HTTP_TIMEOUT`. The request waits
+    for the host's rate limiter and is retried after a ``429``.
+    """
+    return _request("get", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    """``POST`` through the shared session (see :func:`get`)."""
+    return _request("post", url, **kwargs)
+
+
+def _count(kind: str) -> None:
+    with _STATS_LOCK:
+        _VALIDATOR_STATS[kind] += 1
+
+
+def validator_stats() -> dict[str, int]:
+    """Return a copy of the conditional-GET ``hits`` / ``misses`` counters."""
+    with _STATS_LOCK:
+        return dict(_VALIDATOR_STATS)
+
+
+def reset_validator_stats() -> None:
+    """Zero the conditional-GET counters (called at the start of each run)."""
+    with _STATS_LOCK:
+        _VALIDATOR_STATS.update(hits=0, misses=0)
+
+
+def conditional_get(url: str, enabled: bool | None = None, **kwargs: Any) -> requests.Response:
+    """``GET`` that revalidates against the validators stored for ``url``.
+
+    When ``enabled`` (default :data:`config.HTTP_CONDITIONAL_GET`) is off
+    this is a plain :func:`get`. Otherwise the stored ``ETag`` / ``Last-Modified`` are sent
+    as ``If-None-Match`` / ``If-Modified-Since``; a ``304`` response means
+    the caller can skip parsing. Validators from a ``200`` are *not* saved
+    here: call :func:`remember_validators` once the body has been consumed
+    successfully, so a failed parse never masks data on the next poll.
+    """
+    if not (config.HTTP_CONDITIONAL_GET if enabled is None else enabled):
+        return get(url, **kwargs)
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    validator = storage.load_http_validator(url)
+    if validator:
+        etag, last_modified = validator
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    resp = get(url, headers=headers, **kwargs)
+    if resp.status_code == 304:
+        _count("hits")
+        logger.debug("Not modified: %s", url)
+    else:
+        _count("misses")
+    return resp
+
+
+def remember_validators(url: str, resp: requests.Response, enabled: bool | None = None) -> None:
+    """Persist the ``ETag`` / ``Last-Modified`` of a successful response.
+
+    ``url`` must be the same string passed to :func:`conditional_get`, and
+    ``enabled`` the same switch.
+    """
+    if not (config.HTTP_CONDITIONAL_GET if enabled is None else enabled):
+        return
+    if resp.status_code != 200:
+        return
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if etag or last_modified:
+        storage.save_http_validator(url, etag, last_modified)
@@ -8,10 +8,24 @@ that appears in multiple sources keeps references to every source.
 
 from __future__ import annotations
 
+import os
 import re
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict, deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from itertools import chain, islice
 from typing import Any
 from urllib.parse import urlparse
 
+from . import allowlist, config, ioc_validator
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
 # === Regular expressions for IoC detection ==============================
 # Practical, conservative patterns. They deliberately avoid edge cases
 # like IPv6 (too many false positives against the domain regex) and
@@ -22,6 +36,25 @@ MD5_RE = re.compile(r"\b[a-fA-F0-9]{32}\b")
 SHA1_RE = re.compile(r"\b[a-fA-F0-9]{40}\b")
 SHA256_RE = re.compile(r"\b[a-fA-F0-9]{64}\b")
 
+# Every match of the patterns above is made of ``[A-Za-z0-9.-]`` and so
+# lies inside one maximal run of ``[\w.-]``; the characters around a run
+# are non-word, so ``\b`` behaves the same whether a pattern scans the
+# whole text or the run alone. Only runs with a dot (IPs, domains) or of
+# at least 32 characters (hashes) can hold an IoC, which this one pattern
+# picks out; everything else (the bulk of prose) is skipped in C.
+_CANDIDATE_RE = re.compile(r"(?<![\w.-])(?:[\w-]*\.[\w.-]*|[\w-]{32,}(?![\w.-]))")
+_HASH_LENGTHS = frozenset({32, 40, 64})
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+# Defanged separators as written in CTI reports: ``evil[.]com``,
+# ``1.2.3(.)4``, ``evil[dot]com``, ``hxxp[://]``. The pattern starts with a
+# bracket class so the regex engine can skip ahead to candidate brackets,
+# and text with no bracket at all (a handful of memchr-speed ``in``
+# checks) skips the scan altogether.
+# A defanged scheme (``hxxp://``) needs no rewrite: only the host is
+# extracted, and the domain pattern finds it after ``://`` either way.
+_DEFANG_RE = re.compile(r"[\[({](?:(\.|:|://)|[dD][oO][tT])[\])}]")
+
 
 def _norm_domain(d: str) -> str:
     """Strip surrounding punctuation and lowercase a domain."""
@@ -38,9 +71,80 @@ def _norm_hash(h: str) -> str:
     return h.strip().lower()
 
 
+def refang(text: str) -> str:
+    """Undo common IoC defanging: ``evil[.]com`` -> ``evil.com``.
+
+    One left-to-right scan, and none at all for text without brackets.
+    ``[dot]`` also swallows one space on either side (``evil [dot] com``).
+    """
+    if "[" not in text and "(" not in text and "{" not in text:
+        return text
+    parts: list[str] = []
+    pos = 0
+    for m in _DEFANG_RE.finditer(text):
+        start, end = m.span()
+        sep = m.group(1)
+        if sep is None:
+            if start > pos and text[start - 1] == " ":
+                start -= 1
+            if text.startswith(" ", end):
+                end += 1
+            sep = "."
+        parts.append(text[pos:start])
+        parts.append(sep)
+        pos = end
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
 def _extract_from_text(text: str) -> dict[str, set[str]]:
     """Extract IoCs from a single text blob.
 
+    Refangs ``text`` (see :func:`refang`), scans it once for candidate
+    tokens (see :data:`_CANDIDATE_RE`) and classifies each; the result is
+    identical to running every IoC pattern over the refanged text
+    (:func:`_extract_from_text_multipass`).
+
+    Args:
+        text: Free text to scan.
+
+    Returns:
+        Dict with three sets: ``{"ip": {...}, "domain": {...}, "hash": {...}}``.
+    """
+    iocs: dict[str, set[str]] = {"ip": set(), "domain": set(), "hash": set()}
+    if not text:
+        return iocs
+    ips, domains, hashes = iocs["ip"], iocs["domain"], iocs["hash"]
+
+    for token in _CANDIDATE_RE.findall(refang(text)):
+        if "." in token:
+            for m in IPV4_RE.findall(token):
+                ips.add(_norm_ip(m))
+            for m in DOMAIN_RE.findall(token):
+                if not IPV4_RE.match(m):
+                    domains.add(_norm_domain(m))
+            if len(token) < 32:
+                continue
+        elif len(token) in _HASH_LENGTHS and _HEX_DIGITS.issuperset(token):
+            # The common case: a bare hash.
+            hashes.add(_norm_hash(token))
+            continue
+        for pattern in (MD5_RE, SHA1_RE, SHA256_RE):
+            for m in pattern.findall(token):
+                hashes.add(_norm_hash(m))
+
+    return iocs
+
+
+def _extract_from_text_multipass(text: str) -> dict[str, set[str]]:
+    """Reference extractor: one pass over ``text`` per IoC pattern.
+
+    Kept as the oracle :func:`_extract_from_text` is tested and
+    benchmarked against. Does not refang; pass it :func:`refang` output
+    to compare.
+
     Args:
         text: Free text to scan.
 
@@ -69,30 +173,29 @@ def _extract_from_text(text: str) -> dict[str, set[str]]:
     return iocs
 
 
-def extract_iocs(threats: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    """Extract and aggregate IoCs across threat records.
+# Aggregation state: ``(indicator, type) -> (sources, titles)``. Dict
+# insertion order is first-appearance order.
+_IocMap = dict[tuple[str, str], tuple[set[str], set[str]]]
 
-    Args:
-        threats: List of threat dicts containing at least ``title``,
-            ``summary`` (or ``summary_nlp``) and ``url``.
 
-    Returns:
-        List of dicts, one per unique IoC, with keys:
-          - ``indicator``: the IoC value.
-          - ``type``: ``"ip"`` | ``"domain"`` | ``"hash"``.
-          - ``sources``: sorted list of URLs where the IoC was seen.
-          - ``titles``: sorted list of threat titles where it appeared.
-          - ``first_seen``: ``None``, reserved for the enricher.
-    """
-    ioc_map: dict[tuple[str, str], dict[str, Any]] = {}
+def _threat_fields(threat: dict[str, Any]) -> tuple[str, str, str]:
+    """``(title, summary, url)`` of a threat, the only fields extraction reads."""
+    title = threat.get("title", "") or ""
+    summary = threat.get("summary", "") or threat.get("summary_nlp", "") or ""
+    url = threat.get("url", "") or ""
+    return title, summary, url
 
-    for t in threats:
-        title = t.get("title", "") or ""
-        summary = t.get("summary", "") or t.get("summary_nlp", "") or ""
-        url = t.get("url", "") or ""
-        text_blob = " ".join([title, summary, url])
 
-        found = _extract_from_text(text_blob)
+def _extract_chunk(rows: list[tuple[str, str, str]]) -> _IocMap:
+    """Extract and locally aggregate IoCs from ``(title, summary, url)`` rows.
+
+    Runs in pool workers, so it only takes and returns picklable builtins.
+    Within a row, indicators are visited by type and then sorted, so the
+    first-appearance order is the same on every run.
+    """
+    ioc_map: _IocMap = {}
+    for title, summary, url in rows:
+        found = _extract_from_text(" ".join([title, summary, url]))
 
         # Pull the host out of an HTTP(S) URL as an extra domain IoC.
         if url.startswith("http"):
@@ -104,25 +207,420 @@ def extract_iocs(threats: list[dict[str, Any]]) -> list[dict[str, Any]]:
             except Exception:  # noqa: BLE001
                 pass
 
-        for ioc_type, source_set in found.items():
-            for value in source_set:
-                key = (value, ioc_type)
-                ioc = ioc_map.get(
-                    key, {"indicator": value, "type": ioc_type, "sources": set(), "titles": set()}
-                )
+        for ioc_type, values in found.items():
+            for value in sorted(values):
+                entry = ioc_map.get((value, ioc_type))
+                if entry is None:
+                    entry = ioc_map[(value, ioc_type)] = (set(), set())
                 if url:
-                    ioc["sources"].add(url)
+                    entry[0].add(url)
                 if title:
-                    ioc["titles"].add(title)
-                ioc_map[key] = ioc
+                    entry[1].add(title)
+    return ioc_map
+
+
+def _merge(into: _IocMap, part: _IocMap) -> None:
+    """Fold ``part`` into ``into``; new keys keep ``part``'s order."""
+    for key, (sources, titles) in part.items():
+        entry = into.get(key)
+        if entry is None:
+            into[key] = (sources, titles)
+        else:
+            entry[0].update(sources)
+            entry[1].update(titles)
+
+
+# Indicators dropped by validation since the last reset, by reason (see
+# :func:`_screen`).
+_SUPPRESSED: Counter[str] = Counter()
+
+
+def suppression_stats() -> dict[str, int]:
+    """Indicators suppressed since the last reset, by reason."""
+    return dict(_SUPPRESSED)
+
+
+def reset_suppression_stats() -> None:
+    """Zero the counters behind :func:`suppression_stats`."""
+    _SUPPRESSED.clear()
+
+
+def _screen(key: tuple[str, str]) -> str | None:
+    """Why ``(indicator, type)`` should not reach the enricher, or ``None``.
+
+    Returns a reason from :func:`ioc_validator.invalid_reason`, or
+    ``"allowlisted"`` for indicators in :func:`allowlist.default_allowlist`.
+    """
+    reason = ioc_validator.invalid_reason(*key)
+    if reason is None and allowlist.default_allowlist().contains(*key):
+        reason = "allowlisted"
+    return reason
+
+
+def _suppressed(key: tuple[str, str], rejected: set[tuple[str, str]]) -> bool:
+    """Whether ``(indicator, type)`` is screened out; counts each key once per ``rejected``."""
+    if key in rejected:
+        return True
+    reason = _screen(key)
+    if reason is None:
+        return False
+    rejected.add(key)
+    _SUPPRESSED[reason] += 1
+    return True
+
+
+def _chunks(threats: Iterable[dict[str, Any]], size: int) -> Iterator[list[tuple[str, str, str]]]:
+    """Lazily cut ``threats`` into lists of at most ``size`` field tuples."""
+    it = iter(threats)
+    while chunk := [_threat_fields(t) for t in islice(it, size)]:
+        yield chunk
+
+
+def _aggregate(
+    threats: Iterable[dict[str, Any]],
+    workers: int | None,
+    chunk_size: int | None,
+    merge: Callable[[_IocMap], None],
+    validate: bool | None = None,
+) -> None:
+    """Extract IoCs from ``threats`` chunk by chunk, passing each partial map to ``merge``.
+
+    ``threats`` is consumed lazily, one chunk at a time. Chunks go to a
+    process pool when ``workers > 1`` and there is more than one chunk; at
+    most ``2 * workers`` chunks are in flight and results are merged in
+    submission order, so memory is bounded by chunk size times workers and
+    ``merge`` sees the same sequence either way. If the pool fails, the
+    chunks still in flight and the rest of the input are extracted
+    in-process. With ``validate`` (default :data:`config.IOC_VALIDATE`),
+    invalid and allowlisted indicators are dropped in this process before
+    ``merge`` and counted once each.
+    """
+    if config.IOC_VALIDATE if validate is None else validate:
+        rejected: set[tuple[str, str]] = set()
+        merge_all = merge
+
+        def merge(part: _IocMap) -> None:
+            for key in [key for key in part if _suppressed(key, rejected)]:
+                del part[key]
+            merge_all(part)
+
+    workers = config.IOC_WORKERS if workers is None else workers
+    if workers < 0:
+        workers = os.cpu_count() or 1
+    size = max(1, chunk_size or config.IOC_CHUNK_SIZE)
+    chunks = _chunks(threats, size)
+    head = list(islice(chunks, 2))
+    if workers > 1 and len(head) > 1:
+        _aggregate_in_pool(chain(head, chunks), workers, size, merge)
+        return
+    for chunk in chain(head, chunks):
+        merge(_extract_chunk(chunk))
+
+
+def _aggregate_in_pool(
+    chunks: Iterator[list[tuple[str, str, str]]],
+    workers: int,
+    size: int,
+    merge: Callable[[_IocMap], None],
+) -> None:
+    """Extract ``chunks`` on a process pool for :func:`_aggregate`.
+
+    Reading ``chunks`` stays outside the error handling, so a failing
+    input propagates instead of being mistaken for a broken pool.
+    """
+    started = time.perf_counter()
+    # Chunks not merged yet, and the futures of those already submitted.
+    queued: deque[list[tuple[str, str, str]]] = deque()
+    futures: deque[Future[_IocMap]] = deque()
+    n_threats = 0
+
+    def fall_back(exc: Exception) -> None:
+        logger.warning("Parallel IoC extraction failed (%s); extracting in-process", exc)
+        futures.clear()
+        while queued:
+            merge(_extract_chunk(queued.popleft()))
+
+    def drain(limit: int) -> None:
+        while len(futures) > limit:
+            merge(futures[0].result())
+            futures.popleft()
+            queued.popleft()
+
+    try:
+        pool: ProcessPoolExecutor | None = ProcessPoolExecutor(max_workers=workers)
+    except Exception as exc:  # noqa: BLE001
+        fall_back(exc)
+        pool = None
+    try:
+        for chunk in chunks:
+            n_threats += len(chunk)
+            if pool is None:
+                merge(_extract_chunk(chunk))
+                continue
+            queued.append(chunk)
+            try:
+                futures.append(pool.submit(_extract_chunk, chunk))
+                drain(2 * workers)
+            except Exception as exc:  # noqa: BLE001
+                fall_back(exc)
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = None
+        if pool is not None:
+            try:
+                drain(0)
+            except Exception as exc:  # noqa: BLE001
+                fall_back(exc)
+            else:
+                logger.info(
+                    "Extracted IoCs from %d threats in %.2fs (%d workers, chunk_size=%d)",
+                    n_threats,
+                    time.perf_counter() - started,
+                    workers,
+                    size,
+                )
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _remember(known: set[str], new: set[str], limit: int) -> None:
+    """Add ``new`` to ``known`` without growing it past ``limit`` items."""
+    room = limit - len(known)
+    if room >= len(new):
+        known.update(new)
+    elif room > 0:
+        known.update(sorted(new)[:room])
+
+
+def iter_iocs(
+    threats: Iterable[dict[str, Any]],
+    max_tracked: int | None = None,
+    only_new: bool = False,
+    validate: bool | None = None,
+    max_refs: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Stream IoCs from an iterable of threats as they are found.
+
+    Consumes ``threats`` lazily, so extraction can be pipelined with
+    enrichment and storage. An IoC dict (same shape as
+    :func:`extract_iocs` items) is yielded the first time an indicator is
+    seen and again whenever it gains a new source URL or title. Updates
+    are deltas: ``sources``/``titles`` hold only the references not yet
+    yielded for that indicator, so consumers must upsert, merging them
+    into what they already stored. Folding every update together gives
+    the :func:`extract_iocs` result.
+
+    State is bounded: an LRU of at most ``max_tracked`` indicators, each
+    remembering at most ``max_refs`` sources and titles. An indicator
+    evicted and later seen again is yielded as new, and a reference past
+    the ``max_refs`` cap may be yielded more than once; both are harmless
+    to an upserting consumer.
+
+    Args:
+        threats: Any iterable of threat dicts (a generator, a DB cursor...).
+        max_tracked: Indicators kept in the dedup LRU. Defaults to
+            :data:`config.IOC_STREAM_MAX_TRACKED`.
+        only_new: Yield each indicator only on first sight (e.g. to feed
+            the enricher), not on later updates.
+        validate: Drop invalid and allowlisted indicators (see
+            :mod:`ioc_validator` and :mod:`allowlist`). Defaults to
+            :data:`config.IOC_VALIDATE`.
+        max_refs: Sources (and titles) remembered per indicator. Defaults
+            to :data:`config.IOC_STREAM_MAX_REFS`.
+    """
+    capacity = max(1, max_tracked or config.IOC_STREAM_MAX_TRACKED)
+    ref_limit = max(1, max_refs or config.IOC_STREAM_MAX_REFS)
+    check = config.IOC_VALIDATE if validate is None else validate
+    # ``None`` marks an indicator that failed validation.
+    seen: OrderedDict[tuple[str, str], tuple[set[str], set[str]] | None] = OrderedDict()
+    evicted = 0
+    for threat in threats:
+        for key, (sources, titles) in _extract_chunk([_threat_fields(threat)]).items():
+            if key in seen:
+                seen.move_to_end(key)
+                entry = seen[key]
+                if entry is None or only_new:
+                    continue
+                sources -= entry[0]
+                titles -= entry[1]
+                if not sources and not titles:
+                    continue
+            else:
+                reason = _screen(key) if check else None
+                if reason is not None:
+                    _SUPPRESSED[reason] += 1
+                seen[key] = entry = None if reason else (set(), set())
+                if len(seen) > capacity:
+                    seen.popitem(last=False)
+                    evicted += 1
+                if entry is None:
+                    continue
+            _remember(entry[0], sources, ref_limit)
+            _remember(entry[1], titles, ref_limit)
+            yield {
+                "indicator": key[0],
+                "type": key[1],
+                "sources": sorted(sources),
+                "titles": sorted(titles),
+                "first_seen": None,
+            }
+    if evicted:
+        logger.info("iter_iocs: %d indicators evicted from the dedup LRU (%d tracked)", evicted, capacity)
+
+
+class IocRecord:
+    """One aggregated indicator in an :class:`IocIndex`.
+
+    ``sources`` and ``titles`` are sorted arrays of string IDs interned by
+    the owning index, not the strings themselves.
+    """
+
+    __slots__ = ("indicator", "type", "sources", "titles")
+
+    def __init__(self, indicator: str, ioc_type: str) -> None:
+        self.indicator = indicator
+        self.type = ioc_type
+        self.sources = array("I")
+        self.titles = array("I")
+
+
+def _add_ids(ids: array, new: Iterable[int]) -> None:
+    """Insert ``new`` IDs into the sorted, duplicate-free array ``ids``."""
+    if not ids:
+        ids.extend(sorted(set(new)))
+        return
+    for i in new:
+        pos = bisect_left(ids, i)
+        if pos == len(ids) or ids[pos] != i:
+            ids.insert(pos, i)
+
+
+class IocIndex:
+    """Memory-compact IoC aggregation for very large batches.
+
+    Equivalent to the ``ioc_map`` behind :func:`extract_iocs`, but each
+    indicator is a ``__slots__`` :class:`IocRecord` and every distinct
+    source URL or title is stored once, with records referencing it by a
+    32-bit ID. Output dicts are only built by :meth:`iter_dicts` /
+    :meth:`to_dicts`. Build one with :func:`build_ioc_index`.
+    """
+
+    __slots__ = ("_strings", "_ids", "_records")
+
+    def __init__(self) -> None:
+        self._strings: list[str] = []
+        self._ids: dict[str, int] = {}
+        self._records: dict[tuple[str, str], IocRecord] = {}
+
+    def _intern(self, value: str) -> int:
+        i = self._ids.get(value)
+        if i is None:
+            i = self._ids[value] = len(self._strings)
+            self._strings.append(value)
+        return i
+
+    def update(self, part: _IocMap) -> None:
+        """Merge a partial ``(indicator, type) -> (sources, titles)`` map."""
+        records, intern = self._records, self._intern
+        for key, (sources, titles) in part.items():
+            record = records.get(key)
+            if record is None:
+                record = records[key] = IocRecord(*key)
+            _add_ids(record.sources, map(intern, sources))
+            _add_ids(record.titles, map(intern, titles))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[IocRecord]:
+        return iter(self._records.values())
+
+    def strings(self, ids: Iterable[int]) -> list[str]:
+        """Sorted strings for interned ``ids`` (e.g. ``record.sources``)."""
+        strings = self._strings
+        return sorted(strings[i] for i in ids)
+
+    def iter_dicts(self) -> Iterator[dict[str, Any]]:
+        """Yield records in the :func:`extract_iocs` output shape, one at a time."""
+        for record in self._records.values():
+            yield {
+                "indicator": record.indicator,
+                "type": record.type,
+                "sources": self.strings(record.sources),
+                "titles": self.strings(record.titles),
+                "first_seen": None,
+            }
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        """Materialise the whole index; equal to :func:`extract_iocs` output."""
+        return list(self.iter_dicts())
+
+
+def build_ioc_index(
+    threats: Iterable[dict[str, Any]],
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    validate: bool | None = None,
+) -> IocIndex:
+    """Extract IoCs into a compact :class:`IocIndex` instead of a list of dicts.
+
+    Same extraction and parallelism as :func:`extract_iocs`; meant for
+    backfills where per-IoC dicts and sets would not fit in memory.
+    """
+    index = IocIndex()
+    _aggregate(threats, workers, chunk_size, index.update, validate)
+    return index
+
+
+def extract_iocs(
+    threats: list[dict[str, Any]],
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    validate: bool | None = None,
+) -> list[dict[str, Any]]:
+    """Extract and aggregate IoCs across threat records.
+
+    Batches larger than one chunk can be sharded across a process pool:
+    each worker extracts and deduplicates its chunk, and the partial
+    results are merged in chunk order, so the output is identical for any
+    ``workers`` / ``chunk_size``. If the pool cannot be used the batch is
+    extracted in-process.
+
+    Bogon IPs and names that are not registrable domains (``setup.exe``,
+    ``co.uk``) are dropped so they never reach the enricher, as are
+    known-benign indicators such as the feeds' own sites; see
+    :mod:`aegistrace.ioc_validator`, :mod:`aegistrace.allowlist` and
+    :func:`suppression_stats`.
+
+    Args:
+        threats: List of threat dicts containing at least ``title``,
+            ``summary`` (or ``summary_nlp``) and ``url``.
+        workers: Worker processes (``-1`` = one per CPU, ``1`` = no pool).
+            Defaults to :data:`config.IOC_WORKERS`.
+        chunk_size: Threats per worker task. Defaults to
+            :data:`config.IOC_CHUNK_SIZE`.
+        validate: Drop invalid and allowlisted indicators. Defaults to
+            :data:`config.IOC_VALIDATE`.
+
+    Returns:
+        List of dicts, one per unique IoC in first-appearance order, with
+        keys:
+          - ``indicator``: the IoC value.
+          - ``type``: ``"ip"`` | ``"domain"`` | ``"hash"``.
+          - ``sources``: sorted list of URLs where the IoC was seen.
+          - ``titles``: sorted list of threat titles where it appeared.
+          - ``first_seen``: ``None``, reserved for the enricher.
+    """
+    ioc_map: _IocMap = {}
+    _aggregate(threats, workers, chunk_size, partial(_merge, ioc_map), validate)
 
     return [
         {
-            "indicator": data["indicator"],
-            "type": data["type"],
-            "sources": sorted(data["sources"]),
-            "titles": sorted(data["titles"]),
+            "indicator": value,
+            "type": ioc_type,
+            "sources": sorted(sources),
+            "titles": sorted(titles),
             "first_seen": None,
         }
-        for (_, _type), data in ioc_map.items()
+        for (value, ioc_type), (sources, titles) in ioc_map.items()
     ]
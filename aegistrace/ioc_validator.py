@@ -0,0 +1,181 @@
+"""Post-extraction validation of IP and domain IoCs.
+
+The extraction regexes are deliberately permissive, so they also catch
+private and reserved addresses and dotted names that are not domains at
+all (``setup.exe``, ``config.json``). Sending those to the enricher only
+burns API quota. This module rejects them cheaply:
+
+* IPv4 addresses are packed into 32-bit ints and looked up with
+  :func:`bisect.bisect_right` in a sorted table of merged bogon
+  intervals (RFC 6890 special-purpose, multicast and reserved space).
+* Domains are checked against the bundled Mozilla Public Suffix List
+  (``data/public_suffix_list.dat``), compiled once into a label trie: the
+  top-level label must be a real TLD, and the name must be longer than
+  its public suffix (``co.uk`` alone is not a registrable domain).
+
+Hashes are always accepted.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from contextlib import suppress
+from functools import lru_cache
+from importlib.resources import files
+from typing import Any
+
+# === IPv4 bogons =========================================================
+# IANA IPv4 special-purpose registry (RFC 6890 and updates), plus
+# multicast and the reserved 240/4 block. None of these are reachable on
+# the public internet, so they cannot be meaningful enrichment targets.
+BOGON_NETWORKS: tuple[str, ...] = (
+    "0.0.0.0/8",  # "this" network
+    "10.0.0.0/8",  # private
+    "100.64.0.0/10",  # carrier-grade NAT
+    "127.0.0.0/8",  # loopback
+    "169.254.0.0/16",  # link local
+    "172.16.0.0/12",  # private
+    "192.0.0.0/24",  # IETF protocol assignments
+    "192.0.2.0/24",  # TEST-NET-1
+    "192.88.99.0/24",  # deprecated 6to4 relay anycast
+    "192.168.0.0/16",  # private
+    "198.18.0.0/15",  # benchmarking
+    "198.51.100.0/24",  # TEST-NET-2
+    "203.0.113.0/24",  # TEST-NET-3
+    "224.0.0.0/4",  # multicast
+    "240.0.0.0/4",  # reserved, including 255.255.255.255
+)
+
+
+def ip_to_int(ip: str) -> int | None:
+    """Pack a dotted-quad IPv4 address into an int; ``None`` if malformed."""
+    parts = ip.split(".")
+    if len(parts) != 4 or not ip.isascii():
+        return None
+    packed = 0
+    for part in parts:
+        if not part.isdigit() or int(part) > 255:
+            return None
+        packed = packed << 8 | int(part)
+    return packed
+
+
+def cidr_intervals(networks: tuple[str, ...]) -> tuple[list[int], list[int]]:
+    """Sorted, merged ``(starts, ends)`` of inclusive int ranges for CIDR ``networks``.
+
+    A bare address counts as a ``/32``. Raises :class:`ValueError` for a
+    malformed network.
+    """
+    spans = []
+    for network in networks:
+        address, _, prefix = network.partition("/")
+        start = ip_to_int(address)
+        if start is None or not (prefix or "32").isdigit() or int(prefix or 32) > 32:
+            raise ValueError(f"bad network {network!r}")
+        prefix = prefix or "32"
+        start &= ~((1 << (32 - int(prefix))) - 1) & 0xFFFFFFFF
+        spans.append((start, start + (1 << (32 - int(prefix))) - 1))
+    starts: list[int] = []
+    ends: list[int] = []
+    for start, end in sorted(spans):
+        if ends and start <= ends[-1] + 1:
+            ends[-1] = max(ends[-1], end)
+        else:
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
+
+
+_BOGON_STARTS, _BOGON_ENDS = cidr_intervals(BOGON_NETWORKS)
+
+
+def in_intervals(value: int, starts: list[int], ends: list[int]) -> bool:
+    """Whether ``value`` falls in one of the sorted, disjoint ``[start, end]`` ranges."""
+    i = bisect_right(starts, value) - 1
+    return i >= 0 and value <= ends[i]
+
+
+def is_public_ip(ip: str) -> bool:
+    """``True`` for a well-formed IPv4 address outside every bogon range."""
+    packed = ip_to_int(ip)
+    return packed is not None and not in_intervals(packed, _BOGON_STARTS, _BOGON_ENDS)
+
+
+# === Public suffix trie ==================================================
+# Trie of reversed labels (``{"uk": {"co": {...}}}``). Marker keys cannot
+# collide with hostname labels: ``"$"`` ends a rule, ``"!"`` flags an
+# exception rule and ``"*"`` holds a wildcard rule.
+_RULE, _EXCEPTION, _WILDCARD = "$", "!", "*"
+
+
+def _compile_psl(lines: Any) -> dict[str, Any]:
+    """Compile Public Suffix List ``lines`` into a label trie."""
+    root: dict[str, Any] = {}
+    for line in lines:
+        rule = line.strip()
+        if not rule or rule.startswith("//"):
+            continue
+        rule = rule.split()[0].lower()
+        exception = rule.startswith("!")
+        rule = rule.lstrip("!")
+        forms = {rule}
+        # Extracted domains are ASCII, so also index the punycode form.
+        with suppress(UnicodeError):
+            forms.add(rule.encode("idna").decode("ascii"))
+        for form in forms:
+            node = root
+            for label in reversed(form.split(".")):
+                node = node.setdefault(label, {})
+            node[_EXCEPTION if exception else _RULE] = True
+    return root
+
+
+@lru_cache(maxsize=1)
+def _psl() -> dict[str, Any]:
+    """The bundled Public Suffix List as a trie, compiled on first use."""
+    text = files("aegistrace").joinpath("data/public_suffix_list.dat").read_text(encoding="utf-8")
+    return _compile_psl(text.splitlines())
+
+
+def public_suffix_length(labels: list[str], trie: dict[str, Any] | None = None) -> int:
+    """Number of trailing ``labels`` that form the public suffix.
+
+    Implements the PSL matching algorithm: the longest matching rule wins,
+    exception rules beat wildcards, and an unlisted TLD falls back to the
+    implicit ``*`` rule (a one-label suffix).
+    """
+    node = _psl() if trie is None else trie
+    best = 1
+    for depth, label in enumerate(reversed(labels), 1):
+        child = node.get(label)
+        if _WILDCARD in node:
+            if child is not None and child.get(_EXCEPTION):
+                return depth - 1
+            best = depth
+        if child is None:
+            break
+        if child.get(_RULE):
+            best = depth
+        node = child
+    return best
+
+
+def is_registrable_domain(domain: str, trie: dict[str, Any] | None = None) -> bool:
+    """``True`` if ``domain`` ends in a real TLD and is longer than its public suffix."""
+    node = _psl() if trie is None else trie
+    labels = domain.lower().rstrip(".").split(".")
+    if len(labels) < 2 or labels[-1] not in node:
+        return False
+    return len(labels) > public_suffix_length(labels, node)
+
+
+def invalid_reason(indicator: str, ioc_type: str) -> str | None:
+    """Why an extracted IoC should be dropped, or ``None`` to keep it.
+
+    Returns ``"bogon_ip"`` or ``"unregistrable_domain"``.
+    """
+    if ioc_type == "ip" and not is_public_ip(indicator):
+        return "bogon_ip"
+    if ioc_type == "domain" and not is_registrable_domain(indicator):
+        return "unregistrable_domain"
+    return None
@@ -0,0 +1,134 @@
+"""Single-pass keyword matching for threat classification.
+
+:class:`KeywordMatcher` compiles a ``{category: [keywords]}`` taxonomy into
+an Aho-Corasick automaton once, then finds every keyword occurrence in a
+text with one left-to-right scan, however many terms the taxonomy holds.
+Matching is case-insensitive substring matching, the same semantics as
+``keyword in text.lower()``.
+
+Each automaton state carries a bitmask of the categories whose keywords
+end there (bit ``i`` = ``i``-th category in taxonomy order), so the
+highest-priority match is simply the lowest set bit.
+
+The automaton walks the text one character at a time in Python, so it
+only pays off for large taxonomies. Up to :data:`SCAN_MAX_KEYWORDS`
+keywords, the matcher instead runs one C-speed ``keyword in text``
+check per keyword, which is several times faster for the default
+taxonomy (see ``benchmarks/keyword_match.py``).
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Mapping
+
+# Taxonomies with at most this many keywords are matched with plain
+# substring checks rather than the automaton (measured crossover: ~150
+# keywords on ~150-character texts).
+SCAN_MAX_KEYWORDS = 128
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a keyword taxonomy.
+
+    Args:
+        taxonomy: Mapping of category name to keywords. Iteration order is
+            the category priority used by :meth:`first`.
+        scan_max_keywords: Use substring checks instead of the automaton
+            for taxonomies with at most this many keywords. Defaults to
+            :data:`SCAN_MAX_KEYWORDS`.
+    """
+
+    __slots__ = ("categories", "_keywords", "_goto", "_fail", "_out")
+
+    def __init__(
+        self, taxonomy: Mapping[str, Iterable[str]], scan_max_keywords: int | None = None
+    ) -> None:
+        self.categories: list[str] = list(taxonomy)
+        keywords = [tuple(k.lower() for k in taxonomy[c]) for c in self.categories]
+        limit = SCAN_MAX_KEYWORDS if scan_max_keywords is None else scan_max_keywords
+        # ``None`` selects the automaton.
+        self._keywords = keywords if sum(map(len, keywords)) <= limit else None
+        self._goto: list[dict[str, int]] = []
+        self._fail: list[int] = []
+        self._out: list[int] = []
+        if self._keywords is None:
+            self._build(keywords)
+
+    def _build(self, keywords: list[tuple[str, ...]]) -> None:
+        goto: list[dict[str, int]] = [{}]
+        out: list[int] = [0]
+        for bit, category_keywords in enumerate(keywords):
+            for keyword in category_keywords:
+                state = 0
+                for ch in keyword:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][ch] = nxt
+                        goto.append({})
+                        out.append(0)
+                    state = nxt
+                out[state] |= 1 << bit
+
+        # Breadth-first pass: link every state to its longest proper suffix
+        # that is also a trie path, and inherit that state's categories.
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0) if state else 0
+                out[nxt] |= out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def match_mask(self, text: str, stop: int = 0) -> int:
+        """Return the bitmask of categories with a keyword in ``text``.
+
+        Args:
+            text: Text to scan (any casing).
+            stop: Stop scanning as soon as any of these bits is found.
+        """
+        if not text:
+            return 0
+        if self._keywords is not None:
+            lowered = text.lower()
+            found = 0
+            for bit, keywords in enumerate(self._keywords):
+                for keyword in keywords:
+                    if keyword in lowered:
+                        found |= 1 << bit
+                        break
+                if found & stop:
+                    break
+            return found
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        found = out[0]  # an empty keyword matches any non-empty text
+        for ch in text.lower():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            found |= out[state]
+            if found & stop:
+                break
+        return found
+
+    def first(self, text: str) -> str | None:
+        """Return the highest-priority category matching ``text``, if any."""
+        mask = self.match_mask(text, stop=1)
+        if not mask:
+            return None
+        return self.categories[(mask & -mask).bit_length() - 1]
+
+    def all(self, text: str) -> list[str]:
+        """Return every category matching ``text``, in priority order."""
+        mask = self.match_mask(text)
+        return [category for bit, category in enumerate(self.categories) if mask >> bit & 1]
@@ -8,6 +8,12 @@ Orchestrates the full pipeline:
 The :func:`run` function is the single entry point used by both the CLI
 (:mod:`aegistrace.cli`) and the thin backward-compatible ``main.py``
 shim that lives at the repository root.
+
+pandas, plotly and statsmodels are imported inside the stages that use
+them, so importing this module (and therefore ``aegistrace --version``
+or ``--help``) stays cheap, and ``--no-forecast`` runs never load
+statsmodels. While sources are being collected the spaCy model is warmed
+up in a background thread (see :data:`aegistrace.config.NLP_WARMUP`).
 """
 
 from __future__ import annotations
@@ -15,15 +21,10 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any
 
-import pandas as pd
-
-from .collectors import fetch_all_sources
-from .dashboard_generator import generate_dashboard
-from .enricher import enrich_iocs
-from .ioc_extractor import extract_iocs
+from . import config, http_client, ioc_extractor
+from .collectors import SourceTiming, collect_sources
 from .logging_config import get_logger
-from .nlp_processor import process_nlp
-from .predictor import predict_trends
+from .nlp_processor import process_nlp, warm_up
 from .storage import init_db, save_iocs, save_threats
 
 logger = get_logger(__name__)
@@ -38,6 +39,7 @@ class PipelineResult:
     iocs_enriched: list[dict[str, Any]] = field(default_factory=list)
     dashboard_path: str = ""
     csv_path: str = ""
+    source_timings: list[SourceTiming] = field(default_factory=list)
 
 
 def run(
@@ -46,6 +48,11 @@ def run(
     forecast: bool = True,
     output: str = "dashboard.html",
     csv_path: str = "iocs_enriched.csv",
+    concurrent: bool | None = None,
+    collect_budget: float | None = None,
+    max_threats: int | None = None,
+    incremental: bool | None = None,
+    conditional_get: bool | None = None,
 ) -> PipelineResult:
     """Run the full AegisTrace pipeline.
 
@@ -58,6 +65,18 @@ def run(
             dashboard's forecast chart will be empty).
         output: HTML dashboard output path.
         csv_path: CSV export path for enriched IoCs.
+        concurrent: Fetch sources concurrently. ``None`` uses
+            :data:`aegistrace.config.CONCURRENT_COLLECTION`.
+        collect_budget: Wall-clock budget in seconds for the collection
+            phase. ``None`` uses :data:`aegistrace.config.COLLECTION_BUDGET`.
+        max_threats: Number of newest threats to keep. ``None`` uses
+            :data:`aegistrace.config.MAX_THREATS`.
+        incremental: Only collect records newer than each source's
+            high-water mark. ``None`` uses
+            :data:`aegistrace.config.INCREMENTAL_COLLECTION`.
+        conditional_get: Revalidate feed downloads with stored HTTP
+            validators. ``None`` uses
+            :data:`aegistrace.config.HTTP_CONDITIONAL_GET`.
 
     Returns:
         :class:`PipelineResult` with references to all produced artefacts.
@@ -65,16 +84,46 @@ def run(
     logger.info("Starting AegisTrace pipeline")
 
     init_db()
-    threats = fetch_all_sources(sources=sources)
-    threats = process_nlp(threats)
-    save_threats(threats)
-
-    predictions = predict_trends(threats) if forecast else pd.DataFrame(
-        {"date": [], "predicted_threats": [], "risk_level": []}
+    http_client.reset_rate_limit_stats()
+    ioc_extractor.reset_suppression_stats()
+    if config.NLP_WARMUP:
+        warm_up()
+    collection = collect_sources(
+        sources=sources,
+        concurrent=concurrent,
+        budget=collect_budget,
+        max_threats=max_threats,
+        incremental=incremental,
+        conditional_get=conditional_get,
     )
+    threats = process_nlp(collection.threats)
+    if collection.unchanged:
+        # Every source was unchanged since the last poll: the placeholder
+        # row must not inflate the daily counts predict_trends works from.
+        logger.info("Sources unchanged since last poll; not saving the placeholder threat")
+    else:
+        save_threats(threats)
+
+    import pandas as pd
 
-    iocs = extract_iocs(threats)
+    if forecast:
+        from .predictor import predict_trends
+
+        predictions = predict_trends(threats)
+    else:
+        predictions = pd.DataFrame({"date": [], "predicted_threats": [], "risk_level": []})
+
+    iocs = ioc_extractor.extract_iocs(threats)
+    suppressed = ioc_extractor.suppression_stats()
+    if suppressed:
+        logger.info(
+            "Suppressed %d IoCs before enrichment (%s)",
+            sum(suppressed.values()),
+            ", ".join(f"{reason}={count}" for reason, count in sorted(suppressed.items())),
+        )
     if enrich:
+        from .enricher import enrich_iocs
+
         iocs_enriched = enrich_iocs(iocs)
     else:
         iocs_enriched = [
@@ -94,8 +143,19 @@ def run(
     pd.DataFrame(iocs_enriched).to_csv(csv_path, index=False)
     logger.info("IoCs exported to %s", csv_path)
 
+    from .dashboard_generator import generate_dashboard
+
     dashboard_path = generate_dashboard(threats, predictions, iocs_enriched=iocs_enriched, output_file=output)
 
+    for host, stats in sorted(http_client.rate_limit_stats().items()):
+        logger.info(
+            "HTTP %s: %d requests, %.2fs queued for rate limit (max %.2fs), %d throttled (429)",
+            host,
+            stats["requests"],
+            stats["waited"],
+            stats["max_wait"],
+            stats["throttled"],
+        )
     logger.info("AegisTrace pipeline complete")
     return PipelineResult(
         threats=threats,
@@ -103,4 +163,5 @@ def run(
         iocs_enriched=iocs_enriched,
         dashboard_path=dashboard_path,
         csv_path=csv_path,
+        source_timings=collection.timings,
     )
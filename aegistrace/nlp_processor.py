@@ -3,37 +3,106 @@
 Loads the spaCy ``en_core_web_sm`` model lazily so importing the module
 does not crash when the model is missing (this is important for unit
 tests that only exercise the keyword-based classifier).
+
+Only ``doc.ents`` and ``doc.sents`` are used, so by default the model is
+loaded with the ``"fast"`` profile (see :data:`NLP_PROFILES`): NER plus a
+rule-based sentencizer, without the tagger, parser, lemmatizer and
+attribute ruler.
 """
 
 from __future__ import annotations
 
-from typing import Any
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
-from .config import THREAT_CATEGORIES
+from . import config, storage
+from .keywords import KeywordMatcher
 from .logging_config import get_logger
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = get_logger(__name__)
 
 # The spaCy model is loaded once on first use. ``None`` means "not loaded
 # yet"; ``False`` means "loading failed, do not retry".
 _NLP = None
 _NLP_DISABLED = False
+# Serialises the first load so a background warm-up and the pipeline
+# never load the model twice.
+_NLP_LOCK = threading.Lock()
+
+# Components excluded per profile. ``"fast"`` keeps NER and replaces the
+# parser-based sentence boundaries with the rule-based ``sentencizer``.
+NLP_PROFILES: dict[str, tuple[str, ...]] = {
+    "full": (),
+    "fast": ("tagger", "parser", "attribute_ruler", "lemmatizer", "senter"),
+}
+
+
+def _load_pipeline(model: str, profile: str):
+    """Load ``model`` with the components of ``profile`` only.
+
+    A shared ``tok2vec`` left without listeners (the NER of the small
+    English models embeds its own) is removed too.
+    """
+    import spacy
+
+    exclude = NLP_PROFILES[profile]
+    nlp = spacy.load(model, exclude=list(exclude))
+    if exclude:
+        if "tok2vec" in nlp.pipe_names and not nlp.get_pipe("tok2vec").listening_components:
+            nlp.remove_pipe("tok2vec")
+        if not nlp.has_pipe("sentencizer"):
+            nlp.add_pipe("sentencizer", first=True)
+    return nlp
+
+
+def _load_with_fallback(model: str, profile: str):
+    """Load ``profile``; if the trimmed pipeline cannot be built, load ``"full"``.
+
+    Returns ``(nlp, profile_used)``. A missing model (``OSError``) is
+    raised as is.
+    """
+    try:
+        return _load_pipeline(model, profile), profile
+    except OSError:
+        raise
+    except Exception as exc:  # noqa: BLE001
+        if profile == "full":
+            raise
+        logger.warning("NLP profile %r failed (%s); loading the full pipeline", profile, exc)
+        return _load_pipeline(model, "full"), "full"
 
 
 def _get_nlp():
-    """Return the spaCy model, or ``None`` if it is unavailable."""
+    """Return the spaCy model, or ``None`` if it is unavailable.
+
+    The pipeline is loaded with :data:`config.NLP_PROFILE` (unknown
+    profiles mean ``"full"``). Safe to call from several threads; a caller
+    arriving during a load (e.g. a :func:`warm_up` in flight) waits for it.
+    """
     global _NLP, _NLP_DISABLED
-    if _NLP_DISABLED:
-        return None
-    if _NLP is None:
+    if _NLP is not None or _NLP_DISABLED:
+        return _NLP
+    with _NLP_LOCK:
+        if _NLP is not None or _NLP_DISABLED:
+            return _NLP
+        model = config.NLP_MODEL
+        profile = config.NLP_PROFILE if config.NLP_PROFILE in NLP_PROFILES else "full"
+        started = time.perf_counter()
         try:
-            import spacy
-
-            _NLP = spacy.load("en_core_web_sm")
+            nlp, profile = _load_with_fallback(model, profile)
         except OSError:
             logger.warning(
-                "spaCy model 'en_core_web_sm' missing. "
-                "Run: python -m spacy download en_core_web_sm"
+                "spaCy model '%s' missing. Run: python -m spacy download %s", model, model
             )
             _NLP_DISABLED = True
             return None
@@ -41,29 +110,328 @@ def _get_nlp():
             logger.warning("Could not initialise spaCy: %s", exc)
             _NLP_DISABLED = True
             return None
+        logger.info(
+            "Loaded spaCy %s (%s profile: %s) in %.2fs",
+            model,
+            profile,
+            ", ".join(nlp.pipe_names),
+            time.perf_counter() - started,
+        )
+        _NLP = nlp
     return _NLP
 
 
-def classify_threat(text: str) -> str:
+def warm_up() -> threading.Thread:
+    """Start loading the spaCy model in a daemon thread and return it.
+
+    Lets the model load overlap with network-bound collection; the first
+    :func:`process_nlp` call then finds it ready (or waits for the load
+    to finish). Nothing is loaded when an NLP worker socket is present.
+    """
+
+    def load() -> None:
+        socket_path = config.NLP_WORKER_SOCKET
+        if not (socket_path and os.path.exists(socket_path)):
+            _get_nlp()
+
+    thread = threading.Thread(target=load, name="aegistrace-nlp-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+# Entity labels kept in ``threat["entities"]``.
+_ENTITY_LABELS = frozenset({"ORG", "GPE", "MONEY", "NORP"})
+
+
+# Compiled matchers keyed by taxonomy content, so a taxonomy is compiled
+# once however many records are classified against it, and editing a
+# taxonomy in place (e.g. ``config.THREAT_CATEGORIES`` before a
+# ``reclassify``) is picked up on the next call. LRU-bounded: a caller
+# building a new taxonomy per call only recompiles, it does not
+# accumulate automata.
+_Fingerprint = tuple[tuple[str, tuple[str, ...]], ...]
+_MATCHERS: OrderedDict[_Fingerprint, KeywordMatcher] = OrderedDict()
+_MATCHERS_MAX = 16
+_MATCHERS_LOCK = threading.Lock()
+
+
+def _matcher(taxonomy: Mapping[str, Iterable[str]] | None) -> KeywordMatcher:
+    """Return the (cached) :class:`KeywordMatcher` for ``taxonomy``'s current content."""
+    if taxonomy is None:
+        taxonomy = config.THREAT_CATEGORIES
+    key = tuple((category, tuple(keywords)) for category, keywords in taxonomy.items())
+    with _MATCHERS_LOCK:
+        matcher = _MATCHERS.get(key)
+        if matcher is not None:
+            _MATCHERS.move_to_end(key)
+            return matcher
+    matcher = KeywordMatcher(dict(key))
+    with _MATCHERS_LOCK:
+        _MATCHERS[key] = matcher
+        _MATCHERS.move_to_end(key)
+        while len(_MATCHERS) > _MATCHERS_MAX:
+            _MATCHERS.popitem(last=False)
+    return matcher
+
+
+def classify_threat(text: str, taxonomy: Mapping[str, Iterable[str]] | None = None) -> str:
     """Classify free text into one of :data:`config.THREAT_CATEGORIES`.
 
+    Categories are tried in taxonomy order and the first with a matching
+    keyword wins (see :class:`~aegistrace.keywords.KeywordMatcher`).
+
     Args:
         text: Threat title + summary (any casing).
+        taxonomy: ``{category: [keywords]}`` to use instead of
+            :data:`config.THREAT_CATEGORIES`.
 
     Returns:
         The matching category name, or ``"Uncategorized"`` when no
         keyword matches.
     """
-    if not text:
-        return "Uncategorized"
-    text_lower = text.lower()
-    for category, keywords in THREAT_CATEGORIES.items():
-        if any(keyword in text_lower for keyword in keywords):
-            return category
-    return "Uncategorized"
+    return _matcher(taxonomy).first(text) or "Uncategorized"
+
+
+def classify_threat_labels(
+    text: str, taxonomy: Mapping[str, Iterable[str]] | None = None
+) -> list[str]:
+    """Return every category with a keyword in ``text``, in priority order.
+
+    Multi-label counterpart of :func:`classify_threat`; an empty list means
+    no keyword matched.
+    """
+    return _matcher(taxonomy).all(text)
+
+
+def classify_series(
+    texts: Iterable[str | None], taxonomy: Mapping[str, Iterable[str]] | None = None
+) -> pd.Series:
+    """Vectorised :func:`classify_threat` over many texts.
+
+    Each category becomes one escaped alternation regex applied with
+    ``Series.str.contains`` to the rows still unassigned, in priority
+    order, so the first matching category wins exactly as in
+    :func:`classify_threat`.
+
+    Args:
+        texts: A pandas Series (index is preserved) or any array-like of
+            strings, e.g. a pyarrow array; missing values count as empty.
+        taxonomy: ``{category: [keywords]}`` to use instead of
+            :data:`config.THREAT_CATEGORIES`.
+
+    Returns:
+        A string Series of category names (``"Uncategorized"`` when no
+        keyword matches).
+    """
+    import pandas as pd
 
+    if taxonomy is None:
+        taxonomy = config.THREAT_CATEGORIES
+    series = texts if isinstance(texts, pd.Series) else pd.Series(texts, dtype=object)
+    lowered = series.fillna("").astype(str).str.lower()
+    labels = pd.Series("Uncategorized", index=series.index, dtype=object)
+    pending = lowered != ""
+    for category, keywords in taxonomy.items():
+        keywords = list(keywords)
+        if not keywords or not pending.any():
+            continue
+        pattern = "|".join(re.escape(keyword.lower()) for keyword in keywords)
+        hit = pd.Series(False, index=series.index)
+        hit[pending] = lowered[pending].str.contains(pattern, regex=True)
+        labels[hit] = category
+        pending &= ~hit
+    return labels
 
-def process_nlp(threats: list[dict[str, Any]]) -> list[dict[str, Any]]:
+
+def reclassify_threats(
+    chunk_size: int | None = None,
+    taxonomy: Mapping[str, Iterable[str]] | None = None,
+    db_file: str | None = None,
+) -> tuple[int, int]:
+    """Re-run classification over every stored threat, in place.
+
+    Rows are read and rewritten ``chunk_size`` at a time (see
+    :func:`storage.iter_threat_texts`), so memory stays flat however large
+    the table is; only rows whose category changed are written.
+
+    Args:
+        chunk_size: Rows per chunk. Defaults to
+            :data:`config.RECLASSIFY_CHUNK_SIZE`.
+        taxonomy: ``{category: [keywords]}`` to use instead of
+            :data:`config.THREAT_CATEGORIES`.
+        db_file: SQLite database path.
+
+    Returns:
+        ``(scanned, changed)`` row counts.
+    """
+    import pandas as pd
+
+    started = time.perf_counter()
+    scanned = changed = 0
+    for rows in storage.iter_threat_texts(chunk_size, db_file):
+        frame = pd.DataFrame(rows, columns=["id", "title", "summary", "threat_type"])
+        labels = classify_series(frame["title"] + " " + frame["summary"], taxonomy)
+        diff = frame[labels != frame["threat_type"]]
+        if not diff.empty:
+            updates = zip(labels[diff.index].tolist(), diff["id"].tolist(), strict=True)
+            changed += storage.update_threat_types(updates, db_file)
+        scanned += len(frame)
+        logger.debug("Reclassified %d threats so far (%d changed)", scanned, changed)
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "Reclassified %d threats (%d changed) in %.2fs (%.0f rows/s)",
+        scanned,
+        changed,
+        elapsed,
+        scanned / elapsed if elapsed else 0.0,
+    )
+    return scanned, changed
+
+
+def _doc_result(doc: Any) -> tuple[list[str], str]:
+    """Return ``(entities, summary_nlp)`` for a parsed spaCy ``doc``."""
+    entities = [ent.text for ent in doc.ents if ent.label_ in _ENTITY_LABELS]
+    summary = " ".join(sent.text.strip() for sent in list(doc.sents)[:2])
+    return list(set(entities))[:5], summary
+
+
+def _urlhaus_entities(match: re.Match[str]) -> list[str]:
+    tags = [tag.strip() for tag in match["tags"].split(",")]
+    return list(dict.fromkeys(tag for tag in tags if tag and tag != "None"))[:5]
+
+
+# Summary templates of the structured feeds in :mod:`collectors`, keyed by
+# record ``source``: (pattern, entity extractor). Records whose summary does
+# not match their template fall through to spaCy.
+_TEMPLATES: dict[str, tuple[re.Pattern[str], Callable[[re.Match[str]], list[str]]]] = {
+    "URLhaus": (
+        re.compile(r"Malicious URL reported to URLhaus\. Tags: (?P<tags>.*)"),
+        _urlhaus_entities,
+    ),
+    "FeodoTracker": (
+        re.compile(r"IP \S+ associated with (?P<malware>.+) C2 server\."),
+        lambda match: [match["malware"]],
+    ),
+    "MalwareBazaar": (
+        re.compile(r"Malware sample \S+ \([^)]*\)"),
+        lambda match: [],
+    ),
+}
+
+
+def _template_result(threat: dict[str, Any]) -> tuple[list[str], str] | None:
+    """Return ``(entities, summary_nlp)`` read off a structured-feed template.
+
+    ``None`` when the record is not from a structured feed or its summary
+    does not match the expected template.
+    """
+    route = _TEMPLATES.get(threat.get("source", ""))
+    if route is None:
+        return None
+    pattern, entities = route
+    summary = (threat.get("summary", "") or "").strip()
+    match = pattern.fullmatch(summary)
+    if match is None:
+        return None
+    return entities(match), summary
+
+
+def _cache_namespace(nlp: Any) -> str:
+    """Identify the loaded pipeline (model, versions, components) for cache keys."""
+    import spacy
+
+    meta = nlp.meta
+    return "|".join(
+        (
+            f"{meta.get('lang', '')}_{meta.get('name', '')}",
+            str(meta.get("version", "")),
+            f"spacy-{spacy.__version__}",
+            ",".join(nlp.pipe_names),
+        )
+    )
+
+
+def _cache_key(namespace: str, text: str) -> str:
+    """Content hash of ``text`` under a pipeline ``namespace``."""
+    return hashlib.sha256(f"{namespace}\0{text}".encode()).hexdigest()
+
+
+def _effective_processes(n_process: int, n_docs: int) -> int:
+    """Worker count for ``n_docs`` texts: ``-1`` means all CPUs, capped by work size."""
+    if n_process < 0:
+        n_process = os.cpu_count() or 1
+    return max(1, min(n_process, n_docs // config.NLP_MIN_DOCS_PER_PROCESS))
+
+
+def _parse(
+    nlp: Any, texts: list[str], batch_size: int | None, n_process: int | None
+) -> list[tuple[list[str], str]]:
+    """Run ``texts`` through ``nlp.pipe`` and return one result per text, in order."""
+    size = max(1, batch_size or config.NLP_BATCH_SIZE)
+    processes = _effective_processes(
+        config.NLP_N_PROCESS if n_process is None else n_process, len(texts)
+    )
+    started = time.perf_counter()
+    results = [
+        _doc_result(doc) for doc in nlp.pipe(texts, batch_size=size, n_process=processes)
+    ]
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "NLP: %d docs in %.2fs (%.0f docs/s, batch_size=%d, n_process=%d)",
+        len(texts),
+        elapsed,
+        len(texts) / elapsed if elapsed > 0 else 0.0,
+        size,
+        processes,
+    )
+    return results
+
+
+def _spacy_route(
+    prose: list[dict[str, Any]],
+    namespace: str,
+    parse: Callable[[list[str], int | None, int | None], list[tuple[list[str], str]]],
+    batch_size: int | None,
+    n_process: int | None,
+    use_cache: bool,
+    route: str,
+) -> None:
+    """Fill ``entities``/``summary_nlp`` of ``prose`` records through ``parse``.
+
+    Cached results are reused; every distinct uncached summary is parsed
+    once. ``namespace`` identifies the pipeline behind ``parse`` in cache
+    keys and ``route`` labels the timing log line.
+    """
+    start = time.perf_counter()
+    texts = [threat.get("summary", "") or "" for threat in prose]
+    keys = [_cache_key(namespace, text) for text in texts]
+    results = storage.load_nlp_cache(keys) if use_cache else {}
+    hits = sum(key in results for key in keys)
+    pending = {key: text for key, text in zip(keys, texts, strict=True) if key not in results}
+    if pending:
+        fresh = parse(list(pending.values()), batch_size, n_process)
+        parsed = dict(zip(pending, fresh, strict=True))
+        results.update(parsed)
+        if use_cache:
+            storage.save_nlp_cache(parsed)
+    for threat, key in zip(prose, keys, strict=True):
+        entities, summary_nlp = results[key]
+        threat["entities"] = list(entities)
+        threat["summary_nlp"] = summary_nlp
+    if use_cache:
+        logger.info("NLP cache: %d/%d hits (%.0f%%)", hits, len(keys), 100.0 * hits / len(keys))
+    logger.info(
+        "NLP route %s: %d records in %.3fs", route, len(prose), time.perf_counter() - start
+    )
+
+
+def process_nlp(
+    threats: list[dict[str, Any]],
+    batch_size: int | None = None,
+    n_process: int | None = None,
+    cache: bool | None = None,
+    templates: bool | None = None,
+) -> list[dict[str, Any]]:
     """Enrich threat records with NLP-derived fields.
 
     For each threat the function adds:
@@ -71,6 +439,21 @@ def process_nlp(threats: list[dict[str, Any]]) -> list[dict[str, Any]]:
       - ``summary_nlp``: short summary built from the first 2 sentences.
       - ``threat_type``: keyword-based category label.
 
+    Records from structured feeds (URLhaus, FeodoTracker, MalwareBazaar)
+    have templated summaries; their entities (tags, malware family) and
+    summary are read off the template, and only free-text records (RSS,
+    OTX, ...) go through spaCy. Timing is logged per route. When
+    :data:`config.NLP_WORKER_SOCKET` is set and an ``aegistrace
+    nlp-worker`` is listening there, spaCy runs in that worker (see
+    :mod:`aegistrace.nlp_worker`) instead of loading the model here.
+
+    Summaries are parsed with ``nlp.pipe`` in batches (optionally across
+    worker processes); docs come back in input order and are matched to
+    their records positionally. Throughput is logged in docs/sec.
+    Results are cached in SQLite under a hash of the summary and the
+    loaded pipeline, so recurring summaries skip spaCy; the hit rate is
+    logged per call.
+
     When the spaCy model is unavailable the function still classifies the
     threat using :func:`classify_threat` and falls back to the original
     summary for ``summary_nlp`` so the rest of the pipeline can run.
@@ -78,21 +461,68 @@ def process_nlp(threats: list[dict[str, Any]]) -> list[dict[str, Any]]:
     Args:
         threats: List of threat dicts containing at least ``title`` and
             ``summary``.
+        batch_size: Texts per ``nlp.pipe`` batch. Defaults to
+            :data:`config.NLP_BATCH_SIZE`.
+        n_process: Worker processes (``-1`` = one per CPU). Defaults to
+            :data:`config.NLP_N_PROCESS`; reduced for small inputs (see
+            :data:`config.NLP_MIN_DOCS_PER_PROCESS`).
+        cache: Read and write the NLP result cache. Defaults to
+            :data:`config.NLP_CACHE`.
+        templates: Route structured-feed records to template extraction.
+            Defaults to :data:`config.NLP_TEMPLATE_ROUTING`.
 
     Returns:
         The same list (mutated in place) with the extra fields populated.
     """
-    nlp = _get_nlp()
+    use_templates = config.NLP_TEMPLATE_ROUTING if templates is None else templates
+    prose = threats
+    if use_templates and threats:
+        start = time.perf_counter()
+        prose = []
+        for threat in threats:
+            result = _template_result(threat)
+            if result is None:
+                prose.append(threat)
+            else:
+                threat["entities"], threat["summary_nlp"] = result
+        logger.info(
+            "NLP route template: %d records in %.3fs",
+            len(threats) - len(prose),
+            time.perf_counter() - start,
+        )
+
+    # Only load spaCy when some record actually needs it.
+    use_cache = config.NLP_CACHE if cache is None else cache
+    done = not prose
+    if not done and config.NLP_WORKER_SOCKET:
+        from . import nlp_worker
+
+        worker = nlp_worker.connect()
+        if worker is not None:
+            try:
+                _spacy_route(
+                    prose, worker.namespace(), worker.parse, batch_size, n_process, use_cache, "worker"
+                )
+                done = True
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("NLP worker failed (%s); parsing in-process", exc)
+    nlp = None if done else _get_nlp()
+    if nlp is not None:
+        _spacy_route(
+            prose,
+            _cache_namespace(nlp),
+            partial(_parse, nlp),
+            batch_size,
+            n_process,
+            use_cache,
+            "spacy",
+        )
+    elif not done:
+        for threat in prose:
+            threat.setdefault("entities", [])
+            threat["summary_nlp"] = threat.get("summary", "") or ""
     for threat in threats:
         summary = threat.get("summary", "") or ""
         title = threat.get("title", "") or ""
-        if nlp is not None:
-            doc = nlp(summary)
-            entities = [ent.text for ent in doc.ents if ent.label_ in ["ORG", "GPE", "MONEY", "NORP"]]
-            threat["entities"] = list(set(entities))[:5]
-            threat["summary_nlp"] = " ".join(sent.text.strip() for sent in list(doc.sents)[:2])
-        else:
-            threat.setdefault("entities", [])
-            threat["summary_nlp"] = summary
         threat["threat_type"] = classify_threat(f"{title} {summary}")
     return threats
@@ -0,0 +1,194 @@
+"""Long-lived NLP worker that keeps the spaCy model resident.
+
+Every pipeline run is a fresh process, so without a worker each run pays
+the model load again. ``aegistrace nlp-worker`` loads the model once and
+serves parse requests over a Unix socket through a
+:class:`multiprocessing.managers.BaseManager`. When
+:data:`config.NLP_WORKER_SOCKET` is set,
+:func:`aegistrace.nlp_processor.process_nlp` sends its spaCy batches to
+the worker and falls back to loading the model in-process when the worker
+is not running (or fails mid-run).
+
+Only the spaCy step is remote: template routing and the result cache stay
+in the calling process. Requests are pickled, so the socket is created
+``0600`` and connections must present an auth key: either
+:data:`config.NLP_WORKER_AUTHKEY`, or, when that is unset, a random key
+the worker writes to an owner-only ``<socket>.key`` file at startup and
+clients read from there. There is no built-in default key. Clients only
+trust a socket and key file owned by the current user with no group or
+other permission bits; anything else could have been planted by another
+local user and is ignored in favour of in-process parsing.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import secrets
+import socket
+import threading
+from multiprocessing.managers import BaseManager
+from typing import Any
+
+from . import config, nlp_processor
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class _WorkerManager(BaseManager):
+    """Manager exposing the ``NLPService`` type over the worker socket."""
+
+
+_WorkerManager.register("NLPService")
+
+
+class NLPService:
+    """Server-side object: parses batches with the resident model."""
+
+    def __init__(self, nlp: Any) -> None:
+        self._nlp = nlp
+        self._namespace = nlp_processor._cache_namespace(nlp)
+        # The manager serves each client on its own thread; spaCy pipelines
+        # are not safe to share across concurrent ``pipe`` calls.
+        self._lock = threading.Lock()
+
+    def namespace(self) -> str:
+        """Cache namespace of the resident pipeline."""
+        return self._namespace
+
+    def parse(
+        self, texts: list[str], batch_size: int | None, n_process: int | None
+    ) -> list[tuple[list[str], str]]:
+        """``(entities, summary_nlp)`` for each text, in order."""
+        with self._lock:
+            return nlp_processor._parse(self._nlp, texts, batch_size, n_process)
+
+
+def _key_path(path: str) -> str:
+    """File holding the generated auth key of the worker on ``path``."""
+    return f"{path}.key"
+
+
+def _new_authkey(path: str) -> bytes:
+    """Generate a random auth key and store it owner-only next to the socket."""
+    key = secrets.token_hex(32)
+    key_path = _key_path(path)
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(key_path)  # stale key from a previous worker
+    # O_EXCL: never write through a file or symlink planted in the meantime.
+    fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="ascii") as fh:
+        fh.write(key)
+    logger.info("No AEGISTRACE_NLP_WORKER_AUTHKEY set; generated a key in %s", key_path)
+    return key.encode()
+
+
+def _owned_privately(path: str) -> bool:
+    """``True`` if ``path`` belongs to the current user and is owner-only."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    getuid = getattr(os, "getuid", None)
+    if getuid is None or st.st_uid != getuid() or st.st_mode & 0o077:
+        logger.warning(
+            "Not trusting %s: it must belong to this user and be owner-only (mode %o)",
+            path,
+            st.st_mode & 0o777,
+        )
+        return False
+    return True
+
+
+def _client_authkey(path: str) -> bytes | None:
+    """The configured auth key, else the worker's generated one (``None`` if unusable)."""
+    if config.NLP_WORKER_AUTHKEY:
+        return config.NLP_WORKER_AUTHKEY.encode()
+    if not _owned_privately(_key_path(path)):
+        return None
+    try:
+        with open(_key_path(path), encoding="ascii") as fh:
+            return fh.read().strip().encode()
+    except OSError as exc:
+        logger.warning("NLP worker key for %s unreadable (%s); parsing in-process", path, exc)
+        return None
+
+
+def _make_server(path: str | None = None) -> Any:
+    """Load the model and bind the manager server on ``path`` (see :func:`serve`)."""
+    path = path or config.NLP_WORKER_SOCKET
+    if not path:
+        raise RuntimeError("no socket path: pass one or set AEGISTRACE_NLP_WORKER_SOCKET")
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("the NLP worker needs Unix domain sockets")
+    nlp = nlp_processor._get_nlp()
+    if nlp is None:
+        raise RuntimeError(f"spaCy model {config.NLP_MODEL!r} could not be loaded")
+    service = NLPService(nlp)
+
+    class _ServerManager(_WorkerManager):
+        pass
+
+    _ServerManager.register("NLPService", callable=lambda: service)
+    if os.path.exists(path):
+        os.unlink(path)  # stale socket from a previous worker
+    # Create the socket owner-only from the start rather than chmod-ing it
+    # after other users could already have connected.
+    old_umask = os.umask(0o177)
+    try:
+        if config.NLP_WORKER_AUTHKEY:
+            authkey = config.NLP_WORKER_AUTHKEY.encode()
+        else:
+            authkey = _new_authkey(path)
+        server = _ServerManager(address=path, authkey=authkey).get_server()
+    finally:
+        os.umask(old_umask)
+    os.chmod(path, 0o600)
+    logger.info("NLP worker serving %s on %s", ", ".join(nlp.pipe_names), path)
+    return server
+
+
+def serve(path: str | None = None) -> None:
+    """Load the model and serve parse requests on a Unix socket until interrupted.
+
+    Args:
+        path: Socket path. Defaults to :data:`config.NLP_WORKER_SOCKET`.
+
+    Raises:
+        RuntimeError: No socket path is configured, Unix sockets are not
+            available on this platform, or the spaCy model cannot be loaded.
+        SystemExit: On shutdown (``Ctrl-C``), from
+            :meth:`multiprocessing.managers.Server.serve_forever`.
+    """
+    server = _make_server(path)
+    try:
+        server.serve_forever()
+    finally:
+        for leftover in (server.address, _key_path(server.address)):
+            if os.path.exists(leftover):
+                os.unlink(leftover)
+
+
+def connect(path: str | None = None) -> Any | None:
+    """Return a proxy to a running worker's ``NLPService``, or ``None``.
+
+    Args:
+        path: Socket path. Defaults to :data:`config.NLP_WORKER_SOCKET`.
+    """
+    path = path or config.NLP_WORKER_SOCKET
+    if not path or not os.path.exists(path):
+        return None
+    # Responses are unpickled here: only talk to a worker run by this user.
+    if not _owned_privately(path):
+        return None
+    authkey = _client_authkey(path)
+    if authkey is None:
+        return None
+    manager = _WorkerManager(address=path, authkey=authkey)
+    try:
+        manager.connect()
+        return manager.NLPService()  # type: ignore[attr-defined]
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("NLP worker at %s unavailable (%s); parsing in-process", path, exc)
+        return None
@@ -7,9 +7,12 @@ table to feed the ARIMA model.
 
 from __future__ import annotations
 
+import json
 import sqlite3
-from collections.abc import Iterable
+import time
+from collections.abc import Iterable, Iterator
 from datetime import datetime
+from itertools import islice
 from typing import Any
 
 from . import config
@@ -33,7 +36,7 @@ def _connect(db_file: str | None = None) -> sqlite3.Connection:
 
 
 def init_db(db_file: str | None = None) -> None:
-    """Create the ``threats`` and ``iocs`` tables if they do not exist.
+    """Create the ``threats``, ``iocs`` and cache tables if they do not exist.
 
     Args:
         db_file: Path to the SQLite database file. Defaults to ``DB_FILE``
@@ -70,6 +73,48 @@ def init_db(db_file: str | None = None) -> None:
             )
             """
         )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS source_state (
+                source TEXT PRIMARY KEY,
+                high_water TEXT,
+                updated_at TEXT
+            )
+            """
+        )
+        # Keys of the records collected at exactly a source's high-water
+        # mark: feeds stamp rows to the second, so a row added later in the
+        # same second must still be told apart from those already seen.
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS source_state_keys (
+                source TEXT,
+                row_key TEXT,
+                PRIMARY KEY (source, row_key)
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS nlp_cache (
+                key TEXT PRIMARY KEY,
+                entities TEXT,
+                summary_nlp TEXT,
+                size INTEGER,
+                last_used REAL
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS http_validators (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                updated_at TEXT
+            )
+            """
+        )
         conn.commit()
     finally:
         conn.close()
@@ -158,6 +203,104 @@ def save_iocs(iocs: Iterable[dict[str, Any]], db_file: str | None = None) -> int
     return inserted
 
 
+def save_threat_rows(
+    rows: Iterable[tuple[Any, ...]],
+    batch_size: int | None = None,
+    db_file: str | None = None,
+) -> int:
+    """Bulk-insert pre-built rows into the ``threats`` table.
+
+    Unlike :func:`save_threats` this takes plain tuples in column order
+    ``(title, summary, sector, threat_type, source, timestamp)`` and
+    writes them with ``executemany``, committing every ``batch_size``
+    rows, so arbitrarily large iterables load in constant memory.
+
+    Args:
+        rows: Iterable of row tuples; consumed lazily.
+        batch_size: Rows per transaction. Defaults to
+            :data:`config.BULK_BATCH_SIZE`.
+        db_file: SQLite database path.
+
+    Returns:
+        Number of rows inserted.
+    """
+    size = max(1, batch_size or config.BULK_BATCH_SIZE)
+    it = iter(rows)
+    conn = _connect(db_file)
+    inserted = 0
+    try:
+        while batch := list(islice(it, size)):
+            conn.executemany(
+                """
+                INSERT INTO threats (title, summary, sector, threat_type, source, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                batch,
+            )
+            conn.commit()
+            inserted += len(batch)
+            logger.debug("Bulk insert: %d rows so far", inserted)
+    finally:
+        conn.close()
+    logger.info("Bulk-loaded %d threats into %s", inserted, _resolve_db(db_file))
+    return inserted
+
+
+def iter_threat_texts(
+    chunk_size: int | None = None, db_file: str | None = None
+) -> Iterator[list[tuple[int, str, str, str]]]:
+    """Yield ``(id, title, summary, threat_type)`` rows of ``threats`` in chunks.
+
+    Pages by primary key (``WHERE id > ?``) rather than ``OFFSET`` so each
+    chunk costs the same however deep into the table it is, and rows may
+    be updated between chunks.
+
+    Args:
+        chunk_size: Rows per chunk. Defaults to
+            :data:`config.RECLASSIFY_CHUNK_SIZE`.
+        db_file: SQLite database path.
+    """
+    size = max(1, chunk_size or config.RECLASSIFY_CHUNK_SIZE)
+    last_id = 0
+    while True:
+        conn = _connect(db_file)
+        try:
+            rows = conn.execute(
+                """
+                SELECT id, COALESCE(title, ''), COALESCE(summary, ''), threat_type
+                FROM threats WHERE id > ? ORDER BY id LIMIT ?
+                """,
+                (last_id, size),
+            ).fetchall()
+        finally:
+            conn.close()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def update_threat_types(
+    updates: Iterable[tuple[str, int]], db_file: str | None = None
+) -> int:
+    """Set ``threat_type`` for existing threats in one transaction.
+
+    Args:
+        updates: ``(threat_type, id)`` pairs.
+        db_file: SQLite database path.
+
+    Returns:
+        Number of rows updated.
+    """
+    conn = _connect(db_file)
+    try:
+        cur = conn.executemany("UPDATE threats SET threat_type = ? WHERE id = ?", updates)
+        conn.commit()
+        return cur.rowcount
+    finally:
+        conn.close()
+
+
 def load_threat_counts(days: int = 30, db_file: str | None = None) -> list[tuple[str, int]]:
     """Return daily threat counts for the last ``days`` days.
 
@@ -190,3 +333,280 @@ def load_threat_counts(days: int = 30, db_file: str | None = None) -> list[tuple
         logger.debug("load_threat_counts: DB not ready (%s); returning []", exc)
         return []
     return rows
+
+
+def load_http_validator(url: str, db_file: str | None = None) -> tuple[str | None, str | None] | None:
+    """Return the stored ``(etag, last_modified)`` pair for ``url``.
+
+    Args:
+        url: Exact request URL the validators were recorded for.
+        db_file: SQLite database path.
+
+    Returns:
+        The validator pair, or ``None`` when nothing is stored for ``url``
+        or the ``http_validators`` table does not exist yet.
+    """
+    try:
+        conn = _connect(db_file)
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT etag, last_modified FROM http_validators WHERE url = ?", (url,))
+            row = cur.fetchone()
+        finally:
+            conn.close()
+    except sqlite3.OperationalError as exc:
+        logger.debug("load_http_validator: DB not ready (%s)", exc)
+        return None
+    return (row[0], row[1]) if row else None
+
+
+def save_http_validator(
+    url: str, etag: str | None, last_modified: str | None, db_file: str | None = None
+) -> None:
+    """Insert or replace the HTTP validators recorded for ``url``.
+
+    Failures are logged and swallowed: losing a validator only costs one
+    full download on the next poll.
+
+    Args:
+        url: Exact request URL.
+        etag: ``ETag`` response header, if any.
+        last_modified: ``Last-Modified`` response header, if any.
+        db_file: SQLite database path.
+    """
+    try:
+        conn = _connect(db_file)
+        try:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO http_validators (url, etag, last_modified, updated_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (url, etag, last_modified, datetime.now().isoformat()),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.OperationalError as exc:
+        logger.debug("save_http_validator: DB not ready (%s)", exc)
+
+
+def load_high_water_marks(db_file: str | None = None) -> dict[str, datetime]:
+    """Return the persisted high-water mark of every collector source.
+
+    Args:
+        db_file: SQLite database path.
+
+    Returns:
+        Mapping of record ``source`` to the newest timestamp already
+        collected. Empty when nothing is stored yet or the
+        ``source_state`` table does not exist.
+    """
+    try:
+        conn = _connect(db_file)
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT source, high_water FROM source_state")
+            rows = cur.fetchall()
+        finally:
+            conn.close()
+    except sqlite3.OperationalError as exc:
+        logger.debug("load_high_water_marks: DB not ready (%s); returning {}", exc)
+        return {}
+    marks: dict[str, datetime] = {}
+    for source, high_water in rows:
+        try:
+            marks[source] = datetime.fromisoformat(high_water)
+        except (TypeError, ValueError):
+            logger.warning("Ignoring corrupt high-water mark %r for %s", high_water, source)
+    return marks
+
+
+def load_high_water_keys(db_file: str | None = None) -> dict[str, set[str]]:
+    """Return the keys of the records collected at each source's high-water mark.
+
+    Args:
+        db_file: SQLite database path.
+
+    Returns:
+        Mapping of record ``source`` to the row keys stored with its mark
+        (see :func:`save_high_water_marks`). Empty when nothing is stored
+        yet or the ``source_state_keys`` table does not exist.
+    """
+    try:
+        conn = _connect(db_file)
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT source, row_key FROM source_state_keys")
+            rows = cur.fetchall()
+        finally:
+            conn.close()
+    except sqlite3.OperationalError as exc:
+        logger.debug("load_high_water_keys: DB not ready (%s); returning {}", exc)
+        return {}
+    keys: dict[str, set[str]] = {}
+    for source, row_key in rows:
+        keys.setdefault(source, set()).add(row_key)
+    return keys
+
+
+def save_high_water_marks(
+    marks: dict[str, datetime],
+    db_file: str | None = None,
+    keys: dict[str, set[str]] | None = None,
+) -> None:
+    """Advance the high-water marks of the given sources.
+
+    A stored mark never moves backwards: if ``marks`` holds an older
+    timestamp than the one persisted, the persisted one is kept.
+
+    Args:
+        marks: Mapping of record ``source`` to the newest timestamp seen.
+        db_file: SQLite database path.
+        keys: Row keys of the records seen at exactly that timestamp, per
+            source. They replace the stored keys when the mark advances
+            and are added to them when it stays the same.
+    """
+    keys = keys or {}
+    current = load_high_water_marks(db_file)
+    now = datetime.now().isoformat()
+    rows = [
+        (source, ts.isoformat(), now)
+        for source, ts in marks.items()
+        if source not in current or ts > current[source]
+    ]
+    advanced = {row[0] for row in rows}
+    key_rows = [
+        (source, row_key)
+        for source, ts in marks.items()
+        if source in advanced or ts == current.get(source)
+        for row_key in keys.get(source, ())
+    ]
+    if not rows and not key_rows:
+        return
+    try:
+        conn = _connect(db_file)
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO source_state (source, high_water, updated_at) VALUES (?, ?, ?)",
+                rows,
+            )
+            conn.executemany(
+                "DELETE FROM source_state_keys WHERE source = ?", [(source,) for source in advanced]
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO source_state_keys (source, row_key) VALUES (?, ?)", key_rows
+            )
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.OperationalError as exc:
+        logger.warning("Could not save high-water marks: %s", exc)
+        return
+    if rows:
+        logger.info("Advanced high-water marks for %d sources", len(rows))
+
+
+# SQLite caps the number of ``?`` parameters per statement (999 on older
+# builds), so key lookups are chunked.
+_SQL_PARAM_CHUNK = 500
+
+
+def load_nlp_cache(
+    keys: Iterable[str], db_file: str | None = None
+) -> dict[str, tuple[list[str], str]]:
+    """Return cached NLP results for ``keys`` and mark them as recently used.
+
+    Args:
+        keys: Content-hash keys built by the NLP processor.
+        db_file: SQLite database path.
+
+    Returns:
+        Mapping of key to ``(entities, summary_nlp)`` for the keys found.
+        Empty when the ``nlp_cache`` table does not exist yet.
+    """
+    wanted = list(dict.fromkeys(keys))
+    found: dict[str, tuple[list[str], str]] = {}
+    if not wanted:
+        return found
+    try:
+        conn = _connect(db_file)
+        try:
+            now = time.time()
+            for start in range(0, len(wanted), _SQL_PARAM_CHUNK):
+                chunk = wanted[start : start + _SQL_PARAM_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, entities, summary_nlp FROM nlp_cache WHERE key IN ({marks})",
+                    chunk,
+                ).fetchall()
+                for key, entities, summary_nlp in rows:
+                    found[key] = (json.loads(entities), summary_nlp)
+                conn.execute(
+                    f"UPDATE nlp_cache SET last_used = ? WHERE key IN ({marks})", [now, *chunk]
+                )
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.OperationalError as exc:
+        logger.debug("load_nlp_cache: DB not ready (%s); returning {}", exc)
+        return {}
+    return found
+
+
+def save_nlp_cache(
+    results: dict[str, tuple[list[str], str]],
+    max_bytes: int | None = None,
+    db_file: str | None = None,
+) -> None:
+    """Store NLP results and evict least-recently-used entries over budget.
+
+    The size of an entry is the UTF-8 length of its serialised fields;
+    once the total exceeds ``max_bytes`` the oldest entries (by last use)
+    are deleted. Failures are logged and swallowed: a lost entry only
+    costs one spaCy parse.
+
+    Args:
+        results: Mapping of key to ``(entities, summary_nlp)``.
+        max_bytes: Cache size budget. Defaults to
+            :data:`config.NLP_CACHE_MAX_BYTES`.
+        db_file: SQLite database path.
+    """
+    if not results:
+        return
+    budget = config.NLP_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    now = time.time()
+    rows = []
+    for key, (entities, summary_nlp) in results.items():
+        encoded = json.dumps(entities)
+        size = len(key) + len(encoded.encode("utf-8")) + len(summary_nlp.encode("utf-8"))
+        rows.append((key, encoded, summary_nlp, size, now))
+    try:
+        conn = _connect(db_file)
+        try:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO nlp_cache (key, entities, summary_nlp, size, last_used)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            evicted = conn.execute(
+                """
+                DELETE FROM nlp_cache WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS running
+                        FROM nlp_cache
+                    ) WHERE running > ?
+                )
+                """,
+                (budget,),
+            ).rowcount
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.OperationalError as exc:
+        logger.debug("save_nlp_cache: DB not ready (%s)", exc)
+        return
+    if evicted:
+        logger.debug("NLP cache: evicted %d entries over the %d-byte budget", evicted, budget)
@@ -0,0 +1,71 @@
+"""Measure import time of the AegisTrace entry points.
+
+Each target is imported in a fresh interpreter (best of ``--repeat`` runs)
+so ``sys.modules`` caching does not hide the cost::
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --repeat 10 --check
+
+Reports wall-clock import time and which heavy dependencies (pandas,
+plotly, statsmodels, spaCy) each import pulled in. ``--check`` exits
+non-zero when the CLI or pipeline module loads any of them eagerly, so a
+stray top-level import shows up as a regression.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY = ("pandas", "plotly", "statsmodels", "spacy")
+# Modules that must import without the heavy dependencies.
+LIGHT = ("aegistrace.cli", "aegistrace.main")
+TARGETS = (*LIGHT, "aegistrace.predictor", "aegistrace.dashboard_generator")
+
+_CHILD = """
+import json, sys, time
+started = time.perf_counter()
+__import__({module!r})
+elapsed = time.perf_counter() - started
+print(json.dumps({{"s": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _measure(module: str) -> dict[str, object]:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD.format(module=module, heavy=HEAVY)],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--modules", nargs="+", default=list(TARGETS))
+    parser.add_argument("--check", action="store_true", help="fail on eager heavy imports")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'module':<32} {'import (ms)':>11}  heavy deps loaded")
+    for module in args.modules:
+        runs = [_measure(module) for _ in range(args.repeat)]
+        best = min(r["s"] for r in runs)
+        heavy = runs[0]["heavy"]
+        print(f"{module:<32} {best * 1000:>11.1f}  {', '.join(heavy) or '-'}")
+        failed |= module in LIGHT and bool(heavy)
+    if args.check and failed:
+        print("error: a light entry point imports heavy dependencies", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
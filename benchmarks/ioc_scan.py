@@ -0,0 +1,111 @@
+"""Compare the single-pass IoC scanner with the multi-pass reference.
+
+Runs both :func:`aegistrace.ioc_extractor._extract_from_text` and the
+one-regex-per-type :func:`_extract_from_text_multipass` over a synthetic
+corpus of RSS-sized bodies, checks they agree, and reports throughput::
+
+    python benchmarks/ioc_scan.py
+    python benchmarks/ioc_scan.py --docs 5000 --words 800 --repeat 5
+
+It also times the :func:`refang` pre-pass the single-pass extractor runs
+first, on the plain corpus and on one with parenthesised prose and
+defanged indicators (``evil[.]com``), and reports its share of extraction
+time. ``--max-refang`` exits non-zero when that share exceeds a limit.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Run from a source checkout without installing the package.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aegistrace.ioc_extractor import (  # noqa: E402
+    _extract_from_text,
+    _extract_from_text_multipass,
+    refang,
+)
+
+SENTENCE = (
+    "the attackers used a new loader to deliver ransomware after initial access "
+    "via phishing emails; researchers observed lateral movement and exfiltration "
+    "of credentials before encryption. CVE-2026-1234 was exploited in the wild"
+)
+WORDS = SENTENCE.split(" ")
+# Extra words for the defanged corpus: prose parentheses (which the
+# refang fast path must not mistake for defanging) and defanged IoCs.
+DEFANGED_WORDS = ("(see", "above)", "(CVE-2026-1234)", "[1]")
+DEFANGED_IOCS = ("185.220.101[.]34", "hxxp://evil[.]example[.]com/gate", "cdn[dot]badsite[.]net")
+IOCS = (
+    "185.220.101.34",
+    "evil.example.com",
+    "cdn.badsite.net",
+    "d41d8cd98f00b204e9800998ecf8427e",
+    "aaf4c61ddcc5e8a2dabede0f3b482cd9aea9434d",
+    "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855",
+)
+
+
+def _corpus(docs: int, words: int, seed: int = 0, defanged: bool = False) -> list[str]:
+    rng = random.Random(seed)
+    iocs = IOCS + DEFANGED_IOCS if defanged else IOCS
+    vocab = WORDS + list(DEFANGED_WORDS) if defanged else WORDS
+    return [
+        " ".join(rng.choice(iocs) if rng.random() < 0.02 else rng.choice(vocab) for _ in range(words))
+        for _ in range(docs)
+    ]
+
+
+def _time(extract, corpus: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in corpus:
+            extract(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=400, help="words per document")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--max-refang", type=float, metavar="PCT", help="fail if refang exceeds PCT%% of extraction"
+    )
+    args = parser.parse_args()
+
+    worst = 0.0
+    for label, defanged in (("plain", False), ("defanged", True)):
+        corpus = _corpus(args.docs, args.words, defanged=defanged)
+        mismatches = sum(
+            _extract_from_text(t) != _extract_from_text_multipass(refang(t)) for t in corpus
+        )
+        if mismatches:
+            sys.exit(f"error: {mismatches} {label} documents differ between the extractors")
+
+        size_mb = sum(len(t) for t in corpus) / 1e6
+        print(f"{label} corpus: {args.docs} docs, {size_mb:.1f} MB")
+        multipass = _time(_extract_from_text_multipass, corpus, args.repeat)
+        single = _time(_extract_from_text, corpus, args.repeat)
+        refanging = _time(refang, corpus, args.repeat)
+        for name, elapsed in (("multi-pass", multipass), ("single-pass", single)):
+            print(f"  {name:<12} {elapsed:>7.3f}s  {size_mb / elapsed:>7.1f} MB/s")
+        print(f"  speedup      {multipass / single:>7.2f}x")
+        share = 100 * refanging / single
+        print(f"  refang       {refanging:>7.3f}s  {share:>6.1f}% of single-pass")
+        worst = max(worst, share)
+
+    if args.max_refang is not None and worst > args.max_refang:
+        print(f"error: refang takes {worst:.1f}% of extraction time", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
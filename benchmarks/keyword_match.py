@@ -0,0 +1,80 @@
+"""Compare substring scans with the Aho-Corasick automaton in KeywordMatcher.
+
+Times :meth:`aegistrace.keywords.KeywordMatcher.first` in both modes on
+threat-sized texts for the default taxonomy and for synthetic taxonomies
+of growing size, which is where the automaton starts to pay off::
+
+    python benchmarks/keyword_match.py
+    python benchmarks/keyword_match.py --sizes 50 200 1000 --texts 5000
+
+The ``auto`` column is what :data:`aegistrace.keywords.SCAN_MAX_KEYWORDS`
+selects for that size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+# Run from a source checkout without installing the package.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aegistrace import config  # noqa: E402
+from aegistrace.keywords import SCAN_MAX_KEYWORDS, KeywordMatcher  # noqa: E402
+
+SENTENCE = (
+    "Researchers observed a new loader delivering stealers through malicious "
+    "advertisements; the operators rotate domains daily and abuse cloud storage"
+)
+
+
+def _taxonomy(n_keywords: int, rng: random.Random) -> dict[str, list[str]]:
+    taxonomy: dict[str, list[str]] = {}
+    for i in range(n_keywords):
+        word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 12)))
+        taxonomy.setdefault(f"cat{i % 12}", []).append(word)
+    return taxonomy
+
+
+def _texts(n: int, rng: random.Random) -> list[str]:
+    words = SENTENCE.split(" ")
+    return [" ".join(rng.choices(words, k=20))[:150] for _ in range(n)]
+
+
+def _time(matcher: KeywordMatcher, texts: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in texts:
+            matcher.first(text)
+        best = min(best, time.perf_counter() - started)
+    return best / len(texts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 200, 400, 1000, 3000])
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    texts = _texts(args.texts, rng)
+    cases = [("default", config.THREAT_CATEGORIES)]
+    cases += [("synthetic", _taxonomy(n, rng)) for n in args.sizes]
+
+    print(f"{'taxonomy':<10} {'keywords':>8} {'scan (us)':>10} {'automaton (us)':>15}  auto")
+    for label, taxonomy in cases:
+        n_keywords = sum(len(k) for k in taxonomy.values())
+        scan = _time(KeywordMatcher(taxonomy, scan_max_keywords=n_keywords), texts, args.repeat)
+        automaton = _time(KeywordMatcher(taxonomy, scan_max_keywords=-1), texts, args.repeat)
+        mode = "scan" if n_keywords <= SCAN_MAX_KEYWORDS else "automaton"
+        print(f"{label:<10} {n_keywords:>8} {scan * 1e6:>10.1f} {automaton * 1e6:>15.1f}  {mode}")
+
+
+if __name__ == "__main__":
+    main()
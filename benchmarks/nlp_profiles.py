@@ -0,0 +1,96 @@
+"""Compare spaCy loading profiles used by ``aegistrace.nlp_processor``.
+
+Each profile is measured in a fresh interpreter so model load time and
+resident memory are not skewed by an already-imported spaCy::
+
+    python benchmarks/nlp_profiles.py
+    python benchmarks/nlp_profiles.py --docs 5000 --profiles fast full
+
+Reports load time, parse throughput (docs/sec through ``nlp.pipe``) and
+peak RSS per profile. Requires the configured model (``en_core_web_sm``
+by default) to be installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Run from a source checkout without installing the package.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+SAMPLE = (
+    "LockBit affiliates breached ACME Corp in Germany and demanded $2 million. "
+    "The intrusion started with a phishing email impersonating Microsoft. "
+    "CISA published indicators including 185.220.101.34 and evil.example.com."
+)
+
+
+def _measure(profile: str, docs: int, batch_size: int) -> dict[str, float]:
+    from aegistrace import config
+    from aegistrace.nlp_processor import _load_pipeline
+
+    started = time.perf_counter()
+    nlp = _load_pipeline(config.NLP_MODEL, profile)
+    load_s = time.perf_counter() - started
+
+    texts = [f"{SAMPLE} Report #{i}." for i in range(docs)]
+    started = time.perf_counter()
+    for _doc in nlp.pipe(texts, batch_size=batch_size):
+        pass
+    parse_s = time.perf_counter() - started
+
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+    return {
+        "load_s": load_s,
+        "docs_per_s": docs / parse_s if parse_s else 0.0,
+        "rss_mb": rss_mb,
+        "components": ", ".join(nlp.pipe_names),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--profiles", nargs="+", default=["full", "fast"])
+    parser.add_argument("--_child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args._child:
+        print(json.dumps(_measure(args._child, args.docs, args.batch_size)))
+        return
+
+    print(f"{'profile':<8} {'load (s)':>9} {'docs/s':>9} {'RSS (MB)':>9}  components")
+    for profile in args.profiles:
+        out = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--_child",
+                profile,
+                "--docs",
+                str(args.docs),
+                "--batch-size",
+                str(args.batch_size),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        r = json.loads(out.strip().splitlines()[-1])
+        print(
+            f"{profile:<8} {r['load_s']:>9.2f} {r['docs_per_s']:>9.0f} {r['rss_mb']:>9.0f}  "
+            f"{r['components']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -96,10 +96,18 @@ def _isolate_runtime(monkeypatch, tmp_path):
     """Run each test in an isolated working directory with a fresh DB.
 
     Prevents tests from clobbering the developer's local ``threatintel.db``
-    or writing ``dashboard.html`` / ``iocs_enriched.csv`` into the repo.
+    or writing ``dashboard.html`` / ``iocs_enriched.csv`` into the repo,
+    and starts with empty per-host rate-limit buckets. The background
+    spaCy warm-up is off so no loader thread outlives a test.
     """
+    from aegistrace import http_client
+
+    http_client.reset_rate_limits()
     monkeypatch.chdir(tmp_path)
     monkeypatch.setenv("AEGISTRACE_DB_FILE", str(tmp_path / "test.db"))
     # Patch DB_FILE at module level so storage picks it up.
-    with patch("aegistrace.config.DB_FILE", str(tmp_path / "test.db")):
+    with (
+        patch("aegistrace.config.DB_FILE", str(tmp_path / "test.db")),
+        patch("aegistrace.config.NLP_WARMUP", False),
+    ):
         yield
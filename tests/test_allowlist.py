@@ -0,0 +1,89 @@
+"""Tests for ``aegistrace.allowlist``."""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from aegistrace import allowlist, ioc_extractor
+from aegistrace.allowlist import Allowlist, BloomFilter, load_allowlist
+
+SHA256_EMPTY = "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"
+
+
+def test_domain_entries_cover_subdomains_only() -> None:
+    allow = Allowlist(domains=["abuse.ch", "Feeds.Example.org"])
+    assert allow.contains("abuse.ch", "domain")
+    assert allow.contains("urlhaus.ABUSE.ch", "domain")
+    assert allow.contains("x.feeds.example.org", "domain")
+    assert not allow.contains("example.org", "domain")
+    assert not allow.contains("notabuse.ch", "domain")
+    assert not allow.contains("abuse.ch.evil.com", "domain")
+
+
+def test_network_entries_match_cidr_ranges_and_addresses() -> None:
+    allow = Allowlist(networks=["8.8.8.0/24", "1.1.1.1", "8.8.9.0/24"])
+    assert allow.contains("8.8.8.8", "ip")
+    assert allow.contains("8.8.9.255", "ip")
+    assert allow.contains("1.1.1.1", "ip")
+    assert not allow.contains("1.1.1.2", "ip")
+    assert not allow.contains("8.8.10.0", "ip")
+    with pytest.raises(ValueError):
+        Allowlist(networks=["8.8.8.0/33"])
+
+
+def test_hash_entries_use_bloom_filter() -> None:
+    allow = Allowlist(hashes=[SHA256_EMPTY.upper()])
+    assert allow.contains(SHA256_EMPTY, "hash")
+    assert not allow.contains("d41d8cd98f00b204e9800998ecf8427e", "hash")
+    assert not allow.contains(SHA256_EMPTY, "domain")
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives() -> None:
+    members = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(5000)]
+    bloom = BloomFilter(len(members), fp_rate=0.01)
+    for item in members:
+        bloom.add(item)
+    assert all(item in bloom for item in members)
+    others = [hashlib.md5(str(i).encode()).hexdigest() for i in range(20000)]
+    assert sum(item in bloom for item in others) < 0.02 * len(others)
+    assert bloom.nbytes < 10 * len(members)
+
+
+def test_load_allowlist_infers_entry_types(tmp_path: Path) -> None:
+    path = tmp_path / "allow.txt"
+    path.write_text(
+        f"# known good\ncdn.example.net\n203.0.114.0/24  # partner\n{SHA256_EMPTY}\nnot a domain!\n",
+        encoding="utf-8",
+    )
+    allow = load_allowlist([path, tmp_path / "missing.txt"], domains=["abuse.ch"])
+    assert allow.counts == {"domain": 2, "ip": 1, "hash": 1}
+    assert allow.contains("img.cdn.example.net", "domain")
+    assert allow.contains("203.0.114.9", "ip")
+    assert allow.contains(SHA256_EMPTY, "hash")
+
+
+def test_extract_iocs_suppresses_and_counts_allowlisted(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        allowlist, "default_allowlist", lambda: Allowlist(["abuse.ch"], ["185.220.0.0/16"])
+    )
+    threats = [
+        {"title": "T", "summary": "Seen on urlhaus.abuse.ch: 185.220.101.34, 45.9.148.3", "url": ""},
+        {"title": "U", "summary": "evil.example.com via urlhaus.abuse.ch", "url": ""},
+    ]
+    ioc_extractor.reset_suppression_stats()
+    indicators = {i["indicator"] for i in ioc_extractor.extract_iocs(threats)}
+    assert indicators == {"45.9.148.3", "evil.example.com"}
+    assert ioc_extractor.suppression_stats() == {"allowlisted": 2}
+    streamed = {i["indicator"] for i in ioc_extractor.iter_iocs(threats)}
+    assert streamed == indicators
+
+
+def test_default_allowlist_covers_feed_sites() -> None:
+    allowlist.default_allowlist.cache_clear()
+    allow = allowlist.default_allowlist()
+    assert allow.contains("www.bleepingcomputer.com", "domain")
+    assert allow.contains("feeds.feedburner.com", "domain")
+    assert not allow.contains("malware.example.com", "domain")
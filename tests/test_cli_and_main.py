@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import subprocess
+import sys
+from pathlib import Path
 from unittest.mock import patch
 
 import pandas as pd
@@ -51,6 +54,18 @@ def test_run_returns_pipeline_result_with_mock_data() -> None:
     assert result.csv_path == "i.csv"
 
 
+def test_run_does_not_save_placeholder_when_sources_unchanged() -> None:
+    from aegistrace.collectors import CollectionReport, _mock_threat
+
+    report = CollectionReport(threats=[_mock_threat()], unchanged=True)
+    with (
+        patch("aegistrace.main.collect_sources", return_value=report),
+        patch("aegistrace.main.save_threats") as save,
+    ):
+        run(enrich=False, forecast=False, output="d5.html", csv_path="i5.csv")
+    save.assert_not_called()
+
+
 def test_run_with_no_forecast_produces_empty_predictions() -> None:
     result = run(enrich=False, forecast=False, output="d2.html", csv_path="i2.csv")
     assert isinstance(result.predictions, pd.DataFrame)
@@ -75,3 +90,76 @@ def test_cli_verbose_flag_enables_debug_logging() -> None:
     """The verbose flag must not crash the CLI."""
     exit_code = cli.main(["--verbose", "--no-enrich", "--no-forecast", "--output", "v.html"])
     assert exit_code in {0, 1, 2}
+
+
+def test_cli_no_conditional_get_is_passed_to_run_without_leaking() -> None:
+    from aegistrace import config
+
+    default = config.HTTP_CONDITIONAL_GET
+    with patch("aegistrace.cli.run", side_effect=RuntimeError("stop")) as run_mock:
+        cli.main(["--no-conditional-get"])
+        assert run_mock.call_args.kwargs["conditional_get"] is False
+        cli.main([])
+        assert run_mock.call_args.kwargs["conditional_get"] is None
+    assert config.HTTP_CONDITIONAL_GET is default
+
+
+def test_cli_list_sources_prints_builtins(capsys: pytest.CaptureFixture[str]) -> None:
+    with patch("aegistrace.cli.run") as run_mock:
+        assert cli.main(["--list-sources"]) == 0
+    run_mock.assert_not_called()
+    listed = capsys.readouterr().out.split()
+    assert listed[:5] == ["otx", "rss", "urlhaus", "malwarebazaar", "feodotracker"]
+
+
+def test_cli_bulk_load_subcommand(tmp_path, capsys: pytest.CaptureFixture[str]) -> None:
+    dump = tmp_path / "ipblocklist.csv"
+    dump.write_text(
+        "first_seen_utc,dst_ip,dst_port,c2_status,last_online,malware\n"
+        "2026-06-30 08:00:00,192.0.2.10,443,online,2026-07-01,QakBot\n",
+        encoding="utf-8",
+    )
+    with patch("aegistrace.cli.run") as run_mock:
+        assert cli.main(["bulk-load", "--source", "feodotracker", str(dump)]) == 0
+    run_mock.assert_not_called()
+    assert "Loaded 1 feodotracker rows" in capsys.readouterr().out
+
+
+def test_cli_bulk_load_returns_2_on_missing_file(tmp_path) -> None:
+    assert cli.main(["bulk-load", "--source", "urlhaus", str(tmp_path / "nope.csv")]) == 2
+
+
+def test_cli_reclassify_subcommand(capsys: pytest.CaptureFixture[str]) -> None:
+    with (
+        patch("aegistrace.cli.run") as run_mock,
+        patch("aegistrace.cli.reclassify_threats", return_value=(12, 3)) as reclassify,
+    ):
+        assert cli.main(["reclassify", "--chunk-size", "5"]) == 0
+    run_mock.assert_not_called()
+    reclassify.assert_called_once_with(chunk_size=5)
+    assert "Reclassified 12 threats (3 changed)" in capsys.readouterr().out
+
+
+def test_cli_import_defers_heavy_dependencies() -> None:
+    # A fresh interpreter: the test session has already imported everything.
+    code = (
+        "import sys, aegistrace.cli; "
+        "print(sorted(m for m in ('pandas', 'plotly', 'statsmodels', 'spacy') if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+    assert out.stdout.strip() == "[]"
+
+
+def test_run_warms_up_nlp_when_enabled() -> None:
+    with (
+        patch("aegistrace.config.NLP_WARMUP", True),
+        patch("aegistrace.main.warm_up") as warm_up,
+    ):
+        run(enrich=False, forecast=False)
+    warm_up.assert_called_once_with()
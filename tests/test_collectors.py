@@ -2,13 +2,24 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+import gzip
+import logging
+import random
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+from datetime import datetime, timedelta
+from functools import partial
 from unittest.mock import patch
 
+import pytest
 import requests
 import responses
 
-from aegistrace import collectors
+from aegistrace import collectors, http_client, storage
+from aegistrace.nlp_processor import classify_threat
 
 # ---------------------------------------------------------------------------
 # fetch_urlhaus
@@ -205,6 +216,66 @@ def test_fetch_rss_continues_on_feed_error() -> None:
     assert len(threats) == 2  # only the second feed contributed
 
 
+@responses.activate
+def test_fetch_rss_uses_pub_date() -> None:
+    body = RSS_BODY.replace(
+        "<title>First threat</title>",
+        "<title>First threat</title><pubDate>Tue, 03 Sep 2024 14:30:00 +0200</pubDate>",
+    )
+    responses.add(responses.GET, "https://feed.test/rss", body=body, status=200)
+    threats = collectors._fetch_rss_feed("https://feed.test/rss")
+    assert threats[0]["timestamp"] == datetime(2024, 9, 3, 12, 30)
+    # Items without a date keep the old "one hour ago" fallback.
+    assert threats[1]["timestamp"] < datetime.now() - timedelta(minutes=59)
+
+
+@responses.activate
+def test_fetch_rss_uses_dc_date_with_z_suffix() -> None:
+    body = RSS_BODY.replace(
+        '<rss version="2.0">', '<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+    ).replace(
+        "<title>First threat</title>",
+        "<title>First threat</title><dc:date>2026-07-01T00:00:00Z</dc:date>",
+    ).replace(
+        "<title>Second threat</title>",
+        "<title>Second threat</title><dc:date>yesterday</dc:date>",
+    )
+    responses.add(responses.GET, "https://feed.test/rss", body=body, status=200)
+    threats = collectors._fetch_rss_feed("https://feed.test/rss")
+    assert threats[0]["timestamp"] == datetime(2026, 7, 1)
+    # An unparseable dc:date gets the documented one-hour-ago fallback.
+    assert threats[1]["timestamp"] < datetime.now() - timedelta(minutes=59)
+
+
+@responses.activate
+def test_fetch_rss_stops_after_item_limit() -> None:
+    items = "".join(
+        f"<item><title>Item {i}</title><link>https://example.com/{i}</link></item>"
+        for i in range(8)
+    )
+    # Everything after the limit is padding followed by broken XML; a full
+    # parse would raise, the streaming parser never gets that far.
+    body = (
+        f"<rss><channel>{items}<!-- {'x' * 50_000} --><item><title>broken"
+    )
+    responses.add(responses.GET, "https://feed.test/rss", body=body, status=200)
+    with patch("aegistrace.collectors.config.RSS_ITEMS_PER_FEED", 5):
+        threats = collectors._fetch_rss_feed("https://feed.test/rss")
+    assert [t["title"] for t in threats] == [f"Item {i}" for i in range(5)]
+
+
+@responses.activate
+def test_fetch_rss_raises_on_truncated_feed() -> None:
+    responses.add(
+        responses.GET,
+        "https://feed.test/rss",
+        body="<rss><channel><item><title>only</title></item>",
+        status=200,
+    )
+    with pytest.raises(ET.ParseError):
+        collectors._fetch_rss_feed("https://feed.test/rss")
+
+
 # ---------------------------------------------------------------------------
 # fetch_otx
 # ---------------------------------------------------------------------------
@@ -278,3 +349,502 @@ def test_fetch_all_sources_warns_on_unknown_source() -> None:
         threats = collectors.fetch_all_sources(sources=["urlhaus", "nonexistent"])
     # Mock fallback should not trigger because urlhaus returned [].
     assert threats[0]["source"] == "MockData"
+
+
+# ---------------------------------------------------------------------------
+# collect_sources (concurrent mode)
+# ---------------------------------------------------------------------------
+
+def _fixed(records: list[dict]):
+    return lambda: [dict(r) for r in records]
+
+
+def _threat(title: str, ts: datetime, source: str) -> dict:
+    return {"title": title, "summary": "", "url": "#", "sector": "x", "timestamp": ts, "source": source}
+
+
+def test_collect_sources_concurrent_matches_sequential_order() -> None:
+    """Ties on timestamp must keep source order, exactly like the sequential path."""
+    ts = datetime(2026, 7, 1, 12, 0, 0)
+    fakes = {
+        "urlhaus": _fixed([_threat("u1", ts, "URLhaus"), _threat("u2", ts, "URLhaus")]),
+        "feodotracker": _fixed([_threat("f1", ts, "FeodoTracker")]),
+        "malwarebazaar": _fixed([_threat("m1", datetime(2026, 7, 2), "MalwareBazaar")]),
+    }
+    with patch.dict(collectors.SOURCE_FETCHERS, fakes, clear=True):
+        seq = collectors.collect_sources(concurrent=False)
+        conc = collectors.collect_sources(concurrent=True)
+    assert [t["title"] for t in conc.threats] == [t["title"] for t in seq.threats]
+    assert [t["title"] for t in conc.threats] == ["m1", "u1", "u2", "f1"]
+    assert [t.name for t in conc.timings] == ["urlhaus", "feodotracker", "malwarebazaar"]
+    assert all(t.status == "ok" for t in conc.timings)
+
+
+def test_collect_sources_returns_partial_results_on_timeout() -> None:
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return [_threat("slow", datetime(2026, 7, 3), "Slow")]
+
+    fakes = {"urlhaus": _fixed([_threat("fast", datetime(2026, 7, 1), "URLhaus")]), "slow": slow}
+    try:
+        with patch.dict(collectors.SOURCE_FETCHERS, fakes, clear=True):
+            report = collectors.collect_sources(concurrent=True, source_timeout=0.2)
+    finally:
+        release.set()
+    assert [t["title"] for t in report.threats] == ["fast"]
+    statuses = {t.name: t.status for t in report.timings}
+    assert statuses == {"urlhaus": "ok", "slow": "timeout"}
+
+
+def test_collect_sources_global_budget_caps_collection() -> None:
+    release = threading.Event()
+    fakes = {"a": lambda: release.wait(5) or [], "b": lambda: release.wait(5) or []}
+    try:
+        with patch.dict(collectors.SOURCE_FETCHERS, fakes, clear=True):
+            report = collectors.collect_sources(concurrent=True, budget=0.2, source_timeout=10)
+    finally:
+        release.set()
+    assert {t.status for t in report.timings} == {"timeout"}
+    assert report.threats[0]["source"] == "MockData"
+
+
+def test_collect_sources_closes_abandoned_generator_sources() -> None:
+    closed = threading.Event()
+
+    def slow_stream():
+        try:
+            for i in range(100):
+                time.sleep(0.05)
+                yield _threat(f"s{i}", datetime(2026, 7, 3), "Slow")
+        finally:
+            closed.set()
+
+    fakes = {"urlhaus": _fixed([_threat("fast", datetime(2026, 7, 1), "URLhaus")]), "slow": slow_stream}
+    with patch.dict(collectors.SOURCE_FETCHERS, fakes, clear=True):
+        started = time.monotonic()
+        report = collectors.collect_sources(concurrent=True, source_timeout=0.2)
+    assert [t["title"] for t in report.threats] == ["fast"]
+    # Stopped at its next record, long before the 5s it would take to finish.
+    assert closed.wait(1)
+    assert time.monotonic() - started < 2
+    workers = [t for t in threading.enumerate() if t.name.startswith("aegistrace-collect")]
+    assert all(t.daemon for t in workers)
+
+
+def test_collect_sources_records_errors_per_source() -> None:
+    fakes = {"urlhaus": _raise, "feodotracker": _fixed([_threat("f", datetime(2026, 7, 1), "F")])}
+    with patch.dict(collectors.SOURCE_FETCHERS, fakes, clear=True):
+        report = collectors.collect_sources(concurrent=True)
+    timing = next(t for t in report.timings if t.name == "urlhaus")
+    assert timing.status == "error"
+    assert "simulated failure" in (timing.error or "")
+    assert len(report.threats) == 1
+
+
+@responses.activate
+def test_collect_sources_splits_rss_into_one_task_per_feed() -> None:
+    feeds = ["https://krebsonsecurity.com/feed/", "https://feeds.feedburner.com/TheHackersNews"]
+    responses.add(responses.GET, feeds[0], body=RSS_BODY, status=200)
+    responses.add(responses.GET, feeds[1], status=500)
+    with patch("aegistrace.collectors.config.RSS_FEEDS", feeds):
+        report = collectors.collect_sources(sources=["rss"], concurrent=True)
+    assert [t.name for t in report.timings] == [f"rss:{feeds[0]}", f"rss:{feeds[1]}"]
+    assert [t.records for t in report.timings] == [2, 0]
+
+
+@responses.activate
+def test_fetch_urlhaus_skips_parsing_when_not_modified(initialized_db: str) -> None:
+    url = "https://urlhaus.abuse.ch/downloads/csv_recent/"
+    responses.add(responses.GET, url, body=URLHAUS_CSV_BODY, status=200, headers={"ETag": '"abc"'})
+    responses.add(responses.GET, url, status=304)
+    assert len(collectors.fetch_urlhaus()) == 2
+    assert collectors.fetch_urlhaus() == []
+    assert responses.calls[1].request.headers["If-None-Match"] == '"abc"'
+
+
+@responses.activate
+def test_fetch_rss_feed_not_modified_returns_no_items(initialized_db: str) -> None:
+    feed = "https://krebsonsecurity.com/feed/"
+    responses.add(responses.GET, feed, body=RSS_BODY, status=200, headers={"Last-Modified": "Wed, 01 Jul 2026 00:00:00 GMT"})
+    responses.add(responses.GET, feed, status=304)
+    with patch("aegistrace.collectors.config.RSS_FEEDS", [feed]):
+        assert len(collectors.fetch_rss()) == 2
+        assert collectors.fetch_rss() == []
+
+
+def _validated_fetcher(url: str, etag: str, delay: float, done: threading.Event):
+    def fetch():
+        time.sleep(delay)
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.headers["ETag"] = etag
+        collectors._remember_validators(url, resp)
+        done.set()
+        return [_threat(etag, datetime(2026, 7, 1), "URLhaus")]
+
+    return fetch
+
+
+def test_timed_out_source_does_not_save_validators(initialized_db: str) -> None:
+    from aegistrace.storage import load_http_validator
+
+    fast_done, slow_done = threading.Event(), threading.Event()
+    fakes = {
+        "fast": _validated_fetcher("https://fast.test/csv", '"f1"', 0, fast_done),
+        "slow": _validated_fetcher("https://slow.test/csv", '"s1"', 0.4, slow_done),
+    }
+    with patch.dict(collectors.SOURCE_FETCHERS, fakes, clear=True):
+        report = collectors.collect_sources(concurrent=True, source_timeout=0.2)
+    assert {t.name: t.status for t in report.timings} == {"fast": "ok", "slow": "timeout"}
+    assert slow_done.wait(2)
+    assert load_http_validator("https://fast.test/csv") == ('"f1"', None)
+    assert load_http_validator("https://slow.test/csv") is None
+
+
+@responses.activate
+def test_collect_sources_flags_unchanged_polls(initialized_db: str) -> None:
+    url = "https://urlhaus.abuse.ch/downloads/csv_recent/"
+    responses.add(responses.GET, url, body=URLHAUS_CSV_BODY, status=200, headers={"ETag": '"abc"'})
+    responses.add(responses.GET, url, status=304)
+    first = collectors.collect_sources(sources=["urlhaus"], concurrent=True)
+    assert not first.unchanged
+    second = collectors.collect_sources(sources=["urlhaus"], concurrent=True)
+    assert second.unchanged
+    assert [t["source"] for t in second.threats] == ["MockData"]
+
+
+# ---------------------------------------------------------------------------
+# Streaming CSV parsing
+# ---------------------------------------------------------------------------
+
+@responses.activate
+def test_iter_urlhaus_is_lazy_and_stops_at_limit() -> None:
+    responses.add(responses.GET, "https://urlhaus.abuse.ch/downloads/csv_recent/", body=URLHAUS_CSV_BODY, status=200)
+    stream = collectors.iter_urlhaus(limit=1)
+    assert len(responses.calls) == 0  # nothing fetched until iterated
+    records = list(stream)
+    assert len(records) == 1
+    assert records[0]["url"].startswith("https://x089w0f5")
+
+
+@responses.activate
+def test_fetch_feodotracker_respects_configured_record_limit() -> None:
+    responses.add(responses.GET, "https://feodotracker.abuse.ch/downloads/ipblocklist.csv", body=FEODO_CSV_BODY, status=200)
+    with patch("aegistrace.config.FEED_RECORD_LIMIT", 1):
+        threats = collectors.fetch_feodotracker()
+    assert [t["title"] for t in threats] == ["FeodoTracker: Emotet"]
+
+
+@responses.activate
+def test_fetch_urlhaus_stops_when_parse_budget_exhausted() -> None:
+    responses.add(responses.GET, "https://urlhaus.abuse.ch/downloads/csv_recent/", body=URLHAUS_CSV_BODY, status=200)
+    assert collectors.fetch_urlhaus(time_budget=0) == []
+
+
+@responses.activate
+def test_fetch_urlhaus_keeps_records_parsed_before_a_stream_error() -> None:
+    responses.add(responses.GET, "https://urlhaus.abuse.ch/downloads/csv_recent/", body=URLHAUS_CSV_BODY, status=200)
+    calls = {"n": 0}
+    original = collectors._urlhaus_record
+
+    def flaky(row):
+        calls["n"] += 1
+        if calls["n"] > 1:
+            raise ValueError("truncated stream")
+        return original(row)
+
+    with patch("aegistrace.collectors._urlhaus_record", flaky):
+        threats = collectors.fetch_urlhaus()
+    assert len(threats) == 1
+
+
+# ---------------------------------------------------------------------------
+# Top-K merge
+# ---------------------------------------------------------------------------
+
+def test_collect_sources_top_k_matches_full_sort_with_ties() -> None:
+    rng = random.Random(1234)
+    days = [datetime(2026, 7, d) for d in range(1, 6)]
+    per_source = {
+        name: [_threat(f"{name}-{i}", rng.choice(days), name) for i in range(40)]
+        for name in ("urlhaus", "feodotracker", "malwarebazaar")
+    }
+    fakes = {name: _fixed(records) for name, records in per_source.items()}
+    everything = [r for records in per_source.values() for r in records]
+    for k in (1, 7, 25, 200):
+        expected = sorted(everything, key=lambda x: x["timestamp"], reverse=True)[:k]
+        for concurrent in (False, True):
+            with patch.dict(collectors.SOURCE_FETCHERS, fakes, clear=True):
+                got = collectors.fetch_all_sources(concurrent=concurrent, max_threats=k)
+            assert [t["title"] for t in got] == [t["title"] for t in expected]
+
+
+def test_collect_sources_consumes_generators_with_bounded_memory() -> None:
+    def endless_but_finite():
+        for i in range(5000):
+            yield _threat(f"r{i}", datetime(2026, 1, 1) + timedelta(minutes=i), "URLhaus")
+
+    top = collectors._NewestK(3)
+    timing, _newest = collectors._drain("urlhaus", endless_but_finite, 0, top)
+    assert timing.records == 5000
+    assert len(top._heap) == 3
+    assert [t["title"] for t in top.newest_first()] == ["r4999", "r4998", "r4997"]
+
+
+def test_collect_sources_uses_configured_max_threats_by_default() -> None:
+    fakes = {"urlhaus": _fixed([_threat(f"u{i}", datetime(2026, 7, 1), "URLhaus") for i in range(10)])}
+    with patch.dict(collectors.SOURCE_FETCHERS, fakes, clear=True), patch("aegistrace.config.MAX_THREATS", 4):
+        assert len(collectors.fetch_all_sources()) == 4
+
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+@responses.activate
+def test_collect_sources_conditional_get_switch_is_per_call(
+    initialized_db: str, concurrent: bool
+) -> None:
+    url = "https://feed.test/rss"
+    responses.add(responses.GET, url, body=RSS_BODY, status=200, headers={"ETag": '"v1"'})
+    fakes = {"rss": partial(collectors._fetch_rss_feed, url)}
+    with patch.dict(collectors.SOURCE_FETCHERS, fakes, clear=True):
+        collectors.collect_sources(concurrent=concurrent, conditional_get=False)
+        assert storage.load_http_validator(url) is None
+        collectors.collect_sources(concurrent=concurrent)
+    assert "If-None-Match" not in responses.calls[0].request.headers
+    assert storage.load_http_validator(url) == ('"v1"', None)
+
+
+# ---------------------------------------------------------------------------
+# Incremental collection (high-water marks)
+# ---------------------------------------------------------------------------
+
+def test_incremental_collection_only_emits_records_newer_than_mark(initialized_db: str) -> None:
+    day1 = [_threat("u1", datetime(2026, 7, 1), "URLhaus"), _threat("f1", datetime(2026, 7, 1), "FeodoTracker")]
+    day2 = day1 + [_threat("u2", datetime(2026, 7, 2), "URLhaus")]
+    feed = {"records": day1}
+    fakes = {"feeds": lambda: [dict(r) for r in feed["records"]]}
+
+    with patch.dict(collectors.SOURCE_FETCHERS, fakes, clear=True):
+        first = collectors.collect_sources(incremental=True, concurrent=False)
+        feed["records"] = day2
+        second = collectors.collect_sources(incremental=True, concurrent=False)
+        third = collectors.collect_sources(incremental=True, concurrent=True)
+
+    assert {t["title"] for t in first.threats} == {"u1", "f1"}
+    assert [t["title"] for t in second.threats] == ["u2"]
+    assert second.timings[0].skipped == 2
+    assert third.threats[0]["source"] == "MockData"  # nothing new since the last run
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_incremental_collection_emits_same_second_row_added_after_mark(
+    initialized_db: str, concurrent: bool
+) -> None:
+    second = datetime(2026, 7, 1, 12, 0, 0)
+    feed = {"records": [_threat("u1", second, "URLhaus"), _threat("u0", second - timedelta(seconds=1), "URLhaus")]}
+    fakes = {"urlhaus": lambda: [dict(r) for r in feed["records"]]}
+
+    with patch.dict(collectors.SOURCE_FETCHERS, fakes, clear=True):
+        first = collectors.collect_sources(incremental=True, concurrent=concurrent)
+        # URLhaus added another URL in the same second after the mark was saved.
+        feed["records"] = [_threat("u2", second, "URLhaus")] + feed["records"]
+        second_run = collectors.collect_sources(incremental=True, concurrent=concurrent)
+        third = collectors.collect_sources(incremental=True, concurrent=concurrent)
+
+    assert {t["title"] for t in first.threats} == {"u0", "u1"}
+    assert [t["title"] for t in second_run.threats] == ["u2"]
+    assert second_run.timings[0].skipped == 2
+    assert third.unchanged and third.timings[0].skipped == 3
+
+
+def test_incremental_marks_do_not_advance_for_failed_sources(initialized_db: str) -> None:
+    from aegistrace.storage import load_high_water_marks
+
+    def half_then_fail():
+        yield _threat("u1", datetime(2026, 7, 5), "URLhaus")
+        raise requests.RequestException("connection reset")
+
+    with patch.dict(collectors.SOURCE_FETCHERS, {"urlhaus": half_then_fail}, clear=True):
+        report = collectors.collect_sources(incremental=True, concurrent=False)
+    assert report.timings[0].status == "error"
+    assert report.threats[0]["source"] == "MockData"
+    assert load_high_water_marks() == {}
+
+
+def test_non_incremental_collection_ignores_marks(initialized_db: str) -> None:
+    from aegistrace.storage import save_high_water_marks
+
+    save_high_water_marks({"URLhaus": datetime(2030, 1, 1)})
+    fakes = {"urlhaus": _fixed([_threat("u1", datetime(2026, 7, 1), "URLhaus")])}
+    with patch.dict(collectors.SOURCE_FETCHERS, fakes, clear=True):
+        threats = collectors.fetch_all_sources(concurrent=False)
+    assert [t["title"] for t in threats] == ["u1"]
+
+
+# ---------------------------------------------------------------------------
+# Collector plugins
+# ---------------------------------------------------------------------------
+
+class _FakeEntryPoint:
+    def __init__(self, name: str, target) -> None:
+        self.name = name
+        self.value = f"fake_plugins:{name}"
+        self.target = target
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return self.target
+
+
+class _InternalCollector(collectors.Collector):
+    name = "internal"
+    incremental = False
+    rate_limit = 2.0
+    hosts = ("feeds.internal.test",)
+
+    def fetch(self):
+        yield _threat("i1", datetime(2026, 7, 1), "Internal")
+
+
+def test_plugin_collectors_are_loaded_only_when_selected(monkeypatch: pytest.MonkeyPatch) -> None:
+    internal = _FakeEntryPoint("internal", _InternalCollector)
+    unused = _FakeEntryPoint("unused", _raise)
+    monkeypatch.setattr(collectors, "_PLUGIN_CACHE", {})
+    monkeypatch.setattr(collectors, "entry_points", lambda group: [internal, unused])
+
+    assert collectors.available_sources()[-2:] == ["internal", "unused"]
+    assert internal.loads == unused.loads == 0
+
+    with patch.dict(collectors.SOURCE_FETCHERS, {"urlhaus": lambda: []}, clear=True):
+        report = collectors.collect_sources(sources=["internal"], concurrent=False)
+        collectors.collect_sources(sources=["internal"], concurrent=False)
+    assert [t["title"] for t in report.threats] == ["i1"]
+    assert internal.loads == 1  # cached after the first run
+    assert unused.loads == 0
+    plugin = collectors.get_collector("internal")
+    assert (plugin.rate_limit, plugin.hosts) == (2.0, ("feeds.internal.test",))
+    assert http_client._limiter("feeds.internal.test").rate == 2.0
+
+
+def _raise_import_error(message: str):
+    raise ImportError(message)
+
+
+def test_broken_plugin_is_skipped(monkeypatch: pytest.MonkeyPatch) -> None:
+    broken = _FakeEntryPoint("broken", None)
+    monkeypatch.setattr(broken, "load", partial(_raise_import_error, "no module named fake_plugins"))
+    monkeypatch.setattr(collectors, "_PLUGIN_CACHE", {})
+    monkeypatch.setattr(collectors, "entry_points", lambda group: [broken])
+    assert collectors.get_collector("broken") is None
+
+
+def test_non_incremental_plugin_bypasses_high_water_marks(
+    initialized_db: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from aegistrace.storage import save_high_water_marks
+
+    save_high_water_marks({"Internal": datetime(2030, 1, 1)})
+    monkeypatch.setattr(collectors, "_PLUGIN_CACHE", {})
+    monkeypatch.setattr(
+        collectors, "entry_points", lambda group: [_FakeEntryPoint("internal", _InternalCollector())]
+    )
+    report = collectors.collect_sources(sources=["internal"], incremental=True, concurrent=False)
+    assert [t["title"] for t in report.threats] == ["i1"]
+
+
+# ---------------------------------------------------------------------------
+# File-backed sources and bulk load
+# ---------------------------------------------------------------------------
+
+def _write_dump(tmp_path, name: str, body: str):
+    path = tmp_path / name
+    if name.endswith(".gz"):
+        with gzip.open(path, "wt", encoding="utf-8") as fh:
+            fh.write(body)
+    elif name.endswith(".zip"):
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("csv.txt", body)
+    else:
+        path.write_text(body, encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("name", ["urlhaus.csv", "urlhaus.csv.gz", "urlhaus.zip"])
+def test_fetch_urlhaus_replays_local_file(tmp_path, name: str) -> None:
+    path = _write_dump(tmp_path, name, URLHAUS_CSV_BODY)
+    with responses.RequestsMock():  # any network call would fail the test
+        threats = collectors.fetch_urlhaus(path=path)
+    assert [t["timestamp"] for t in threats] == [
+        datetime(2026, 7, 1, 0, 12, 22),
+        datetime(2026, 7, 1, 0, 11, 9),
+    ]
+    assert threats[0]["source"] == "URLhaus"
+
+
+def test_fetch_feodotracker_uses_configured_file(tmp_path) -> None:
+    path = _write_dump(tmp_path, "ipblocklist.csv.gz", FEODO_CSV_BODY)
+    with patch("aegistrace.config.FEODOTRACKER_FILE", str(path)), responses.RequestsMock():
+        threats = collectors.fetch_feodotracker(limit=1)
+    assert len(threats) == 1
+    assert threats[0]["source"] == "FeodoTracker"
+
+
+def test_fetch_urlhaus_missing_file_yields_nothing(tmp_path) -> None:
+    assert collectors.fetch_urlhaus(path=tmp_path / "missing.csv") == []
+
+
+def test_bulk_load_streams_dump_into_threats_table(initialized_db: str, tmp_path) -> None:
+    rows = "".join(
+        f'"{i}","2026-06-{1 + i % 28:02d} 10:00:00","http://bad{i}.test/","online","",'
+        f'"malware_download","Mozi","https://urlhaus.abuse.ch/url/{i}/","anonymous"\n'
+        for i in range(250)
+    )
+    path = _write_dump(tmp_path, "full.csv.zip", URLHAUS_CSV_BODY + rows)
+    with patch("aegistrace.storage.save_threat_rows", wraps=storage.save_threat_rows) as save:
+        loaded = collectors.bulk_load(path, "urlhaus", batch_size=100, db_file=initialized_db)
+    assert loaded == 252
+    assert save.call_args.kwargs["batch_size"] == 100
+    conn = sqlite3.connect(initialized_db)
+    try:
+        sources, oldest = conn.execute(
+            "SELECT GROUP_CONCAT(DISTINCT source), MIN(timestamp) FROM threats"
+        ).fetchone()
+    finally:
+        conn.close()
+    assert (sources, oldest) == ("URLhaus", "2026-06-01T10:00:00")
+
+
+def test_bulk_load_classifies_rows_and_summarises_bad_dates(
+    initialized_db: str, tmp_path, caplog: pytest.LogCaptureFixture
+) -> None:
+    rows = "".join(
+        f'"{i}","not a date","http://bad{i}.test/","online","","malware_download","Mozi",'
+        f'"https://urlhaus.abuse.ch/url/{i}/","anonymous"\n'
+        for i in range(50)
+    )
+    path = _write_dump(tmp_path, "full.csv", URLHAUS_CSV_BODY + rows)
+    with caplog.at_level(logging.WARNING, logger="aegistrace.collectors"):
+        assert collectors.bulk_load(path, "urlhaus", db_file=initialized_db) == 52
+    warnings = [r.getMessage() for r in caplog.records if r.levelno == logging.WARNING]
+    assert warnings == [
+        "Bulk load URLhaus: 50 rows had an unparseable date and were stamped with the load time"
+    ]
+    conn = sqlite3.connect(initialized_db)
+    try:
+        types = {row[0] for row in conn.execute("SELECT threat_type FROM threats")}
+    finally:
+        conn.close()
+    expected = {
+        classify_threat(f"{t['title']} {t['summary']}")
+        for t in collectors.fetch_urlhaus(path=path)
+    }
+    assert None not in types
+    assert types == expected
+
+
+def test_bulk_load_rejects_unknown_source(tmp_path) -> None:
+    with pytest.raises(ValueError, match="unknown bulk-load source"):
+        collectors.bulk_load(tmp_path / "dump.csv", "otx")
@@ -26,9 +26,9 @@ def test_enrich_iocs_missing_keys_does_not_crash(sample_iocs: list[dict]) -> Non
         patch("aegistrace.config.VIRUSTOTAL_API_KEY", ""),
         patch("aegistrace.config.PULSEDIVE_API_KEY", ""),
         patch("aegistrace.config.ENABLE_ENRICHMENT", True),
-        patch("aegistrace.enricher.requests.get") as mock_get,
+        patch("aegistrace.http_client.get") as mock_get,
     ):
-        # Stub out requests.get so no real network call is attempted.
+        # Stub out the shared HTTP client so no real network call is attempted.
         mock_get.side_effect = requests.RequestException("network down")
         result = enricher.enrich_iocs(sample_iocs)
 
@@ -56,7 +56,7 @@ def test_enrich_iocs_abuseipdb_success(sample_iocs: list[dict]) -> None:
         patch("aegistrace.config.ABUSEIPDB_API_KEY", "fake-key"),
         patch("aegistrace.config.PULSEDIVE_API_KEY", ""),
         patch("aegistrace.config.ENABLE_ENRICHMENT", True),
-        patch("aegistrace.enricher.requests.get", return_value=FakeResponse()),
+        patch("aegistrace.http_client.get", return_value=FakeResponse()),
     ):
         result = enricher.enrich_iocs(sample_iocs)
 
@@ -84,7 +84,7 @@ def test_enrich_iocs_virustotal_success_for_hash(sample_iocs: list[dict]) -> Non
     with (
         patch("aegistrace.config.VIRUSTOTAL_API_KEY", "fake-vt-key"),
         patch("aegistrace.config.ENABLE_ENRICHMENT", True),
-        patch("aegistrace.enricher.requests.get", return_value=FakeResponse()),
+        patch("aegistrace.http_client.get", return_value=FakeResponse()),
     ):
         result = enricher.enrich_iocs(sample_iocs)
 
@@ -94,14 +94,14 @@ def test_enrich_iocs_virustotal_success_for_hash(sample_iocs: list[dict]) -> Non
 
 
 def test_enrich_iocs_handles_api_error_gracefully(sample_iocs: list[dict]) -> None:
-    """A raising requests.get must not crash the pipeline."""
+    """A raising HTTP client must not crash the pipeline."""
 
     with (
         patch("aegistrace.config.ABUSEIPDB_API_KEY", "fake-key"),
         patch("aegistrace.config.PULSEDIVE_API_KEY", "fake-pd-key"),
         patch("aegistrace.config.VIRUSTOTAL_API_KEY", "fake-vt-key"),
         patch("aegistrace.config.ENABLE_ENRICHMENT", True),
-        patch("aegistrace.enricher.requests.get", side_effect=requests.RequestException("boom")),
+        patch("aegistrace.http_client.get", side_effect=requests.RequestException("boom")),
     ):
         result = enricher.enrich_iocs(sample_iocs)
 
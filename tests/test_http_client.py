@@ -0,0 +1,231 @@
+"""Tests for ``aegistrace.http_client`` (shared pooled session)."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+import requests
+import responses
+
+from aegistrace import config, http_client
+
+
+@pytest.fixture(autouse=True)
+def _fresh_session() -> Iterator[None]:
+    http_client.reset_session()
+    yield
+    http_client.reset_session()
+
+
+def test_get_session_is_shared() -> None:
+    assert http_client.get_session() is http_client.get_session()
+
+
+def test_reset_session_builds_a_new_one() -> None:
+    first = http_client.get_session()
+    http_client.reset_session()
+    assert http_client.get_session() is not first
+
+
+def test_session_adapters_use_configured_pool_and_retries() -> None:
+    with (
+        patch("aegistrace.config.HTTP_POOL_CONNECTIONS", 3),
+        patch("aegistrace.config.HTTP_POOL_MAXSIZE", 7),
+        patch("aegistrace.config.HTTP_MAX_RETRIES", 4),
+    ):
+        session = http_client.get_session()
+    adapter = session.get_adapter("https://pulsedive.com/api/info.php")
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 7
+    assert adapter.max_retries.total == 4
+    assert 503 in adapter.max_retries.status_forcelist
+    assert 429 not in adapter.max_retries.status_forcelist
+    assert session.get_adapter("http://example.com") is not None
+
+
+def test_session_sends_user_agent() -> None:
+    assert http_client.get_session().headers["User-Agent"] == config.USER_AGENT
+
+
+@responses.activate
+def test_get_applies_default_timeout() -> None:
+    responses.add(responses.GET, "https://example.com/feed", body="ok", status=200)
+    with patch.object(http_client.get_session(), "get", wraps=http_client.get_session().get) as spy:
+        resp = http_client.get("https://example.com/feed")
+    assert resp.text == "ok"
+    assert spy.call_args.kwargs["timeout"] == config.HTTP_TIMEOUT
+
+
+@responses.activate
+def test_post_goes_through_shared_session() -> None:
+    responses.add(responses.POST, "https://mb-api.abuse.ch/api/v1/", json={"ok": 1}, status=200)
+    with patch.object(http_client.get_session(), "post", wraps=http_client.get_session().post) as spy:
+        resp = http_client.post("https://mb-api.abuse.ch/api/v1/", data={"query": "get_recent"}, timeout=3)
+    assert resp.json() == {"ok": 1}
+    assert spy.call_args.kwargs["timeout"] == 3
+
+
+# ---------------------------------------------------------------------------
+# conditional_get / validator cache
+# ---------------------------------------------------------------------------
+
+FEED = "https://urlhaus.abuse.ch/downloads/csv_recent/"
+
+
+@responses.activate
+def test_conditional_get_sends_stored_validators(initialized_db: str) -> None:
+    responses.add(responses.GET, FEED, body="a", status=200, headers={"ETag": '"v1"', "Last-Modified": "Wed, 01 Jul 2026 00:00:00 GMT"})
+    responses.add(responses.GET, FEED, status=304)
+
+    first = http_client.conditional_get(FEED)
+    http_client.remember_validators(FEED, first)
+    second = http_client.conditional_get(FEED)
+
+    assert "If-None-Match" not in responses.calls[0].request.headers
+    assert responses.calls[1].request.headers["If-None-Match"] == '"v1"'
+    assert responses.calls[1].request.headers["If-Modified-Since"] == "Wed, 01 Jul 2026 00:00:00 GMT"
+    assert second.status_code == 304
+
+
+@responses.activate
+def test_conditional_get_counts_hits_and_misses(initialized_db: str) -> None:
+    responses.add(responses.GET, FEED, body="a", status=200, headers={"ETag": '"v1"'})
+    responses.add(responses.GET, FEED, status=304)
+    http_client.reset_validator_stats()
+    http_client.remember_validators(FEED, http_client.conditional_get(FEED))
+    http_client.conditional_get(FEED)
+    assert http_client.validator_stats() == {"hits": 1, "misses": 1}
+
+
+@responses.activate
+def test_remember_validators_ignores_error_responses(initialized_db: str) -> None:
+    responses.add(responses.GET, FEED, status=500, headers={"ETag": '"broken"'})
+    http_client.remember_validators(FEED, http_client.conditional_get(FEED))
+    from aegistrace.storage import load_http_validator
+
+    assert load_http_validator(FEED) is None
+
+
+@responses.activate
+def test_conditional_get_opt_out_sends_plain_request(initialized_db: str) -> None:
+    from aegistrace.storage import save_http_validator
+
+    save_http_validator(FEED, '"v1"', None)
+    responses.add(responses.GET, FEED, body="a", status=200)
+    with patch("aegistrace.config.HTTP_CONDITIONAL_GET", False):
+        http_client.conditional_get(FEED)
+    assert "If-None-Match" not in responses.calls[0].request.headers
+
+
+# ---------------------------------------------------------------------------
+# Per-host rate limiting
+# ---------------------------------------------------------------------------
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_spaces_requests() -> None:
+    clock = _Clock()
+    bucket = http_client.TokenBucket(rate=1.0, burst=2, clock=clock)
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 1.0, 2.0]
+    clock.now += 10  # idle long enough to refill the whole burst (not more)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 1.0]
+
+
+def test_token_bucket_block_until_applies_without_rate() -> None:
+    clock = _Clock()
+    bucket = http_client.TokenBucket(rate=None, clock=clock)
+    assert bucket.reserve() == 0.0
+    bucket.block_until(clock.now + 5)
+    assert bucket.reserve() == 5.0
+
+
+@responses.activate
+def test_configured_host_waits_for_tokens_and_records_queue_time() -> None:
+    responses.add(responses.GET, "https://api.test/x", body="ok", status=200)
+    http_client.reset_rate_limit_stats()
+    with (
+        patch.dict("aegistrace.config.HOST_RATE_LIMITS", {"api.test": (0.5, 1)}),
+        patch("aegistrace.http_client.time.sleep") as sleep,
+    ):
+        for _ in range(3):
+            http_client.get("https://api.test/x")
+    waits = [c.args[0] for c in sleep.call_args_list]
+    assert len(waits) == 2
+    assert all(w > 1.5 for w in waits)
+    stats = http_client.rate_limit_stats()["api.test"]
+    assert stats["requests"] == 3
+    assert stats["waited"] == pytest.approx(sum(waits))
+    assert stats["max_wait"] == max(waits)
+
+
+@responses.activate
+def test_429_is_retried_after_retry_after_delay() -> None:
+    url = "https://pulsedive.com/api/info.php"
+    responses.add(responses.GET, url, status=429, headers={"Retry-After": "3"})
+    responses.add(responses.GET, url, json={"ok": 1}, status=200)
+    http_client.reset_rate_limit_stats()
+    with patch("aegistrace.http_client.time.sleep") as sleep:
+        resp = http_client.get(url)
+    assert resp.status_code == 200
+    assert sleep.call_args.args[0] == pytest.approx(3, abs=0.1)
+    assert http_client.rate_limit_stats()["pulsedive.com"]["throttled"] == 1
+
+
+@responses.activate
+def test_429_with_long_retry_after_is_returned() -> None:
+    url = "https://www.virustotal.com/api/v3/files/abc"
+    responses.add(responses.GET, url, status=429, headers={"Retry-After": "3600"})
+    with patch("aegistrace.http_client.time.sleep") as sleep:
+        resp = http_client.get(url)
+    assert resp.status_code == 429
+    assert len(responses.calls) == 1
+    sleep.assert_not_called()
+    # The host is suspended for later callers, not queued behind a sleep.
+    assert http_client._limiter("www.virustotal.com").suspended_for() > 3000
+    assert http_client._limiter("www.virustotal.com").reserve() < 1
+
+
+@responses.activate
+def test_calls_after_long_retry_after_fail_fast_without_sleeping() -> None:
+    url = "https://api.abuseipdb.com/api/v2/check"
+    responses.add(responses.GET, url, status=429, headers={"Retry-After": "86400"})
+    with patch("aegistrace.http_client.time.sleep") as sleep:
+        first = http_client.get(url)
+        second = http_client.get(url, params={"ipAddress": "45.9.148.3"})
+    assert (first.status_code, second.status_code) == (429, 429)
+    assert int(second.headers["Retry-After"]) > 86000
+    assert len(responses.calls) == 1
+    assert all(c.args[0] <= config.RATE_LIMIT_MAX_WAIT for c in sleep.call_args_list)
+
+
+def test_token_bucket_suspension_expires() -> None:
+    clock = _Clock()
+    bucket = http_client.TokenBucket(rate=None, clock=clock)
+    bucket.suspend_until(clock.now + 600)
+    assert bucket.suspended_for() == 600.0
+    assert bucket.reserve() == 0.0
+    clock.now += 601
+    assert bucket.suspended_for() == 0.0
+
+
+def test_retry_after_accepts_http_date() -> None:
+    resp = requests.Response()
+    resp.headers["Retry-After"] = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert http_client._retry_after(resp) == 0.0
+    resp.headers["Retry-After"] = "soon"
+    assert http_client._retry_after(resp) == config.RATE_LIMIT_DEFAULT_BACKOFF
+
+
+def test_set_rate_limit_keeps_configured_hosts() -> None:
+    http_client.set_rate_limit("www.virustotal.com", 100.0)
+    http_client.set_rate_limit("feeds.internal.test", 3.0, burst=2)
+    assert http_client._limiter("www.virustotal.com").rate == config.HOST_RATE_LIMITS["www.virustotal.com"][0]
+    assert http_client._limiter("feeds.internal.test").burst == 2
@@ -2,14 +2,27 @@
 
 from __future__ import annotations
 
+import random
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+import pytest
+
+from aegistrace import ioc_extractor
 from aegistrace.ioc_extractor import (
     DOMAIN_RE,
     IPV4_RE,
     _extract_from_text,
+    _extract_from_text_multipass,
     _norm_domain,
     _norm_hash,
     _norm_ip,
+    build_ioc_index,
     extract_iocs,
+    iter_iocs,
+    refang,
 )
 
 SAMPLE_SHA256 = "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"
@@ -106,3 +119,233 @@ def test_extract_iocs_pulls_domain_from_url() -> None:
     iocs = extract_iocs(threats)
     domains = [ioc["indicator"] for ioc in iocs if ioc["type"] == "domain"]
     assert "malware.example.com" in domains
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("hxxp://evil[.]com/gate.php", "hxxp://evil.com/gate.php"),
+        ("C2 at 185.220.101[.]34", "C2 at 185.220.101.34"),
+        ("evil(.)example{.}net", "evil.example.net"),
+        ("evil [dot] com, bad[DOT]org", "evil.com, bad.org"),
+        ("hxxps[://]cdn[.]badsite[.]net", "hxxps://cdn.badsite.net"),
+        ("a list (see above) [1]", "a list (see above) [1]"),
+    ],
+)
+def test_refang_rewrites_defanged_separators(text: str, expected: str) -> None:
+    assert refang(text) == expected
+
+
+def test_extract_iocs_finds_defanged_indicators() -> None:
+    threats = [{"title": "T", "summary": "Beacon to hxxp://evil[.]example[.]com from 185.220.101[.]34", "url": ""}]
+    found = {(i["indicator"], i["type"]) for i in extract_iocs(threats)}
+    assert found == {("evil.example.com", "domain"), ("185.220.101.34", "ip")}
+
+
+_PIECES = [
+    "185.220.101.34",
+    "10.0.0.1.evil.com",
+    "256.1.1.1",
+    "1.2.3",
+    "evil.example.com",
+    "-bad-.example.org",
+    "xn--80ak6aa92e.com",
+    "caf\u00e9.example.net",
+    "\u0661\u0662.\u0663.\u0664.\u0665",
+    SAMPLE_MD5,
+    SAMPLE_SHA1,
+    SAMPLE_SHA256,
+    SAMPLE_MD5 + ".exe",
+    SAMPLE_SHA1.upper(),
+    SAMPLE_MD5 + "0",
+    "x" + SAMPLE_MD5,
+    "_" + SAMPLE_MD5,
+    SAMPLE_MD5 + "-" + SAMPLE_MD5,
+    "a" * 70,
+    "ransomware",
+    "CVE-2026-1234",
+    "v1.2",
+    "...",
+    "-",
+    "e.g.",
+]
+_SEPARATORS = [" ", "  ", "\n", ", ", "(", ")", "[.]", "(.)", " [dot] ", "[://]", "/", ":", "\"", "", ".", "-", "_"]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_single_pass_extractor_matches_multipass_reference(seed: int) -> None:
+    rng = random.Random(seed)
+    for _ in range(400):
+        parts = []
+        for _ in range(rng.randint(1, 12)):
+            parts.append(rng.choice(_PIECES))
+            parts.append(rng.choice(_SEPARATORS))
+        text = "".join(parts)
+        assert _extract_from_text(text) == _extract_from_text_multipass(refang(text)), text
+
+
+def test_single_pass_extractor_matches_reference_on_random_characters() -> None:
+    rng = random.Random(0)
+    alphabet = "0123456789abcdefABCDEFxyz.-_ :/,[](){}\u00e9\u0661"
+    for _ in range(2000):
+        text = "".join(rng.choices(alphabet, k=rng.randint(0, 120)))
+        assert _extract_from_text(text) == _extract_from_text_multipass(refang(text)), text
+
+
+def _backfill_threats(n: int) -> list[dict]:
+    rng = random.Random(n)
+    return [
+        {
+            "title": f"FeodoTracker: {rng.choice(['QakBot', 'Emotet', 'Dridex'])}",
+            "summary": f"IP 185.220.{i % 7}.{i % 5} talks to c2-{i % 11}.example.com {SAMPLE_MD5}",
+            "url": f"https://feed{i % 3}.example.org/entry/{i}",
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize(("workers", "chunk_size"), [(2, 7), (3, 50)])
+def test_extract_iocs_parallel_matches_serial(workers: int, chunk_size: int) -> None:
+    threats = _backfill_threats(120)
+    serial = extract_iocs(threats, workers=1)
+    assert extract_iocs(threats, workers=workers, chunk_size=chunk_size) == serial
+
+
+def test_extract_iocs_falls_back_to_serial_when_pool_fails() -> None:
+    threats = _backfill_threats(30)
+    with patch("aegistrace.ioc_extractor.ProcessPoolExecutor", side_effect=OSError("no semaphores")):
+        result = extract_iocs(threats, workers=2, chunk_size=10)
+    assert result == extract_iocs(threats, workers=1)
+
+
+def test_extract_iocs_redoes_in_flight_chunks_when_pool_breaks_mid_run() -> None:
+    threats = _backfill_threats(80)
+    pool = ThreadPoolExecutor(max_workers=2)
+    submitted = 0
+
+    def submit(fn, chunk):
+        nonlocal submitted
+        submitted += 1
+        if submitted == 5:
+            raise BrokenProcessPool("worker died")
+        return pool.submit(fn, chunk)
+
+    with patch("aegistrace.ioc_extractor.ProcessPoolExecutor") as executor:
+        executor.return_value.submit.side_effect = submit
+        result = extract_iocs(iter(threats), workers=2, chunk_size=7)
+    pool.shutdown()
+    assert result == extract_iocs(threats, workers=1)
+
+
+def test_build_ioc_index_reads_threats_lazily() -> None:
+    produced = 0
+
+    def threats() -> Iterator[dict]:
+        nonlocal produced
+        for row in _backfill_threats(400):
+            produced += 1
+            yield row
+
+    read_ahead: list[int] = []
+    extract_chunk = ioc_extractor._extract_chunk
+
+    def spy(rows):
+        read_ahead.append(produced)
+        return extract_chunk(rows)
+
+    with (
+        patch("aegistrace.ioc_extractor._extract_chunk", spy),
+        patch("aegistrace.ioc_extractor.ProcessPoolExecutor", ThreadPoolExecutor),
+    ):
+        index = build_ioc_index(threats(), workers=2, chunk_size=10)
+    assert produced == 400
+    assert index.to_dicts() == extract_iocs(_backfill_threats(400))
+    # A chunk is extracted before the input is read more than
+    # 2 * workers + 1 chunks past it.
+    assert all(n <= (k + 6) * 10 for k, n in enumerate(read_ahead))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_ioc_index_materialises_to_extract_iocs_output(workers: int) -> None:
+    threats = _backfill_threats(60)
+    index = build_ioc_index(threats, workers=workers, chunk_size=16)
+    assert len(index) == len(extract_iocs(threats))
+    assert index.to_dicts() == extract_iocs(threats)
+
+
+def test_ioc_index_interns_strings_into_sorted_id_arrays() -> None:
+    threats = [
+        {"title": "B", "summary": "seen at 185.220.101.1", "url": "https://z.example/1"},
+        {"title": "A", "summary": "again 185.220.101.1", "url": "https://a.example/2"},
+        {"title": "B", "summary": "still 185.220.101.1", "url": "https://z.example/1"},
+    ]
+    index = build_ioc_index(threats)
+    record = next(r for r in index if r.indicator == "185.220.101.1")
+    assert not hasattr(record, "__dict__")
+    assert record.sources.typecode == "I"
+    assert list(record.sources) == sorted(set(record.sources)) and len(record.sources) == 2
+    assert index.strings(record.titles) == ["A", "B"]
+
+
+def _upsert(updates) -> list[dict]:
+    """Fold ``iter_iocs`` deltas the way a consumer would."""
+    merged: dict[tuple[str, str], dict] = {}
+    for update in updates:
+        ioc = merged.setdefault((update["indicator"], update["type"]), {**update, "sources": set(), "titles": set()})
+        ioc["sources"].update(update["sources"])
+        ioc["titles"].update(update["titles"])
+    return [{**ioc, "sources": sorted(ioc["sources"]), "titles": sorted(ioc["titles"])} for ioc in merged.values()]
+
+
+def test_iter_iocs_upserted_updates_match_extract_iocs() -> None:
+    threats = _backfill_threats(40)
+    assert _upsert(iter_iocs(iter(threats))) == extract_iocs(threats)
+
+
+def test_iter_iocs_is_lazy() -> None:
+    def threats():
+        yield {"title": "T1", "summary": "185.220.101.1", "url": ""}
+        raise AssertionError("consumed past the first threat")
+
+    first = next(iter_iocs(threats()))
+    assert first["indicator"] == "185.220.101.1"
+
+
+def test_iter_iocs_yields_only_changes() -> None:
+    threats = [
+        {"title": "T1", "summary": "185.220.101.1", "url": "https://a.example/1"},
+        {"title": "T1", "summary": "185.220.101.1", "url": "https://a.example/1"},
+        {"title": "T2", "summary": "185.220.101.1", "url": "https://a.example/1"},
+    ]
+    ips = [i for i in iter_iocs(threats) if i["type"] == "ip"]
+    assert [(i["sources"], i["titles"]) for i in ips] == [(["https://a.example/1"], ["T1"]), ([], ["T2"])]
+    assert len([i for i in iter_iocs(threats, only_new=True) if i["type"] == "ip"]) == 1
+
+
+def test_iter_iocs_hot_indicator_yields_deltas_in_bounded_state() -> None:
+    n = 20000
+    threats = (
+        {"title": f"T{i % 50}", "summary": "C2 185.220.101.1", "url": f"https://a.example/{i}"}
+        for i in range(n)
+    )
+    updates = list(iter_iocs(threats, max_tracked=10, max_refs=8))
+    hot = [u for u in updates if u["indicator"] == "185.220.101.1"]
+    # One update per threat, each carrying only the new URL: linear, not
+    # quadratic, in the number of sightings.
+    assert len(hot) == n
+    assert all(len(u["sources"]) == 1 and len(u["titles"]) <= 1 for u in hot)
+    # Past the per-indicator cap, titles may repeat; upserting absorbs that.
+    folded = _upsert(hot)[0]
+    assert len(folded["sources"]) == n
+    assert folded["titles"] == sorted(f"T{i}" for i in range(50))
+
+
+def test_iter_iocs_bounds_dedup_state() -> None:
+    threats = [{"title": "", "summary": ip, "url": ""} for ip in ["1.1.1.1", "2.2.2.2", "1.1.1.1"]]
+    assert [i["indicator"] for i in iter_iocs(threats, max_tracked=2)] == ["1.1.1.1", "2.2.2.2"]
+    # With room for one indicator, 1.1.1.1 is evicted and reported again.
+    assert [i["indicator"] for i in iter_iocs(threats, max_tracked=1)] == [
+        "1.1.1.1",
+        "2.2.2.2",
+        "1.1.1.1",
+    ]
@@ -0,0 +1,96 @@
+"""Tests for ``aegistrace.ioc_validator``."""
+
+from __future__ import annotations
+
+import pytest
+
+from aegistrace import ioc_extractor
+from aegistrace.ioc_validator import (
+    _compile_psl,
+    invalid_reason,
+    ip_to_int,
+    is_public_ip,
+    is_registrable_domain,
+    public_suffix_length,
+)
+
+
+def test_ip_to_int_packs_dotted_quads() -> None:
+    assert ip_to_int("1.2.3.4") == 0x01020304
+    assert ip_to_int("255.255.255.255") == 0xFFFFFFFF
+    assert ip_to_int("256.0.0.1") is None
+    assert ip_to_int("1.2.3") is None
+    assert ip_to_int("١.2.3.4") is None
+
+
+@pytest.mark.parametrize(
+    ("ip", "public"),
+    [
+        ("185.220.101.34", True),
+        ("8.8.8.8", True),
+        ("172.32.0.1", True),
+        ("100.63.255.255", True),
+        ("10.1.2.3", False),
+        ("172.31.255.255", False),
+        ("192.168.0.1", False),
+        ("127.0.0.1", False),
+        ("100.64.0.1", False),
+        ("203.0.113.5", False),
+        ("224.0.0.251", False),
+        ("255.255.255.255", False),
+        ("0.0.0.0", False),
+    ],
+)
+def test_is_public_ip_filters_bogon_ranges(ip: str, public: bool) -> None:
+    assert is_public_ip(ip) is public
+
+
+@pytest.mark.parametrize(
+    ("domain", "registrable"),
+    [
+        ("example.com", True),
+        ("login.bank-of-america.example.com", True),
+        ("Evil.Example.CO.UK", True),
+        ("xn--80ak6aa92e.com", True),
+        ("setup.exe", False),
+        ("config.json", False),
+        ("co.uk", False),
+        ("com", False),
+    ],
+)
+def test_is_registrable_domain_uses_public_suffix_list(domain: str, registrable: bool) -> None:
+    assert is_registrable_domain(domain) is registrable
+
+
+def test_public_suffix_rules_wildcards_and_exceptions() -> None:
+    trie = _compile_psl(["// comment", "", "uk", "co.uk", "*.ck", "!www.ck"])
+    assert public_suffix_length(["a", "co", "uk"], trie) == 2
+    assert public_suffix_length(["a", "b", "ck"], trie) == 2
+    assert public_suffix_length(["www", "ck"], trie) == 1
+    assert public_suffix_length(["a", "unlisted"], trie) == 1
+    assert is_registrable_domain("www.ck", trie)
+    assert not is_registrable_domain("foo.ck", trie)
+
+
+def test_invalid_reason_keeps_hashes() -> None:
+    assert invalid_reason("d41d8cd98f00b204e9800998ecf8427e", "hash") is None
+    assert invalid_reason("10.0.0.1", "ip") == "bogon_ip"
+    assert invalid_reason("setup.exe", "domain") == "unregistrable_domain"
+
+
+def test_extract_iocs_drops_and_counts_invalid_indicators() -> None:
+    threats = [
+        {"title": "T", "summary": "Dropped setup.exe from 10.0.0.5 and 185.220.101.34", "url": ""},
+        {"title": "U", "summary": "setup.exe again via evil.example.com", "url": ""},
+    ]
+    ioc_extractor.reset_suppression_stats()
+    indicators = {i["indicator"] for i in ioc_extractor.extract_iocs(threats)}
+    assert indicators == {"185.220.101.34", "evil.example.com"}
+    assert ioc_extractor.suppression_stats() == {"bogon_ip": 1, "unregistrable_domain": 1}
+    unfiltered = {i["indicator"] for i in ioc_extractor.extract_iocs(threats, validate=False)}
+    assert {"setup.exe", "10.0.0.5"} <= unfiltered
+
+
+def test_iter_iocs_skips_invalid_indicators() -> None:
+    threats = [{"title": "T", "summary": "10.0.0.5 then 185.220.101.34", "url": ""}] * 2
+    assert [i["indicator"] for i in ioc_extractor.iter_iocs(threats)] == ["185.220.101.34"]
@@ -0,0 +1,151 @@
+"""Tests for :mod:`aegistrace.keywords`."""
+
+from __future__ import annotations
+
+import random
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from aegistrace import config, nlp_processor
+from aegistrace.keywords import SCAN_MAX_KEYWORDS, KeywordMatcher
+from aegistrace.nlp_processor import (
+    classify_series,
+    classify_threat,
+    classify_threat_labels,
+    reclassify_threats,
+)
+from aegistrace.storage import init_db, save_threat_rows
+
+
+def _naive_first(text: str, taxonomy: dict[str, list[str]]) -> str | None:
+    text_lower = text.lower()
+    for category, keywords in taxonomy.items():
+        if any(keyword in text_lower for keyword in keywords):
+            return category
+    return None
+
+
+# Both matching strategies: substring scans (small taxonomies) and the
+# Aho-Corasick automaton (forced with a negative threshold).
+MODES = pytest.mark.parametrize("scan_max", [None, -1], ids=["scan", "automaton"])
+
+
+@MODES
+def test_matcher_finds_overlapping_and_nested_keywords(scan_max: int | None) -> None:
+    matcher = KeywordMatcher({"A": ["she"], "B": ["he"], "C": ["hers"], "D": ["his"]}, scan_max)
+    assert matcher.all("USHERS") == ["A", "B", "C"]
+    assert matcher.all("this") == ["D"]
+    assert matcher.all("nothing") == []
+
+
+@MODES
+def test_matcher_first_respects_taxonomy_order(scan_max: int | None) -> None:
+    matcher = KeywordMatcher({"Low": ["zero-day"], "High": ["day"]}, scan_max)
+    assert matcher.first("a zero-day bug") == "Low"
+    reordered = KeywordMatcher({"High": ["day"], "Low": ["zero-day"]}, scan_max)
+    assert reordered.first("a zero-day bug") == "High"
+    assert matcher.first("") is None
+
+
+@MODES
+def test_matcher_matches_naive_scan_on_random_text(scan_max: int | None) -> None:
+    rng = random.Random(7)
+    taxonomy = {
+        f"cat{i}": ["".join(rng.choices("abc", k=rng.randint(1, 4))) for _ in range(5)]
+        for i in range(8)
+    }
+    matcher = KeywordMatcher(taxonomy, scan_max)
+    for _ in range(300):
+        text = "".join(rng.choices("abcd", k=rng.randint(0, 12)))
+        assert matcher.first(text) == _naive_first(text, taxonomy)
+        expected = [c for c, kws in taxonomy.items() if any(k in text for k in kws)]
+        assert matcher.all(text) == expected
+
+
+def test_matcher_picks_strategy_by_taxonomy_size() -> None:
+    small = {"A": [f"k{i}" for i in range(SCAN_MAX_KEYWORDS)]}
+    large = {"A": [f"k{i}" for i in range(SCAN_MAX_KEYWORDS + 1)]}
+    assert not KeywordMatcher(small)._goto
+    assert KeywordMatcher(large)._goto
+    text = f"xx k{SCAN_MAX_KEYWORDS} yy"
+    assert KeywordMatcher(large).first(text) == "A"
+    assert KeywordMatcher(small).first(text) == "A"  # "k1" is a substring
+
+
+def test_matcher_cache_is_bounded() -> None:
+    for i in range(nlp_processor._MATCHERS_MAX * 3):
+        assert classify_threat(f"kw{i} seen", {"Fresh": [f"kw{i}"]}) == "Fresh"
+    assert len(nlp_processor._MATCHERS) == nlp_processor._MATCHERS_MAX
+    taxonomy = {"Kept": ["kept"]}
+    first = nlp_processor._matcher(taxonomy)
+    assert nlp_processor._matcher(taxonomy) is first
+    assert nlp_processor._matcher({"Kept": ["kept"]}) is first
+
+
+def test_classify_threat_sees_in_place_taxonomy_edits() -> None:
+    assert classify_threat("new botnet seen") == "Uncategorized"
+    with patch.dict(config.THREAT_CATEGORIES, {"Botnet": ["botnet"]}):
+        assert classify_threat("new botnet seen") == "Botnet"
+    taxonomy = {"A": ["alpha"]}
+    assert classify_threat("beta", taxonomy) == "Uncategorized"
+    taxonomy["A"].append("beta")
+    assert classify_threat("beta", taxonomy) == "A"
+
+
+def test_classify_threat_keeps_first_category_priority() -> None:
+    # Matches both "Ransomware" and "Phishing"; Ransomware comes first.
+    text = "Phishing email drops ransomware"
+    assert classify_threat(text) == "Ransomware"
+    labels = classify_threat_labels(text)
+    assert labels[0] == "Ransomware"
+    assert "Phishing" in labels
+    assert classify_threat_labels("just some random text") == []
+
+
+def test_classify_threat_accepts_custom_taxonomy() -> None:
+    taxonomy = {"Cloud": ["s3 bucket"], "Identity": ["oauth"]}
+    assert classify_threat("Open S3 bucket leaks OAuth tokens", taxonomy) == "Cloud"
+    assert classify_threat_labels("open s3 bucket, oauth", taxonomy) == ["Cloud", "Identity"]
+    assert classify_threat("ransomware", taxonomy) == "Uncategorized"
+
+
+@pytest.mark.parametrize("category", list(config.THREAT_CATEGORIES))
+def test_classify_threat_agrees_with_naive_scan(category: str) -> None:
+    for keyword in config.THREAT_CATEGORIES[category]:
+        text = f"Report: {keyword.upper()} observed"
+        assert classify_threat(text) == _naive_first(text, config.THREAT_CATEGORIES)
+
+
+def test_classify_series_matches_classify_threat() -> None:
+    texts = [
+        "Phishing email drops ransomware",
+        "CVE-2026-1 zero-day",
+        "nothing to see",
+        "",
+        None,
+        "APT group (state-sponsored)",
+    ]
+    labels = classify_series(pd.Series(texts, index=[10, 11, 12, 13, 14, 15]))
+    assert list(labels.index) == [10, 11, 12, 13, 14, 15]
+    assert labels.tolist() == [classify_threat(t) for t in texts]
+
+
+def test_classify_series_accepts_plain_sequences_and_custom_taxonomy() -> None:
+    taxonomy = {"Cloud": ["s3 bucket", "a.b"], "Identity": ["oauth"]}
+    labels = classify_series(["OAuth via S3 Bucket", "oauth only", "axb"], taxonomy)
+    # Keywords are literal strings, not regexes.
+    assert labels.tolist() == ["Cloud", "Identity", "Uncategorized"]
+
+
+def test_reclassify_threats_updates_changed_rows_in_chunks(tmp_db: str) -> None:
+    init_db(tmp_db)
+    rows = [
+        ("Ransomware hits hospital", "", "Health", "Uncategorized", "RSS", "2026-07-01"),
+        ("Phishing kit", "", "Unknown", "Phishing", "RSS", "2026-07-01"),
+        ("Quiet day", "", "Unknown", "Malware", "RSS", "2026-07-01"),
+    ]
+    save_threat_rows(rows, db_file=tmp_db)
+    assert reclassify_threats(chunk_size=2, db_file=tmp_db) == (3, 2)
+    assert reclassify_threats(chunk_size=2, db_file=tmp_db) == (3, 0)
@@ -105,3 +105,265 @@ def test_process_nlp_handles_missing_summary() -> None:
     assert result[0]["threat_type"] == "Ransomware"
     assert result[0]["summary_nlp"] == ""
     assert result[0]["entities"] == []
+
+
+def _tiny_nlp():
+    """A blank English pipeline that tags "LockBit" / "ACME Corp" as ORG."""
+    import spacy
+
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns(
+        [{"label": "ORG", "pattern": "LockBit"}, {"label": "ORG", "pattern": "ACME Corp"}]
+    )
+    return nlp
+
+
+def test_process_nlp_batches_through_pipe_and_keeps_order() -> None:
+    nlp = _tiny_nlp()
+    threats = [
+        {"title": f"T{i}", "summary": f"Report {i}. LockBit hit ACME Corp servers. Third sentence."}
+        if i % 2
+        else {"title": f"T{i}", "summary": f"Plain note {i}."}
+        for i in range(7)
+    ]
+    with (
+        patch("aegistrace.nlp_processor._get_nlp", return_value=nlp),
+        patch.object(nlp, "pipe", wraps=nlp.pipe) as pipe,
+    ):
+        result = process_nlp(threats, batch_size=3)
+    assert pipe.call_count == 1
+    assert pipe.call_args.kwargs == {"batch_size": 3, "n_process": 1}
+    for i, threat in enumerate(result):
+        if i % 2:
+            assert sorted(threat["entities"]) == ["ACME Corp", "LockBit"]
+            assert threat["summary_nlp"] == f"Report {i}. LockBit hit ACME Corp servers."
+        else:
+            assert threat["entities"] == []
+            assert threat["summary_nlp"] == f"Plain note {i}."
+
+
+def test_process_nlp_uses_worker_processes_for_large_inputs() -> None:
+    nlp = _tiny_nlp()
+    threats = [{"title": "", "summary": f"Doc {i}. LockBit again."} for i in range(40)]
+    with (
+        patch("aegistrace.nlp_processor._get_nlp", return_value=nlp),
+        patch("aegistrace.config.NLP_MIN_DOCS_PER_PROCESS", 10),
+    ):
+        result = process_nlp(threats, batch_size=8, n_process=2)
+    assert [t["summary_nlp"] for t in result] == [f"Doc {i}. LockBit again." for i in range(40)]
+    assert all(t["entities"] == ["LockBit"] for t in result)
+
+
+@pytest.mark.parametrize(
+    ("n_process", "n_docs", "expected"),
+    [(1, 10_000, 1), (4, 100, 1), (4, 1_200, 2), (4, 10_000, 4)],
+)
+def test_effective_processes_scales_with_input(n_process: int, n_docs: int, expected: int) -> None:
+    from aegistrace.nlp_processor import _effective_processes
+
+    with patch("aegistrace.config.NLP_MIN_DOCS_PER_PROCESS", 500):
+        assert _effective_processes(n_process, n_docs) == expected
+
+
+# ---------------------------------------------------------------------------
+# Pipeline profiles
+# ---------------------------------------------------------------------------
+
+def _fake_model(exclude: list[str] | None = None):
+    """Stand-in for ``spacy.load``: a tok2vec + NER pipeline honouring ``exclude``."""
+    import spacy
+
+    nlp = spacy.blank("en")
+    for name in ("tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner"):
+        if name not in (exclude or []):
+            nlp.add_pipe(name)
+    return nlp
+
+
+@pytest.fixture
+def fresh_nlp(monkeypatch: pytest.MonkeyPatch) -> None:
+    from aegistrace import nlp_processor
+
+    monkeypatch.setattr(nlp_processor, "_NLP", None)
+    monkeypatch.setattr(nlp_processor, "_NLP_DISABLED", False)
+
+
+def test_fast_profile_loads_only_ner_and_sentencizer(fresh_nlp: None) -> None:
+    from aegistrace.nlp_processor import _get_nlp
+
+    with (
+        patch("aegistrace.config.NLP_PROFILE", "fast"),
+        patch("spacy.load", side_effect=lambda name, exclude: _fake_model(exclude)) as load,
+    ):
+        nlp = _get_nlp()
+    assert "parser" in load.call_args.kwargs["exclude"]
+    assert nlp.pipe_names == ["sentencizer", "ner"]
+
+
+def test_full_profile_keeps_every_component(fresh_nlp: None) -> None:
+    from aegistrace.nlp_processor import _get_nlp
+
+    with (
+        patch("aegistrace.config.NLP_PROFILE", "full"),
+        patch("spacy.load", side_effect=lambda name, exclude: _fake_model(exclude)),
+    ):
+        nlp = _get_nlp()
+    assert nlp.pipe_names == ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner"]
+
+
+def test_fast_profile_falls_back_to_full_pipeline(fresh_nlp: None) -> None:
+    from aegistrace.nlp_processor import _get_nlp
+
+    def load(name, exclude):
+        if exclude:
+            raise ValueError("component 'ner' listens to excluded 'tok2vec'")
+        return _fake_model()
+
+    with patch("aegistrace.config.NLP_PROFILE", "fast"), patch("spacy.load", side_effect=load):
+        nlp = _get_nlp()
+    assert "parser" in nlp.pipe_names
+
+
+def test_missing_model_disables_nlp(fresh_nlp: None) -> None:
+    from aegistrace.nlp_processor import _get_nlp
+
+    with patch("spacy.load", side_effect=OSError("not found")) as load:
+        assert _get_nlp() is None
+        assert _get_nlp() is None
+    assert load.call_count == 1
+
+
+# ---------------------------------------------------------------------------
+# NLP result cache
+# ---------------------------------------------------------------------------
+
+def test_process_nlp_cache_skips_spacy_for_repeated_summaries(initialized_db: str) -> None:
+    nlp = _tiny_nlp()
+
+    def batch():
+        return [
+            {"title": "a", "summary": "LockBit struck again. Details soon."},
+            {"title": "b", "summary": "LockBit struck again. Details soon."},
+            {"title": "c", "summary": "Unrelated note."},
+        ]
+
+    with (
+        patch("aegistrace.nlp_processor._get_nlp", return_value=nlp),
+        patch.object(nlp, "pipe", wraps=nlp.pipe) as pipe,
+    ):
+        first = process_nlp(batch(), cache=True)
+        assert list(pipe.call_args.args[0]) == [
+            "LockBit struck again. Details soon.",
+            "Unrelated note.",
+        ]  # duplicates within a run are parsed once
+        second = process_nlp(batch(), cache=True)
+    assert pipe.call_count == 1
+    assert [(t["entities"], t["summary_nlp"]) for t in second] == [
+        (t["entities"], t["summary_nlp"]) for t in first
+    ]
+    assert second[0]["entities"] == ["LockBit"]
+
+
+def test_process_nlp_cache_is_keyed_on_pipeline(initialized_db: str) -> None:
+    nlp = _tiny_nlp()
+    threats = [{"title": "", "summary": "LockBit is back."}]
+    with patch("aegistrace.nlp_processor._get_nlp", return_value=nlp):
+        process_nlp([dict(t) for t in threats], cache=True)
+    other = _tiny_nlp()
+    other.meta["version"] = "9.9.9"
+    with (
+        patch("aegistrace.nlp_processor._get_nlp", return_value=other),
+        patch.object(other, "pipe", wraps=other.pipe) as pipe,
+    ):
+        process_nlp([dict(t) for t in threats], cache=True)
+    assert pipe.call_count == 1
+
+
+def test_process_nlp_without_cache_always_parses(initialized_db: str) -> None:
+    nlp = _tiny_nlp()
+    with (
+        patch("aegistrace.nlp_processor._get_nlp", return_value=nlp),
+        patch.object(nlp, "pipe", wraps=nlp.pipe) as pipe,
+    ):
+        for _ in range(2):
+            process_nlp([{"title": "", "summary": "Same text."}], cache=False)
+    assert pipe.call_count == 2
+
+
+def test_process_nlp_routes_structured_feeds_to_templates() -> None:
+    nlp = _tiny_nlp()
+    threats = [
+        {
+            "title": "URLhaus: malware_download",
+            "summary": "Malicious URL reported to URLhaus. Tags: elf,mirai,elf",
+            "source": "URLhaus",
+        },
+        {
+            "title": "FeodoTracker: QakBot",
+            "summary": "IP 203.0.113.5 associated with QakBot C2 server.",
+            "source": "FeodoTracker",
+        },
+        {
+            "title": "MalwareBazaar: exe",
+            "summary": "Malware sample abc123 (exe)",
+            "source": "MalwareBazaar",
+        },
+        {"title": "Blog", "summary": "LockBit hit ACME Corp servers.", "source": "https://rss.example"},
+    ]
+    with (
+        patch("aegistrace.nlp_processor._get_nlp", return_value=nlp),
+        patch.object(nlp, "pipe", wraps=nlp.pipe) as pipe,
+    ):
+        result = process_nlp(threats, cache=False)
+    assert list(pipe.call_args.args[0]) == ["LockBit hit ACME Corp servers."]
+    assert result[0]["entities"] == ["elf", "mirai"]
+    assert result[1]["entities"] == ["QakBot"]
+    assert result[1]["summary_nlp"] == "IP 203.0.113.5 associated with QakBot C2 server."
+    assert result[2]["entities"] == []
+    assert sorted(result[3]["entities"]) == ["ACME Corp", "LockBit"]
+    assert all("threat_type" in t for t in result)
+
+
+def test_process_nlp_skips_spacy_load_when_every_record_is_templated() -> None:
+    threats = [
+        {"title": "", "summary": "IP 198.51.100.7 associated with Emotet C2 server.", "source": "FeodoTracker"}
+    ]
+    with patch("aegistrace.nlp_processor._get_nlp") as get_nlp:
+        process_nlp(threats)
+    get_nlp.assert_not_called()
+    assert threats[0]["entities"] == ["Emotet"]
+
+
+def test_process_nlp_sends_unrecognised_templates_to_spacy() -> None:
+    nlp = _tiny_nlp()
+    threats = [{"title": "", "summary": "LockBit variant seen in the wild.", "source": "FeodoTracker"}]
+    with patch("aegistrace.nlp_processor._get_nlp", return_value=nlp):
+        process_nlp(threats, cache=False)
+    assert threats[0]["entities"] == ["LockBit"]
+
+
+def test_process_nlp_template_routing_can_be_disabled() -> None:
+    nlp = _tiny_nlp()
+    threats = [{"title": "", "summary": "Malware sample abc (exe)", "source": "MalwareBazaar"}]
+    with (
+        patch("aegistrace.nlp_processor._get_nlp", return_value=nlp),
+        patch.object(nlp, "pipe", wraps=nlp.pipe) as pipe,
+    ):
+        process_nlp(threats, cache=False, templates=False)
+    assert pipe.call_count == 1
+
+
+def test_warm_up_loads_model_once_across_threads(fresh_nlp: None) -> None:
+    from aegistrace import nlp_processor
+
+    nlp = _tiny_nlp()
+    with patch(
+        "aegistrace.nlp_processor._load_with_fallback", return_value=(nlp, "fast")
+    ) as load:
+        thread = nlp_processor.warm_up()
+        assert nlp_processor._get_nlp() is nlp
+        thread.join(timeout=5)
+    assert load.call_count == 1
+    assert nlp_processor._get_nlp() is nlp
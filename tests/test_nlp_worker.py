@@ -0,0 +1,124 @@
+"""Tests for :mod:`aegistrace.nlp_worker`."""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import stat
+import threading
+import time
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from aegistrace import cli, nlp_worker
+from aegistrace.nlp_processor import process_nlp
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs Unix sockets")
+
+
+def _tiny_nlp():
+    import spacy
+
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("entity_ruler").add_patterns([{"label": "ORG", "pattern": "LockBit"}])
+    return nlp
+
+
+@pytest.fixture
+def worker(tmp_path) -> Iterator[str]:
+    """Serve a tiny pipeline on a socket in ``tmp_path``; yield the path."""
+    path = str(tmp_path / "nlp.sock")
+    with patch("aegistrace.nlp_processor._get_nlp", return_value=_tiny_nlp()):
+        server = nlp_worker._make_server(path)
+
+    def run() -> None:
+        with contextlib.suppress(SystemExit):  # serve_forever exits via sys.exit(0)
+            server.serve_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    while not hasattr(server, "stop_event"):
+        time.sleep(0.01)
+    yield path
+    server.stop_event.set()
+    thread.join(timeout=5)
+    server.listener.close()
+
+
+def test_worker_socket_is_owner_only(worker: str) -> None:
+    assert stat.S_IMODE(os.stat(worker).st_mode) == 0o600
+
+
+def test_process_nlp_uses_running_worker(worker: str) -> None:
+    threats = [{"title": "", "summary": "LockBit struck again. Second. Third."}]
+    with (
+        patch("aegistrace.config.NLP_WORKER_SOCKET", worker),
+        patch("aegistrace.nlp_processor._get_nlp", side_effect=AssertionError("loaded locally")),
+    ):
+        process_nlp(threats, cache=False)
+    assert threats[0]["entities"] == ["LockBit"]
+    assert threats[0]["summary_nlp"] == "LockBit struck again. Second."
+
+
+def test_worker_generates_owner_only_authkey_when_unset(worker: str) -> None:
+    key_file = nlp_worker._key_path(worker)
+    assert stat.S_IMODE(os.stat(key_file).st_mode) == 0o600
+    with open(key_file, encoding="ascii") as fh:
+        assert len(fh.read()) == 64
+    os.unlink(key_file)
+    with patch("aegistrace.config.NLP_WORKER_SOCKET", worker):
+        assert nlp_worker.connect() is None
+
+
+def test_client_ignores_key_file_readable_by_others(worker: str) -> None:
+    os.chmod(nlp_worker._key_path(worker), 0o644)
+    with patch("aegistrace.config.NLP_WORKER_SOCKET", worker):
+        assert nlp_worker.connect() is None
+
+
+def test_client_ignores_worker_files_owned_by_someone_else(worker: str) -> None:
+    with patch("aegistrace.config.NLP_WORKER_SOCKET", worker):
+        assert nlp_worker.connect() is not None
+        with patch("aegistrace.nlp_worker.os.getuid", return_value=os.getuid() + 1):
+            assert nlp_worker.connect() is None
+        with patch("aegistrace.config.NLP_WORKER_AUTHKEY", "s3cret"):
+            os.chmod(worker, 0o666)
+            assert nlp_worker.connect() is None
+
+
+def test_worker_uses_configured_authkey(tmp_path) -> None:
+    path = str(tmp_path / "keyed.sock")
+    with (
+        patch("aegistrace.config.NLP_WORKER_AUTHKEY", "s3cret"),
+        patch("aegistrace.nlp_processor._get_nlp", return_value=_tiny_nlp()),
+    ):
+        server = nlp_worker._make_server(path)
+    server.listener.close()
+    assert not os.path.exists(nlp_worker._key_path(path))
+
+
+def test_worker_rejects_wrong_authkey(worker: str) -> None:
+    with (
+        patch("aegistrace.config.NLP_WORKER_SOCKET", worker),
+        patch("aegistrace.config.NLP_WORKER_AUTHKEY", "not-the-key"),
+    ):
+        assert nlp_worker.connect() is None
+
+
+def test_process_nlp_falls_back_in_process_without_worker(tmp_path) -> None:
+    threats = [{"title": "", "summary": "LockBit struck again."}]
+    with (
+        patch("aegistrace.config.NLP_WORKER_SOCKET", str(tmp_path / "missing.sock")),
+        patch("aegistrace.nlp_processor._get_nlp", return_value=_tiny_nlp()) as get_nlp,
+    ):
+        process_nlp(threats, cache=False)
+    get_nlp.assert_called_once_with()
+    assert threats[0]["entities"] == ["LockBit"]
+
+
+def test_cli_nlp_worker_returns_2_without_model(tmp_path) -> None:
+    with patch("aegistrace.nlp_processor._get_nlp", return_value=None):
+        assert cli.main(["nlp-worker", "--socket", str(tmp_path / "w.sock")]) == 2
@@ -3,13 +3,24 @@
 from __future__ import annotations
 
 import sqlite3
+from datetime import datetime, timedelta
 from pathlib import Path
 
 from aegistrace.storage import (
     init_db,
+    iter_threat_texts,
+    load_high_water_keys,
+    load_high_water_marks,
+    load_http_validator,
+    load_nlp_cache,
     load_threat_counts,
+    save_high_water_marks,
+    save_http_validator,
     save_iocs,
+    save_nlp_cache,
+    save_threat_rows,
     save_threats,
+    update_threat_types,
 )
 
 
@@ -148,3 +159,88 @@ def test_load_threat_counts_returns_rows_after_insert(tmp_db: str) -> None:
 def test_save_threats_handles_empty_iterable(tmp_db: str) -> None:
     init_db(tmp_db)
     assert save_threats([], tmp_db) == 0
+
+
+def test_http_validator_roundtrip(tmp_db: str) -> None:
+    init_db(tmp_db)
+    assert load_http_validator("https://x.example/feed", tmp_db) is None
+    save_http_validator("https://x.example/feed", '"e1"', None, tmp_db)
+    save_http_validator("https://x.example/feed", '"e2"', "Wed, 01 Jul 2026 00:00:00 GMT", tmp_db)
+    assert load_http_validator("https://x.example/feed", tmp_db) == ('"e2"', "Wed, 01 Jul 2026 00:00:00 GMT")
+
+
+def test_http_validator_tolerates_missing_table(tmp_db: str) -> None:
+    save_http_validator("https://x.example/feed", '"e1"', None, tmp_db)  # must not raise
+    assert load_http_validator("https://x.example/feed", tmp_db) is None
+
+
+def test_high_water_marks_only_move_forward(tmp_db: str) -> None:
+    init_db(tmp_db)
+    save_high_water_marks({"URLhaus": datetime(2026, 7, 2), "OTX": datetime(2026, 7, 1)}, tmp_db)
+    save_high_water_marks({"URLhaus": datetime(2026, 7, 1), "OTX": datetime(2026, 7, 3)}, tmp_db)
+    assert load_high_water_marks(tmp_db) == {
+        "URLhaus": datetime(2026, 7, 2),
+        "OTX": datetime(2026, 7, 3),
+    }
+
+
+def test_high_water_keys_are_replaced_on_advance_and_pooled_at_same_mark(tmp_db: str) -> None:
+    init_db(tmp_db)
+    mark = datetime(2026, 7, 1, 12, 0, 0)
+    save_high_water_marks({"URLhaus": mark}, tmp_db, keys={"URLhaus": {"a"}})
+    save_high_water_marks({"URLhaus": mark}, tmp_db, keys={"URLhaus": {"b"}})
+    assert load_high_water_keys(tmp_db) == {"URLhaus": {"a", "b"}}
+    save_high_water_marks({"URLhaus": mark - timedelta(seconds=1)}, tmp_db, keys={"URLhaus": {"old"}})
+    assert load_high_water_keys(tmp_db) == {"URLhaus": {"a", "b"}}
+    save_high_water_marks({"URLhaus": mark + timedelta(seconds=1)}, tmp_db, keys={"URLhaus": {"c"}})
+    assert load_high_water_keys(tmp_db) == {"URLhaus": {"c"}}
+
+
+def test_load_high_water_marks_without_table_returns_empty(tmp_db: str) -> None:
+    assert load_high_water_marks(tmp_db) == {}
+
+
+def test_save_threat_rows_inserts_in_batches(tmp_db: str) -> None:
+    init_db(tmp_db)
+    rows = (
+        (f"t{i}", "s", "Unknown", None, "URLhaus", f"2026-07-0{1 + i % 3}T00:00:00")
+        for i in range(7)
+    )
+    assert save_threat_rows(rows, batch_size=3, db_file=tmp_db) == 7
+    conn = sqlite3.connect(tmp_db)
+    try:
+        count, first = conn.execute("SELECT COUNT(*), MIN(timestamp) FROM threats").fetchone()
+    finally:
+        conn.close()
+    assert (count, first) == (7, "2026-07-01T00:00:00")
+
+
+def test_nlp_cache_roundtrip_and_lru_eviction(tmp_db: str) -> None:
+    init_db(tmp_db)
+    save_nlp_cache({"a" * 64: (["LockBit"], "First.")}, db_file=tmp_db)
+    save_nlp_cache({"b" * 64: ([], "Second.")}, db_file=tmp_db)
+    # Touch "a" so "b" becomes the least recently used entry.
+    assert load_nlp_cache(["a" * 64], db_file=tmp_db) == {"a" * 64: (["LockBit"], "First.")}
+    save_nlp_cache({"c" * 64: ([], "Third.")}, max_bytes=200, db_file=tmp_db)
+    remaining = load_nlp_cache(["a" * 64, "b" * 64, "c" * 64], db_file=tmp_db)
+    assert set(remaining) == {"a" * 64, "c" * 64}
+
+
+def test_load_nlp_cache_without_table_returns_empty(tmp_db: str) -> None:
+    assert load_nlp_cache(["missing"], db_file=tmp_db) == {}
+
+
+def test_iter_threat_texts_pages_by_id_and_updates_apply(tmp_db: str) -> None:
+    init_db(tmp_db)
+    rows = ((f"t{i}", None, "Unknown", "Old", "URLhaus", "2026-07-01") for i in range(5))
+    save_threat_rows(rows, db_file=tmp_db)
+    chunks = list(iter_threat_texts(chunk_size=2, db_file=tmp_db))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[0][0] == (1, "t0", "", "Old")
+    assert update_threat_types([("New", 2), ("New", 4)], db_file=tmp_db) == 2
+    conn = sqlite3.connect(tmp_db)
+    try:
+        types = [r[0] for r in conn.execute("SELECT threat_type FROM threats ORDER BY id")]
+    finally:
+        conn.close()
+    assert types == ["Old", "New", "Old", "New", "Old"]